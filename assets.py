@@ -0,0 +1,240 @@
+"""Ühine varade (piltide, helide) register.
+
+Kõik laetakse alles esimesel kasutamisel ja jäetakse meelde võtmega
+(liik, täistee, suurus, alfa), nii et sama pilti samas suuruses ei dekodeerita
+ega skaleerita kunagi kaks korda. preload() alustab valitud piltide
+dekodeerimist ja skaleerimist taustalõimes (nt menüü ajal); convert() tehakse
+alati põhilõimes esimesel kasutamisel, sest see vajab ekraani pikslivormingut.
+Eelküpsetatud komplektist (atlas.py) tulnud võtmeid ei dekodeerita üldse.
+"""
+import glob
+import os
+import threading
+
+import pygame
+
+ASSET_DIR = os.path.join(os.path.dirname(__file__), "assets")
+
+_lock = threading.Lock()
+_ready = {}      # võti -> convert'itud Surface (ainult põhilõim)
+_raw = {}        # võti -> taustalõimes tehtud, veel convert'imata Surface
+_pending = {}    # võti -> threading.Event, mis pannakse püsti, kui taustalõim on võtmega valmis
+_missing = set() # võtmed, mida ei õnnestunud laadida (sprite() tagastab None)
+_sounds = {}     # (täistee, helitugevus) -> pygame.mixer.Sound
+_mips = {}       # täistee -> [algpilt, 1/2, 1/4, …] (convert'imata, dekodeeritakse üks kord)
+_mip_lock = threading.Lock()
+_baked = {}      # võti -> valmis (mmap-itud) Surface atlas.install'ist
+
+# statistika: mitu pilti laeti põhilõimes ja mitu saadi taustalõimest valmis kujul
+STATS = {"loaded": 0, "preloaded": 0, "waited": 0, "baked": 0}
+
+
+def path(name):
+    """Täistee assets-kausta alla (täisteed jäetakse samaks)."""
+    return name if os.path.isabs(name) else os.path.join(ASSET_DIR, name)
+
+
+def paths(pattern):
+    """Mustrile vastavad failid sorteeritult (faile ei avata)."""
+    return sorted(glob.glob(path(pattern)))
+
+
+# ---- VÕTMED ----
+# Võti kirjeldab, mida teha: ("image", tee, None, alfa), ("scaled", tee, (w, h), alfa),
+# ("smooth", tee, (w, h), alfa), ("mip", tee, (w, h), alfa) või ("sprite", tee, läbimõõt, True).
+
+def key_image(name, alpha=False):
+    return ("image", path(name), None, alpha)
+
+
+def key_scaled(name, size, alpha=False, smooth=False):
+    return ("smooth" if smooth else "scaled", path(name), tuple(size), alpha)
+
+
+def key_mip(name, size, alpha=False):
+    return ("mip", path(name), tuple(size), alpha)
+
+
+def key_sprite(name, diameter):
+    return ("sprite", path(name), diameter, True)
+
+
+def _mip_levels(p):
+    """
+    Pildi mip-tasemed: algpilt ja iga järgmine poole väiksem (kuni ~64 px).
+    Fail dekodeeritakse ainult üks kord; kõik hilisemad suurused skaleeritakse neist.
+    """
+    with _mip_lock:
+        levels = _mips.get(p)
+        if levels is None:
+            img = pygame.image.load(p)
+            if img.get_bitsize() < 24:
+                full = pygame.Surface(img.get_size(), pygame.SRCALPHA)
+                full.blit(img, (0, 0))
+                img = full
+            levels = [img]
+            while min(img.get_size()) >= 128:
+                img = pygame.transform.smoothscale(img, (img.get_width() // 2, img.get_height() // 2))
+                levels.append(img)
+            _mips[p] = levels
+    return levels
+
+
+def _load_mip(p, size):
+    """Skaleeri väikseimast mip-tasemest, mis on veel vähemalt size suurune (kiirem ja teravam)."""
+    levels = _mip_levels(p)
+    src = levels[0]
+    for level in levels[1:]:
+        if level.get_width() < size[0] or level.get_height() < size[1]:
+            break
+        src = level
+    if src.get_size() == tuple(size):
+        return src.copy()
+    return pygame.transform.smoothscale(src, size)
+
+
+def _load_raw(key):
+    """Dekodeeri ja skaleeri võtme järgi; ei vaja ekraani, seega sobib ka taustalõimele."""
+    kind, p, size, _alpha = key
+    if kind == "mip":
+        return _load_mip(p, size)
+    img = pygame.image.load(p)
+    if kind == "image":
+        return img
+    if kind == "scaled":
+        return pygame.transform.scale(img, size)
+    if kind == "smooth":
+        return pygame.transform.smoothscale(img, size)
+    # "sprite": skaleeri proportsionaalselt nii, et max(mõõdud) = läbimõõt, ja paiguta
+    # läbipaistva ruudu keskele
+    diameter = size
+    w, h = img.get_width(), img.get_height()
+    scale = diameter / max(w, h)
+    if img.get_bitsize() < 24:
+        # smoothscale vajab 24/32-bitist pinda; convert() siin kasutada ei saa (võib olla taustalõim)
+        full = pygame.Surface((w, h), pygame.SRCALPHA)
+        full.blit(img, (0, 0))
+        img = full
+    img = pygame.transform.smoothscale(img, (max(1, int(w * scale)), max(1, int(h * scale))))
+    surf = pygame.Surface((diameter, diameter), pygame.SRCALPHA)
+    surf.blit(img, img.get_rect(center=(diameter // 2, diameter // 2)))
+    return surf
+
+
+def get(key):
+    """Tagasta võtmele vastav valmis Surface (laadi vajadusel kohe, põhilõimes)."""
+    surf = _ready.get(key)
+    if surf is not None:
+        return surf
+    with _lock:
+        event = _pending.get(key)
+    if event is not None:
+        STATS["waited"] += 1
+        event.wait()  # taustalõim teeb juba sama tööd – oota see ära
+    with _lock:
+        raw = _raw.pop(key, None)
+    if raw is not None:
+        STATS["preloaded"] += 1
+    elif key in _baked:
+        raw = _baked[key]
+        STATS["baked"] += 1
+    else:
+        raw = _load_raw(key)
+        STATS["loaded"] += 1
+    surf = raw.convert_alpha() if key[3] else raw.convert()
+    _ready[key] = surf
+    return surf
+
+
+def image(name, alpha=False):
+    """Pilt algsuuruses."""
+    return get(key_image(name, alpha))
+
+
+def scaled(name, size, alpha=False, smooth=False):
+    """Pilt skaleerituna suurusesse size (nt taust ekraani mõõtu)."""
+    return get(key_scaled(name, size, alpha, smooth))
+
+
+def mip_scaled(name, size, alpha=False):
+    """
+    Pilt suuruses size mip-tasemetest: eri suurused (akna suurus, renderdamise skaala)
+    ei dekodeeri faili uuesti, vaid skaleerivad juba mälus olevast tasemest.
+    """
+    return get(key_mip(name, size, alpha))
+
+
+def sprite(name, diameter):
+    """
+    Sprite läbipaistva ruuduna (diameter x diameter), pilt proportsionaalselt keskel.
+    Kui faili pole või seda ei saa lugeda, tagastab None.
+    """
+    key = key_sprite(name, diameter)
+    if key in _missing:
+        return None
+    try:
+        return get(key)
+    except (pygame.error, OSError):
+        _missing.add(key)
+        return None
+
+
+def sound(name, volume=None):
+    """Heli (mikser peab olema käivitatud); sama fail + helitugevus antakse alati sama objektina."""
+    key = (path(name), volume)
+    snd = _sounds.get(key)
+    if snd is None:
+        snd = pygame.mixer.Sound(key[0])
+        if volume is not None:
+            snd.set_volume(volume)
+        _sounds[key] = snd
+    return snd
+
+
+# ---- TAUSTALAADIMINE ----
+def preload(keys):
+    """
+    Alusta võtmete dekodeerimist/skaleerimist taustalõimes. Juba laetud või
+    töös olevad võtmed jäetakse vahele. Tagastab lõime või None, kui tööd polnud.
+    """
+    with _lock:
+        todo = [k for k in keys if k not in _ready and k not in _raw and k not in _pending
+                and k not in _missing and k not in _baked]
+        for k in todo:
+            _pending[k] = threading.Event()
+    if not todo:
+        return None
+    thread = threading.Thread(target=_preload_worker, args=(todo,), name="asset-preload", daemon=True)
+    thread.start()
+    return thread
+
+
+def _preload_worker(keys):
+    for key in keys:
+        try:
+            raw = _load_raw(key)
+        except (pygame.error, OSError):
+            raw = None  # põhilõim proovib get() käigus uuesti ja annab vea/None edasi
+        with _lock:
+            if raw is not None:
+                _raw[key] = raw
+            _pending.pop(key).set()
+
+
+def add_baked(surfaces):
+    """Võta kasutusele eelküpsetatud pildid {võti: Surface} (convert tehakse get'is nagu ikka)."""
+    _baked.update(surfaces)
+
+
+def clear_baked():
+    _baked.clear()
+
+
+def clear():
+    """Unusta kõik laetud pildid (nt ekraani resolutsiooni vahetusel)."""
+    with _lock:
+        _ready.clear()
+        _raw.clear()
+        _missing.clear()
+    with _mip_lock:
+        _mips.clear()
@@ -0,0 +1,193 @@
+"""Eelküpsetatud piltide komplekt: kõik spritid ühes atlases ja taustad lõplikus suuruses.
+
+Mängu käivitamisel dekodeeriti PNG-d (parm*.png, tekkelpixel.png, taustad) ja
+skaleeriti/tsentreeriti need igal korral uuesti. bake() teeb sama töö üks kord
+(assets._load_raw'iga, nii et pikslid on samad) ja kirjutab tulemuse ühte
+faili: päis, JSON indeks ja toored pikslid. Spritid on ühel RGBA lehel (atlas),
+iga taust on oma RGB leht. install() kaardistab faili mällu (mmap), teeb
+lehtedest pygame.image.frombuffer'iga Surface'id ja spritidest subsurface'id
+ning annab need assets registrile – PNG-sid ei dekodeerita.
+
+Iga kirje juures on lähtefaili suurus ja muutmisaeg; kui fail on vahepeal
+muutunud (või puudub), jäetakse kirje kasutamata ja assets loeb PNG-d nagu
+varem. Sama kehtib vale versiooni või vigase faili kohta.
+
+    python atlas.py              # küpseta main.WIDTH × main.HEIGHT jaoks
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+
+import pygame
+
+import assets
+
+BUNDLE_PATH = os.path.join(assets.ASSET_DIR, "atlas.bin")
+BUNDLE_VERSION = 1
+ATLAS_WIDTH = 1024       # spritide lehe laius (px); read täidetakse vasakult paremale
+ALIGN = 64               # lehtede algus faili sees (baitides)
+
+_HEADER = struct.Struct("<4sHI")   # magic, versioon, indeksi pikkus (baitides)
+MAGIC = b"PIRA"
+
+_map = None       # avatud mmap (Surface'id viitavad sellele, seega hoiame alles)
+
+
+def _source_stamp(p):
+    st = os.stat(p)
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _key_to_json(key):
+    kind, p, size, alpha = key
+    return [kind, os.path.relpath(p, assets.ASSET_DIR), list(size) if isinstance(size, tuple) else size, alpha]
+
+
+def _key_from_json(item):
+    kind, rel, size, alpha = item
+    return (kind, assets.path(rel), tuple(size) if isinstance(size, list) else size, alpha)
+
+
+def _pack(sizes, width=ATLAS_WIDTH):
+    """Riiulipakkimine: [(w, h), ...] -> [(x, y), ...] ja lehe kõrgus (kõrgemad enne)."""
+    order = sorted(range(len(sizes)), key=lambda i: -sizes[i][1])
+    places = [None] * len(sizes)
+    x = y = shelf = 0
+    for i in order:
+        w, h = sizes[i]
+        if x + w > width:
+            x, y, shelf = 0, y + shelf, 0
+        places[i] = (x, y)
+        x += w
+        shelf = max(shelf, h)
+    return places, y + shelf
+
+
+def bake(keys, out=BUNDLE_PATH):
+    """Küpseta võtmed (assets.key_*) faili out; tagastab kirjete arvu. Puuduvad failid jäetakse vahele."""
+    sprites, backgrounds = [], []
+    for key in dict.fromkeys(keys):
+        try:
+            surf = assets._load_raw(key)
+        except (pygame.error, OSError) as e:
+            print(f"[atlas] {key[1]}: {e}", file=sys.stderr)
+            continue
+        (sprites if key[0] == "sprite" else backgrounds).append((key, surf))
+
+    pages, entries, blobs = [], [], []
+
+    def add_page(w, h, fmt, data):
+        pages.append({"w": w, "h": h, "format": fmt, "length": len(data)})
+        blobs.append(data)
+        return len(pages) - 1
+
+    if sprites:
+        places, height = _pack([s.get_size() for _, s in sprites])
+        width = min(ATLAS_WIDTH, sum(s.get_width() for _, s in sprites))
+        sheet = pygame.Surface((width, height), pygame.SRCALPHA)
+        for (key, surf), (x, y) in zip(sprites, places):
+            sheet.blit(surf, (x, y))
+        page = add_page(width, height, "RGBA", pygame.image.tobytes(sheet, "RGBA"))
+        for (key, surf), (x, y) in zip(sprites, places):
+            entries.append({"key": _key_to_json(key), "source": _source_stamp(key[1]),
+                            "page": page, "rect": [x, y, *surf.get_size()]})
+    for key, surf in backgrounds:
+        fmt = "RGBA" if key[3] else "RGB"
+        page = add_page(*surf.get_size(), fmt, pygame.image.tobytes(surf, fmt))
+        entries.append({"key": _key_to_json(key), "source": _source_stamp(key[1]),
+                        "page": page, "rect": [0, 0, *surf.get_size()]})
+
+    # lehtede asukohad failis: päis + indeks, siis iga leht ALIGN piiril
+    index = {"pages": pages, "entries": entries}
+    text = b""
+    while True:   # nihked sõltuvad indeksi pikkusest ja vastupidi – kordame, kuni pikkus ei muutu
+        offset = -(-(_HEADER.size + len(text)) // ALIGN) * ALIGN
+        for page in pages:
+            page["offset"] = offset
+            offset += -(-page["length"] // ALIGN) * ALIGN
+        new = json.dumps(index, ensure_ascii=False).encode("utf-8")
+        if len(new) == len(text):
+            break
+        text = new
+
+    tmp = out + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, BUNDLE_VERSION, len(text)))
+        f.write(text)
+        for page, data in zip(pages, blobs):
+            f.write(b"\0" * (page["offset"] - f.tell()))
+            f.write(data)
+    os.replace(tmp, out)
+    return len(entries)
+
+
+def install(path=BUNDLE_PATH):
+    """
+    Kaardista komplekt mällu ja anna värsked kirjed assets registrile.
+    Tagastab (kasutatud, aegunud) kirjete arvu; (0, 0), kui faili pole või see ei sobi.
+    """
+    global _map
+    try:
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return 0, 0
+    try:
+        magic, version, index_len = _HEADER.unpack_from(mm, 0)
+        if magic != MAGIC or version != BUNDLE_VERSION:
+            mm.close()
+            return 0, 0
+        index = json.loads(bytes(mm[_HEADER.size:_HEADER.size + index_len]).decode("utf-8"))
+    except (struct.error, ValueError):
+        mm.close()
+        return 0, 0
+
+    view = memoryview(mm)
+    pages = [pygame.image.frombuffer(view[p["offset"]:p["offset"] + p["length"]], (p["w"], p["h"]), p["format"])
+             for p in index["pages"]]
+    baked, stale = {}, 0
+    for entry in index["entries"]:
+        key = _key_from_json(entry["key"])
+        try:
+            fresh = _source_stamp(key[1]) == entry["source"]
+        except OSError:
+            fresh = False
+        if not fresh:
+            stale += 1   # PNG on muutunud – see kirje laetakse vanamoodi
+            continue
+        page = pages[entry["page"]]
+        rect = pygame.Rect(entry["rect"])
+        baked[key] = page if rect == page.get_rect() else page.subsurface(rect)
+    assets.clear_baked()
+    _map = mm       # vana mmap'i ei sulgeta – varem antud Surface'id võivad sellele veel viidata
+    assets.add_baked(baked)
+    return len(baked), stale
+
+
+def default_keys(w, h):
+    """Kõik pildid, mida mäng suurusega w × h kasutab (menüü, mäng, lõpp)."""
+    import end
+    import game
+    import menu
+    return menu.asset_keys(w, h) + game.asset_keys(w, h) + end.asset_keys(w, h)
+
+
+def main():
+    from main import WIDTH, HEIGHT
+    parser = argparse.ArgumentParser(description="Küpseta mängu pildid ühte mmap-itavasse faili.")
+    parser.add_argument("-o", "--out", default=BUNDLE_PATH)
+    parser.add_argument("--size", default=f"{WIDTH}x{HEIGHT}", help="akna suurus LxK")
+    args = parser.parse_args()
+    w, h = (int(v) for v in args.size.lower().split("x"))
+
+    import headless  # dummy draiverid – bake ei vaja akent
+    headless.init((w, h))
+    count = bake(default_keys(w, h), args.out)
+    print(f"[atlas] {count} pilti → {args.out} ({os.path.getsize(args.out) / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Mikseri häälte haldur mängu sündmuste helidele.
+
+Varem mängiti iga tabamuse, hävingu ja lasu peale Sound.play() suvalisel
+vabal kanalil – suurtes lainetes kümneid kattuvaid hääli korraga, mis sõid
+mikseri aega ja lõikasid üksteist katki. VoiceManager paneb igale helile oma
+reserveeritud kanalite grupi (piiratud häälte arv), ühendab sama heli mitu
+päringut ühe kaadri jooksul üheks valjemaks mängimiseks ja viskab üle eelarve
+minnes madalama prioriteediga helid ära: kui kõigi gruppide peale on budget
+häält juba mängimas, saab tähtis heli vaba kanali ainult mõne vähemtähtsa grupi
+vanima hääle arvelt (see vaigistatakse), vähemtähtis heli jääb mängimata.
+
+    mixer.request("hit")   # kaadri jooksul nii palju kui vaja
+    mixer.flush()          # kaadri lõpus – siin alles päriselt mängitakse
+"""
+import pygame
+
+DEFAULT_BUDGET = 6       # kõigi gruppide peale korraga mängivaid hääli (alla gruppide häälte summa, muidu ei piira)
+COALESCE_STEP = 0.5      # iga lisapäring samas kaadris lisab nii palju valjust (1 päring = 1.0)
+MAX_GAIN = 2.0           # kõige valjem ühendatud mängimine võrreldes tavalisega
+STEAL_PRIORITY = 1       # sellest prioriteedist alates võetakse oma grupi vanim hääl üle
+FREE_CHANNELS = 4        # reserveerimata kanaleid muudele helidele (menüü klõps jms)
+
+
+class VoiceManager:
+    """
+    sounds – {nimi: Sound}, voices – {nimi: max korraga mängivaid hääli},
+    priority – {nimi: prioriteet} (suurem = tähtsam). Helide endi helitugevus
+    peaks olema base_volume * MAX_GAIN, sest kanali helitugevus saab ainult vähendada.
+    """
+
+    def __init__(self, sounds, voices, priority=None, budget=DEFAULT_BUDGET):
+        self.sounds = sounds
+        self.priority = priority or {}
+        self.budget = budget
+        self._pending = {}          # nimi -> päringute arv selles kaadris
+        self._groups = {}           # nimi -> [Channel, ...]
+        self._started = {}          # Channel -> kaadri number, millal viimati käivitati
+        self._frame = 0
+        self.stats = {"requested": 0, "issued": 0, "coalesced": 0, "dropped": 0}
+
+        if not pygame.mixer.get_init():
+            return  # heli pole – päringud loetakse kokku ja visatakse ära
+        # esimesed kanalid reserveeritakse gruppidele, ülejäänud jäävad Sound.play() jaoks
+        reserved = sum(voices.get(name, 1) for name in sounds)
+        if pygame.mixer.get_num_channels() < reserved + FREE_CHANNELS:
+            pygame.mixer.set_num_channels(reserved + FREE_CHANNELS)
+        pygame.mixer.set_reserved(reserved)
+        idx = 0
+        for name in sounds:
+            n = voices.get(name, 1)
+            self._groups[name] = [pygame.mixer.Channel(i) for i in range(idx, idx + n)]
+            idx += n
+
+    def request(self, name):
+        """Jäta heli selle kaadri lõpus mängimiseks meelde."""
+        self.stats["requested"] += 1
+        self._pending[name] = self._pending.get(name, 0) + 1
+
+    def flush(self):
+        """Mängi kaadri jooksul kogunenud helid: tähtsamad enne, sama heli üks kord."""
+        self._frame += 1
+        if not self._pending:
+            return
+        pending = sorted(self._pending.items(), key=lambda kv: -self.priority.get(kv[0], 0))
+        self._pending.clear()
+        busy = sum(ch.get_busy() for group in self._groups.values() for ch in group)
+        for name, count in pending:
+            self.stats["coalesced"] += count - 1
+            channel, busy = self._pick_channel(name, busy)
+            if channel is None:
+                self.stats["dropped"] += 1
+                continue
+            if not channel.get_busy():
+                busy += 1
+            gain = min(MAX_GAIN, 1.0 + COALESCE_STEP * (count - 1))
+            channel.play(self.sounds[name])
+            channel.set_volume(gain / MAX_GAIN)
+            self._started[channel] = self._frame
+            self.stats["issued"] += 1
+
+    def _pick_channel(self, name, busy):
+        """
+        (kanal, busy): vaba kanal heli grupis, kui eelarves on ruumi. Üle eelarve saab tähtis heli
+        vaba kanali vähemtähtsa grupi vanima hääle vaigistamise arvelt, täis grupi korral oma grupi
+        vanima hääle; muidu kanal on None.
+        """
+        group = self._groups.get(name)
+        if not group:
+            return None, busy
+        free = next((ch for ch in group if not ch.get_busy()), None)
+        if free is not None and busy < self.budget:
+            return free, busy
+        prio = self.priority.get(name, 0)
+        if prio < STEAL_PRIORITY:
+            return None, busy
+        if free is not None:
+            victim = self._oldest(ch for other, chs in self._groups.items()
+                                  if self.priority.get(other, 0) < prio for ch in chs)
+            if victim is not None:
+                victim.stop()
+                return free, busy - 1
+        return self._oldest(group), busy
+
+    def _oldest(self, channels):
+        """Kõige varem käivitatud mängiv kanal või None."""
+        playing = [ch for ch in channels if ch.get_busy()]
+        return min(playing, key=lambda ch: self._started.get(ch, 0)) if playing else None
+
+    def stop(self):
+        """Vaigista kõik grupid ja unusta ootel päringud (nt mängust lahkudes)."""
+        self._pending.clear()
+        for group in self._groups.values():
+            for ch in group:
+                ch.stop()
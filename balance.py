@@ -0,0 +1,204 @@
+"""Raskusastme tasakaalustamine: tuhanded mängud ilma aknata, paralleelselt.
+
+Jooksutab iga parameetrite kombinatsiooni jaoks --games mängu (seemned 0..N-1)
+multiprocessing'u pool'is kõigil tuumadel ja koondab tulemused CSV-sse:
+ellujäämise määr, mitu HP-d igas laines kaotati ja kui kaua laine
+puhastamine võttis. Parameetrid on game.py raskusastme konstandid
+(TUNABLE), sihtimine tuleb skriptitud poliitikast.
+
+    python balance.py --games 500 --grid SPAWN_INTERVAL=0.4,0.5,0.6 \\
+        --grid ENEMY_BASE_SPEED=60,70,90 --policy noisy -o balance.csv
+
+Oma poliitika: --policy moodul:funktsioon, kus funktsioon(seed) tagastab
+policy(sim) -> game.Inputs (vt game.aim_nearest).
+"""
+import headless  # dummy draiverid enne pygame'i kasutamist
+
+import argparse
+import csv
+import importlib
+import itertools
+import multiprocessing
+import random
+import sys
+import time
+
+from main import WIDTH, HEIGHT
+
+# game.py konstandid, mida --grid võib muuta
+TUNABLE = (
+    "PLAYER_COOLDOWN", "WAVE_BASE_COUNT", "WAVE_COUNT_STEP", "SPAWN_INTERVAL",
+    "ENEMY_BASE_SPEED", "ENEMY_SPEED_PER_WAVE", "ENEMY_TOUGH_WAVE",
+)
+
+NOISY_AIM_SIGMA = 15.0    # "noisy" poliitika sihtimisviga (px, normaaljaotus)
+NOISY_FIRE_PROB = 0.3     # tõenäosus, et "noisy" poliitika antud sammul klõpsab
+
+_game = None
+_defaults = None
+
+
+# ---- POLIITIKAD ---- (tehas(seed) -> policy(sim); tehas peab olema mooduli tasemel, et pool leiaks)
+def nearest_policy(seed):
+    """Alati täpselt lähima vaenlase pihta (sama mis headless/bench)."""
+    return _game.aim_nearest
+
+
+def noisy_policy(seed):
+    """Lähima vaenlase suunas, aga ebatäpselt ja mitte igal sammul – inimesele lähem."""
+    rng = random.Random(seed)
+    aim_nearest, Inputs = _game.aim_nearest, _game.Inputs
+
+    def policy(sim):
+        aim = aim_nearest(sim)
+        if not aim.fire:
+            return aim
+        return Inputs(aim.aim_x + rng.gauss(0, NOISY_AIM_SIGMA),
+                      aim.aim_y + rng.gauss(0, NOISY_AIM_SIGMA),
+                      rng.random() < NOISY_FIRE_PROB)
+    return policy
+
+
+POLICIES = {"nearest": nearest_policy, "noisy": noisy_policy}
+
+
+def _policy_factory(name):
+    if name in POLICIES:
+        return POLICIES[name]
+    module, _, func = name.partition(":")
+    return getattr(importlib.import_module(module), func)
+
+
+# ---- ÜKS MÄNG (töötaja protsessis) ----
+def _init_worker():
+    """Töötaja ettevalmistus: simulatsioon ekraani ega pygame.init'i ei vaja, ainult dummy draivereid."""
+    global _game, _defaults
+    headless.dummy_drivers()
+    _game = importlib.import_module("game")
+    _defaults = {name: getattr(_game, name) for name in TUNABLE}
+
+
+def run_one(task):
+    """
+    Üks mäng: task = (parameetrid, seeme, poliitika nimi, sammusagedus, max samme).
+    Tagastab (parameetrid, lõppseis, [(laine, puhastatud, aeg s, kaotatud HP), ...]).
+    """
+    params, seed, policy_name, hz, max_ticks = task
+    if _game is None:
+        _init_worker()
+    for name, value in _defaults.items():
+        setattr(_game, name, params.get(name, value))
+
+    sim = _game.Simulation(WIDTH, HEIGHT, seed=seed)
+    policy = _policy_factory(policy_name)(seed)
+    dt = 1.0 / hz
+    waves = []
+    wave, start_t, start_hp = sim.waves.wave, 0.0, sim.player.hp
+    while sim.state == "play" and sim.ticks < max_ticks:
+        sim.step(dt, policy(sim))
+        if sim.waves.wave != wave or sim.state == "win":
+            waves.append((wave, True, sim.time - start_t, start_hp - sim.player.hp))
+            wave, start_t, start_hp = sim.waves.wave, sim.time, sim.player.hp
+    if sim.state != "win":
+        waves.append((wave, False, sim.time - start_t, start_hp - sim.player.hp))
+    return params, sim.state, waves
+
+
+# ---- KOONDAMINE ----
+def _key(params):
+    return tuple(sorted(params.items()))
+
+
+def aggregate(results, max_wave=10):
+    """Koonda mängude tulemused parameetrite kombinatsiooni ja laine kaupa CSV ridadeks."""
+    combos = {}
+    for params, state, waves in results:
+        c = combos.setdefault(_key(params), {"games": 0, "wins": 0, "waves": {}})
+        c["games"] += 1
+        c["wins"] += state == "win"
+        for wave, cleared, t, hp_lost in waves:
+            w = c["waves"].setdefault(wave, [0, 0, 0.0, 0.0])  # jõudis, puhastas, HP kokku, aeg kokku
+            w[0] += 1
+            w[1] += cleared
+            w[2] += hp_lost
+            w[3] += t if cleared else 0.0
+
+    rows = []
+    for key, c in sorted(combos.items()):
+        for wave in range(1, max_wave + 1):
+            reached, cleared, hp_lost, t = c["waves"].get(wave, (0, 0, 0.0, 0.0))
+            row = dict(key)
+            row.update({
+                "wave": wave,
+                "games": c["games"],
+                "survival_rate": round(c["wins"] / c["games"], 4),
+                "reached": reached,
+                "cleared": cleared,
+                "hp_lost_mean": round(hp_lost / reached, 4) if reached else "",
+                "clear_time_mean_s": round(t / cleared, 3) if cleared else "",
+            })
+            rows.append(row)
+    return rows
+
+
+def _parse_value(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _parse_grid(specs):
+    """["NIMI=1,2", ...] -> [{"NIMI": 1}, {"NIMI": 2}, ...] (kõik kombinatsioonid)."""
+    axes = []
+    for spec in specs or ():
+        name, _, values = spec.partition("=")
+        if name not in TUNABLE:
+            raise SystemExit(f"tundmatu parameeter {name!r}; lubatud: {', '.join(TUNABLE)}")
+        axes.append([(name, _parse_value(v)) for v in values.split(",") if v])
+    return [dict(combo) for combo in itertools.product(*axes)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Jooksuta palju mänge paralleelselt ja koonda raskusastme statistika.")
+    parser.add_argument("--games", type=int, default=100, help="mänge iga parameetrite kombinatsiooni kohta")
+    parser.add_argument("--grid", action="append", metavar="NIMI=v1,v2,...",
+                        help=f"parameetri väärtused (võib korrata): {', '.join(TUNABLE)}")
+    parser.add_argument("--policy", default="noisy", help="nearest, noisy või moodul:funktsioon")
+    parser.add_argument("--hz", type=int, default=30, help="loogika sammusagedus (tabamused on swept)")
+    parser.add_argument("--max-ticks", type=int, default=100000, help="mängu maksimaalne pikkus sammudes")
+    parser.add_argument("--procs", type=int, default=None, help="protsesside arv (vaikimisi kõik tuumad)")
+    parser.add_argument("-o", "--out", help="CSV fail (vaikimisi stdout)")
+    args = parser.parse_args()
+
+    _policy_factory(args.policy)  # vale nimi annab vea kohe, mitte igas töötajas
+    tasks = [(params, seed, args.policy, args.hz, args.max_ticks)
+             for params in _parse_grid(args.grid) for seed in range(args.games)]
+    procs = args.procs or multiprocessing.cpu_count()
+    chunk = max(1, len(tasks) // (procs * 8))
+
+    t0 = time.perf_counter()
+    results = []
+    # spawn: iga töötaja on puhas protsess – fork'iga päritud SDL/pygame'i olek võis pool'i lukustada
+    with multiprocessing.get_context("spawn").Pool(procs, initializer=_init_worker) as pool:
+        for i, res in enumerate(pool.imap_unordered(run_one, tasks, chunksize=chunk), 1):
+            results.append(res)
+            if i % 500 == 0:
+                print(f"[balance] {i}/{len(tasks)} mängu", file=sys.stderr)
+    elapsed = time.perf_counter() - t0
+    print(f"[balance] {len(tasks)} mängu {elapsed:.1f} s jooksul, {procs} protsessi "
+          f"({len(tasks) / elapsed:.1f} mängu/s)", file=sys.stderr)
+
+    rows = aggregate(results)
+    out = open(args.out, "w", newline="", encoding="utf-8") if args.out else sys.stdout
+    try:
+        writer = csv.DictWriter(out, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
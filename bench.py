@@ -0,0 +1,360 @@
+"""Jõudlusmõõtmised skriptitud stsenaariumitega (ilma aknata, SDL dummy draiver).
+
+Iga stsenaarium jooksutab Simulation'it fikseeritud sammuga, sihib aim_nearest
+poliitikaga ja joonistab kaadri nagu run_game. Tulemuseks on JSON kaadriaegade
+(keskmine/p95/p99) ja faaside (spawn, move, collide, draw) kuludega, lainete
+kaupa ning olemite tipparvudega – nii saab eri commit'ide tulemusi võrrelda.
+
+    python bench.py                         # kõik stsenaariumid, JSON stdout'i
+    python bench.py -s flood500 -o out.json # üks stsenaarium faili
+    python bench.py -s flood500 --towers 50 # sama 50 torniga (sihtimise kulu)
+    python bench.py -s flood500 --renderer sdl2 --software   # joonistamine SDL2 Renderer'iga
+    python bench.py -s flood500 --thread-compare             # loogika samas vs eraldi lõimes
+"""
+import headless  # paneb dummy draiverid paika enne pygame'i kasutamist
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import pygame
+
+from main import WIDTH, HEIGHT
+from profiling import PhaseTimer, summarize_ms
+import text_cache
+
+PHASES = ("spawn", "towers", "move", "collide", "effects", "draw")
+
+
+# ---- STSENAARIUMID ----
+# Igal stsenaariumil: setup(sim, game) enne algust, refill(sim, game) enne iga sammu (või None)
+# ja vaikimisi sammude arv. Üleujutustes on mängija surematu, et mõõtmine ei lõpeks kaotusega.
+
+def _setup_waves(sim, game):
+    pass
+
+
+def _setup_wave10(sim, game):
+    sim.waves.set_wave(10)
+
+
+def _make_flood(count):
+    def setup(sim, game):
+        sim.player.hp = 10 ** 9
+        sim.waves.done_spawning = True
+        sim.waves.spawned = sim.waves.to_spawn
+        refill(sim, game)
+
+    def refill(sim, game):
+        # hoia vaenlaste arv konstantne: tapetud ja mängijani jõudnud asendatakse uutega
+        for _ in range(count - len(sim.enemies)):
+            sim.enemies.append(sim.waves.make_enemy(sim.waves.wave, sim.W, sim.H, rng=sim.rng))
+    return setup, refill
+
+
+def _place_towers(sim, game, count):
+    """count torni ühtlase ruudustikuna üle maailma (raha ja limiiti ei kontrollita)."""
+    cols = max(1, round((count * sim.W / sim.H) ** 0.5))
+    rows = -(-count // cols)
+    for k in range(count):
+        cx, cy = k % cols, k // cols
+        sim.towers.place((cx + 0.5) * sim.W / cols, (cy + 0.5) * sim.H / rows)
+
+
+SCENARIOS = {
+    "waves":     (_setup_waves, None, 20000),
+    "wave10":    (_setup_wave10, None, 5000),
+    "flood500":  (*_make_flood(500), 600),
+    "flood5000": (*_make_flood(5000), 300),
+}
+
+
+def _draw_frame(game, screen, video, bg_image, font, sim, aim):
+    """Üks kaader nagu GameScene.draw (Surface'id + flip või Renderer, kui video on antud)."""
+    if video:
+        video.texture(bg_image).draw()
+        game._draw_world_video(video, sim, aim)
+        game._draw_hud_video(video, font, sim)
+        video.present()
+        return
+    screen.blit(bg_image, (0, 0))
+    game._draw_world(screen, sim, aim)
+    game._draw_hud(screen, font, sim)
+    pygame.display.flip()
+
+
+def run_scenario(name, game, screen, ticks=None, seed=1, backend=None, draw=True, towers=0, effects=False,
+                 video=None):
+    """
+    Jooksuta üks stsenaarium ja tagasta tulemuste sõnastik
+    (towers – mitu torni enne algust, effects – osakeste efektid nagu mängus,
+    video – sdl2_video.VideoOutput: joonista Renderer'iga).
+    """
+    setup, refill, default_ticks = SCENARIOS[name]
+    ticks = ticks or default_ticks
+
+    timer = PhaseTimer()
+    sim = game.Simulation(WIDTH, HEIGHT, seed=seed, backend=backend, timer=timer)
+    setup(sim, game)
+    _place_towers(sim, game, towers)
+    if effects:
+        sim.fx = game.effects.Effects(seed=seed)
+    bg_image = game._load_background(WIDTH, HEIGHT) if draw else None
+    font = text_cache.sys_font("consolas", 22)
+
+    frames = []
+    phases = {p: [] for p in PHASES}
+    per_wave = {}
+    peak_enemies = peak_bullets = peak_particles = 0
+    queries = []
+    dt = game.Simulation.TICK_DT
+
+    for _ in range(ticks):
+        if sim.state != "play":
+            break
+        wave = sim.waves.wave
+        inputs = game.aim_nearest(sim)  # skriptitud sisend ei ole kaadri kulu osa
+
+        timer.new_frame()
+        t0 = time.perf_counter()
+        if refill:
+            refill(sim, game)
+            timer.lap("spawn")
+        sim.step(dt, inputs)
+        if sim.fx is not None:
+            timer.mark()
+            sim.fx.update(dt)
+            timer.lap("effects")
+        if draw:
+            timer.mark()
+            _draw_frame(game, screen, video, bg_image, font, sim, (inputs.aim_x, inputs.aim_y))
+            timer.lap("draw")
+        frame = time.perf_counter() - t0
+
+        frames.append(frame)
+        per_wave.setdefault(wave, []).append(frame)
+        for p in PHASES:
+            phases[p].append(timer.phases.get(p, 0.0))
+        queries.append(sim.towers.last_queries)
+        peak_particles = max(peak_particles, len(sim.fx) if sim.fx is not None else 0)
+        peak_enemies = max(peak_enemies, len(sim.enemies))
+        peak_bullets = max(peak_bullets, len(sim.bullets))
+
+    return {
+        "ticks": len(frames),
+        "final": {"state": sim.state, "wave": sim.waves.wave, "score": sim.score},
+        "frame_ms": summarize_ms(frames),
+        "phase_ms": {p: summarize_ms(v) for p, v in phases.items()},
+        "per_wave_frame_ms": {str(w): summarize_ms(v) for w, v in sorted(per_wave.items())},
+        "peak": {"enemies": peak_enemies, "bullets": peak_bullets, "particles": peak_particles},
+        "towers": {"count": len(sim.towers), "queries_mean": sum(queries) / max(len(queries), 1),
+                   "queries_max": max(queries, default=0)},
+        "pools": sim.pool_stats(),
+        "effects": sim.fx.stats if sim.fx is not None else None,
+    }
+
+
+# ---- JOONISTAMISE VÕRDLUS ----
+DRAW_COUNTS = (100, 1000, 5000)
+DRAW_FRAMES = 200
+
+
+def run_draw_compare(game, screen, counts=DRAW_COUNTS, frames=DRAW_FRAMES, seed=1, backend=None, video=None):
+    """
+    Võrdle olemite joonistamist ükshaaval (draw.circle / blit) ja ühe blits() kutsega
+    (ning video korral SDL2 Renderer'iga, tekstuurid ja angle).
+    Iga arvu juures pool olemitest on kuulid ja pool vaenlased, juhuslikes kohtades ekraanil.
+    """
+    out = {}
+    for count in counts:
+        sim = game.Simulation(WIDTH, HEIGHT, seed=seed, backend=backend)
+        rng = sim.rng
+        for _ in range(count // 2):
+            e = sim.waves.make_enemy(1, WIDTH, HEIGHT, rng=rng)
+            e.pos.update(rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT))
+            e.prev.update(e.pos)
+            sim.enemies.append(e)
+            sim.bullets.append(game.Bullet(rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT), 1.0, 0.0))
+        aim = (0, 0)
+        res = {}
+        for mode, batched in (("per_entity", False), ("batched", True)):
+            game._draw_world(screen, sim, aim, batched=batched, want_rects=False)  # pöörded vahemällu
+            times = []
+            for _ in range(frames):
+                t0 = time.perf_counter()
+                game._draw_world(screen, sim, aim, batched=batched, want_rects=False)
+                times.append(time.perf_counter() - t0)
+            res[mode] = summarize_ms(times)
+        if video:
+            game._draw_world_video(video, sim, aim)   # tekstuurid GPU-le
+            times = []
+            for _ in range(frames):
+                t0 = time.perf_counter()
+                game._draw_world_video(video, sim, aim)
+                video.present()   # Renderer joonistab alles present'il (käsud on puhvris)
+                times.append(time.perf_counter() - t0)
+            res["sdl2"] = summarize_ms(times)
+        res["speedup"] = round(res["per_entity"]["mean"] / max(res["batched"]["mean"], 1e-9), 2)
+        out[str(count)] = res
+    return out
+
+
+# ---- LÕIMEDE VÕRDLUS ----
+THREAD_SECONDS = 5.0
+
+
+def run_thread_compare(game, screen, name, seconds=THREAD_SECONDS, seed=1, backend=None):
+    """
+    Sama stsenaarium reaalajas kahel viisil: "serial" – loogikasammud ja joonistamine ühes
+    lõimes (akumulaatoriga nagu GameScene), "threaded" – sim_thread.SimThread ja põhilõim
+    joonistab viimast hetktõmmist. Kaadreid ei piirata (joonistatakse nii kiiresti kui saab);
+    mõõdetakse kaadreid ja loogikasamme sekundis ning kaadriaega.
+    """
+    import sim_thread
+    setup, refill, _ = SCENARIOS[name]
+    bg_image = game._load_background(WIDTH, HEIGHT)
+    font = text_cache.sys_font("consolas", 22)
+    tick = game.Simulation.TICK_DT
+    out = {}
+    for mode in ("serial", "threaded"):
+        sim = game.Simulation(WIDTH, HEIGHT, seed=seed, backend=backend)
+        setup(sim, game)
+        sim.fx = fx = game.effects.Effects(seed=seed)
+        shown, worker = sim, None
+        if mode == "threaded":
+            worker = sim_thread.SimThread(sim, tick, policy=game.aim_nearest,
+                                          on_step=(lambda inputs: refill(sim, game)) if refill else None)
+            shown = sim_thread.SnapshotView(sim.player, fx)
+            worker.start()
+        frames, steps, acc = [], 0, 0.0
+        start = last = prev = time.perf_counter()
+        while last - start < seconds and sim.state == "play":
+            t0 = time.perf_counter()
+            if worker:
+                shown.load(worker.latest)
+                worker.fx.drain(fx)
+                worker.sounds.clear()
+                alpha = shown.alpha(time.perf_counter(), tick)
+            else:
+                acc += t0 - prev      # eelmise kaadri algusest möödunud aeg
+                prev = t0
+                n = 0
+                while acc >= tick and n < game.MAX_STEPS_PER_FRAME:
+                    if refill:
+                        refill(sim, game)
+                    sim.step(tick, game.aim_nearest(sim))
+                    acc -= tick
+                    n += 1
+                    steps += 1
+                if n == game.MAX_STEPS_PER_FRAME:
+                    acc = 0.0
+                alpha = acc / tick
+            fx.update(tick)
+            screen.blit(bg_image, (0, 0))
+            game._draw_world(screen, shown, (0, 0), alpha, batched=True, want_rects=False)
+            game._draw_hud(screen, font, shown)
+            pygame.display.flip()
+            last = time.perf_counter()
+            frames.append(last - t0)
+        elapsed = last - start
+        if worker:
+            worker.stop()
+            steps = worker.stats["steps"]
+        out[mode] = {
+            "seconds": round(elapsed, 2),
+            "fps": round(len(frames) / elapsed, 1),
+            "steps_per_s": round(steps / elapsed, 1),
+            "frame_ms": summarize_ms(frames),
+            "dropped_steps": worker.stats["dropped"] if worker else None,
+        }
+    out["cpus"] = os.cpu_count()
+    return out
+
+
+def _git_commit():
+    """Selle repo (mitte käivitamise kausta) commit; "unknown", kui git'i pole või see ebaõnnestub."""
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+    return out.stdout.strip() if out.returncode == 0 and out.stdout.strip() else "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mängu jõudlusmõõtmised (JSON väljund).")
+    parser.add_argument("-s", "--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="stsenaarium (võib korrata); vaikimisi kõik")
+    parser.add_argument("--ticks", type=int, default=None, help="sammude arv (vaikimisi stsenaariumi oma)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--backend", choices=("objects", "numpy"), default=None)
+    parser.add_argument("--towers", type=int, default=0, help="paiguta enne algust nii mitu torni")
+    parser.add_argument("--effects", action="store_true", help="osakeste efektid sees (nagu mängus)")
+    parser.add_argument("--no-draw", action="store_true", help="mõõda ainult loogikat")
+    parser.add_argument("--renderer", choices=("surface", "sdl2"), default="surface",
+                        help="joonista Surface'itega või SDL2 Renderer'iga (sdl2_video.py)")
+    parser.add_argument("--software", action="store_true", help="sdl2: SDL-i tarkvaraline Renderer")
+    parser.add_argument("--draw-compare", action="store_true",
+                        help="võrdle ainult olemite joonistamist ükshaaval vs blits() (100/1000/5000 olemit)")
+    parser.add_argument("--thread-compare", action="store_true",
+                        help="võrdle loogikat samas lõimes ja töölõimes (reaalajas, vt run_thread_compare)")
+    parser.add_argument("--seconds", type=float, default=THREAD_SECONDS, help="--thread-compare kestus režiimi kohta")
+    parser.add_argument("-o", "--out", help="kirjuta JSON faili (vaikimisi stdout)")
+    args = parser.parse_args()
+
+    screen = headless.init()
+    game = importlib.import_module("game")
+    video = None
+    if args.renderer == "sdl2":
+        import sdl2_video
+        video = sdl2_video.VideoOutput((WIDTH, HEIGHT), "bench", software=args.software)
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "backend": args.backend or game.ENTITY_BACKEND,
+            "seed": args.seed,
+            "draw": not args.no_draw,
+            "towers": args.towers,
+            "effects": args.effects,
+            "renderer": args.renderer + (" (software)" if video and args.software else ""),
+        },
+        "scenarios": {},
+    }
+    if args.draw_compare:
+        print("[bench] draw compare ...", file=sys.stderr)
+        report["draw_compare"] = run_draw_compare(game, screen, seed=args.seed, backend=args.backend, video=video)
+    if args.thread_compare:
+        report["thread_compare"] = {}
+        for name in args.scenario or ["flood500"]:
+            print(f"[bench] thread compare {name} ...", file=sys.stderr)
+            report["thread_compare"][name] = run_thread_compare(game, screen, name, args.seconds, args.seed,
+                                                                args.backend)
+    names = args.scenario or ([] if args.draw_compare else list(SCENARIOS))
+    for name in [] if args.thread_compare else names:
+        print(f"[bench] {name} ...", file=sys.stderr)
+        report["scenarios"][name] = run_scenario(
+            name, game, screen, ticks=args.ticks, seed=args.seed,
+            backend=args.backend, draw=not args.no_draw, towers=args.towers,
+            effects=args.effects, video=video,
+        )
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
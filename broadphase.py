@@ -0,0 +1,55 @@
+"""Ruumiline räsi (uniform grid) kokkupõrgete eelsõelumiseks.
+
+Iga objekt pannakse ruudustiku lahtrisse oma keskpunkti järgi. Päring tagastab
+ainult nende objektide indeksid, mis asuvad päringuringiga kattuvates lahtrites,
+nii et täpne (ruutkauguse) kontroll tehakse vaid lähedal olevate paaride jaoks.
+"""
+import math
+
+
+class SpatialHash:
+    """Ühtlane ruudustik: lahter (cx, cy) -> objektide indeksite list."""
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self._inv = 1.0 / cell_size
+        self._cells = {}
+
+    def clear(self):
+        """Tühjenda ruudustik (lahtrite listid jäävad alles taaskasutuseks)."""
+        for bucket in self._cells.values():
+            bucket.clear()
+
+    def insert(self, idx, x, y):
+        """Lisa objekt indeksiga idx punkti (x, y)."""
+        key = (math.floor(x * self._inv), math.floor(y * self._inv))
+        bucket = self._cells.get(key)
+        if bucket is None:
+            self._cells[key] = [idx]
+        else:
+            bucket.append(idx)
+
+    def rebuild(self, positions):
+        """Ehita ruudustik uuesti; positions on (x, y) paaride või Vector2'de jada."""
+        self.clear()
+        for idx, p in enumerate(positions):
+            self.insert(idx, p[0], p[1])
+
+    def query(self, x, y, radius):
+        """
+        Tagasta kasvavas järjekorras nende objektide indeksid, mis võivad olla
+        punktist (x, y) kuni radius kaugusel. Järjekord on sama, mis algses listis,
+        nii et tulemus ei sõltu sellest, kuidas objektid lahtritesse jagunesid.
+        """
+        inv = self._inv
+        x0, x1 = math.floor((x - radius) * inv), math.floor((x + radius) * inv)
+        y0, y1 = math.floor((y - radius) * inv), math.floor((y + radius) * inv)
+        cells = self._cells
+        found = []
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.extend(bucket)
+        found.sort()
+        return found
@@ -0,0 +1,123 @@
+"""Mängu sisene profiilimise ülekate (vaikimisi F3).
+
+Näitab viimaste kaadrite kaadriaja graafikut, faaside keskmisi aegu ja mitu
+Surface'i / Vector2't kaadris loodi, tornide arvu, sihtmärgi otsinguid kaadris,
+osakeste arvu ja kvaliteeditaset (quality.py). Andmed on profiling.FrameHistory
+ringpuhvris ja kirjutatakse sessiooni lõpus CSV faili. Kui ülekate on välja
+lülitatud, ei mõõdeta midagi – run_game saab siis timer=None.
+"""
+import pygame
+
+from profiling import ALLOCS, FrameHistory, PhaseTimer
+
+# run_game faasid joonistamise järjekorras
+PHASES = ("events", "spawn", "towers", "move", "collide", "effects", "background", "entities", "hud", "flip")
+COUNTERS = ("towers", "tower_queries", "particles", "quality", "quality_changes")   # end_frame(extra=...) kaudu
+COLUMNS = ("frame_ms",) + tuple(p + "_ms" for p in PHASES) + ("surfaces", "vector2s") + COUNTERS
+
+GRAPH_W, GRAPH_H = 300, 80       # graafiku mõõdud px
+GRAPH_MAX_MS = 50.0              # graafiku ülemine piir
+BUDGET_MS = 1000.0 / 60          # 60 FPS kaadri eelarve (joon graafikul)
+AVG_FRAMES = 60                  # mitme kaadri keskmist tekstina näidata
+
+PANEL_BG = (0, 0, 0, 170)
+BAR_OK = (80, 200, 90)
+BAR_SLOW = (230, 80, 60)
+TEXT = (235, 235, 235)
+
+
+class DebugOverlay:
+    """Profiilimise ülekate: active_timer() faasideks, end_frame() kaadri lõpus ja draw() (või render())."""
+
+    def __init__(self, capacity=600, key=pygame.K_F3):
+        self.key = key
+        self.enabled = False
+        self.used = False          # kas ülekate lülitati selle sessiooni jooksul sisse (export_csv)
+        self.timer = PhaseTimer()
+        self.history = FrameHistory(COLUMNS, capacity)
+        self._allocs = dict(ALLOCS)
+        self._font = None
+        self._panel = None
+
+    def handle_event(self, event):
+        """Lülita ülekate sisse/välja; tagastab True, kui sündmus oli ülekatte klahv."""
+        if event.type == pygame.KEYDOWN and event.key == self.key:
+            self.enabled = not self.enabled
+            self.used = self.used or self.enabled
+            self._allocs = dict(ALLOCS)
+            return True
+        return False
+
+    def active_timer(self):
+        """Faaside taimer, kui ülekate on sees, muidu None (siis ei mõõdeta midagi)."""
+        return self.timer if self.enabled else None
+
+    def end_frame(self, frame_dt, extra=None):
+        """
+        Salvesta lõppenud kaadri ajad ja loodud objektide arv ringpuhvrisse.
+        extra – {COUNTERS veerg: arv} selle kaadri kohta (nt tornide päringud).
+        """
+        if not self.enabled:
+            return
+        phases = self.timer.phases
+        row = {"frame_ms": frame_dt * 1000.0}
+        for p in PHASES:
+            row[p + "_ms"] = phases.get(p, 0.0) * 1000.0
+        row["surfaces"] = ALLOCS["surface"] - self._allocs["surface"]
+        row["vector2s"] = ALLOCS["vector2"] - self._allocs["vector2"]
+        self._allocs = dict(ALLOCS)
+        if extra:
+            row.update(extra)
+        self.history.push(row)
+
+    def render(self):
+        """Joonista graafik ja keskmised paneelile ja tagasta see (None, kui ülekate on väljas)."""
+        if not self.enabled:
+            return None
+        if self._font is None:
+            self._font = pygame.font.SysFont("consolas", 14)
+            self._panel = pygame.Surface((GRAPH_W + 20, GRAPH_H + 30 + 16 * (len(PHASES) + 4)), pygame.SRCALPHA)
+        panel = self._panel
+        panel.fill(PANEL_BG)
+
+        # kaadriaja graafik (üks tulp kaadri kohta, punane kui üle eelarve)
+        frames = self.history.column("frame_ms")[-GRAPH_W:]
+        base_y = 10 + GRAPH_H
+        for x, ms in enumerate(frames):
+            h = min(GRAPH_H, int(ms / GRAPH_MAX_MS * GRAPH_H))
+            color = BAR_SLOW if ms > BUDGET_MS else BAR_OK
+            pygame.draw.line(panel, color, (10 + x, base_y), (10 + x, base_y - h))
+        budget_y = base_y - int(BUDGET_MS / GRAPH_MAX_MS * GRAPH_H)
+        pygame.draw.line(panel, TEXT, (10, budget_y), (10 + GRAPH_W, budget_y))
+
+        # keskmised viimase AVG_FRAMES kaadri peale
+        lines = [f"kaader {self.history.mean('frame_ms', AVG_FRAMES):6.2f} ms"]
+        for p in PHASES:
+            lines.append(f"{p:<11}{self.history.mean(p + '_ms', AVG_FRAMES):6.2f} ms")
+        lines.append(f"Surface/kaader {self.history.mean('surfaces', AVG_FRAMES):5.1f}  "
+                     f"Vector2/kaader {self.history.mean('vector2s', AVG_FRAMES):6.1f}")
+        lines.append(f"torne {self.history.mean('towers', 1):3.0f}  "
+                     f"otsinguid/kaader {self.history.mean('tower_queries', AVG_FRAMES):5.1f}  "
+                     f"osakesi {self.history.mean('particles', 1):4.0f}")
+        lines.append(f"kvaliteet {self.history.mean('quality', 1):1.0f}  "
+                     f"muutusi {self.history.mean('quality_changes', 1):3.0f}")
+        y = base_y + 10
+        for line in lines:
+            panel.blit(self._font.render(line, True, TEXT), (10, y))
+            y += 16
+        return panel
+
+    def draw(self, surface):
+        """Joonista paneel ekraani paremasse ülanurka; tagastab paneeli ala või None."""
+        panel = self.render()
+        if panel is None:
+            return None
+        return surface.blit(panel, (surface.get_width() - panel.get_width() - 10, 10))
+
+    def export_csv(self, path):
+        """Kirjuta kogutud kaadrid CSV faili, kui ülekate oli sel sessioonil sees; järgmine sessioon alustab puhtalt."""
+        used, self.used = self.used, self.enabled
+        if used and len(self.history):
+            self.history.export_csv(path)
+            return True
+        return False
@@ -0,0 +1,79 @@
+"""Mustade ristkülikute (dirty rect) joonistamine mängu jaoks.
+
+Tavarežiimis joonistatakse igas kaadris kogu 1260×720 taust ja kutsutakse
+pygame.display.flip(). Tegelikult muutuvad ainult väikesed alad kuulide,
+vaenlaste, mängija ja HUD-i ümber. DirtyRenderer taastab tausta ainult eelmise
+kaadri joonistatud alade alt, joonistamise järel liidab eelmise ja praeguse
+kaadri alad (kattuvad ühendatakse) ja saadab need pygame.display.update(rects)
+abil ekraanile. Kui muutunud ala on liiga suur, tehakse automaatselt tavaline
+flip().
+"""
+import pygame
+
+DEFAULT_MAX_FRACTION = 0.35   # kui mustad alad katavad üle selle osa ekraanist → flip()
+DEFAULT_MAX_RECTS = 300       # nii paljude ristkülikute korral ei tasu ühendamine end ära → flip()
+
+
+def merge_rects(rects):
+    """Ühenda kattuvad ristkülikud, kuni ükski tulemus teisega ei kattu."""
+    merged = []
+    for r in rects:
+        r = pygame.Rect(r)
+        if not r.w or not r.h:
+            continue
+        # neela kõik olemasolevad, mis uuega kattuvad (ühend võib omakorda kattuda teistega)
+        i = r.collidelist(merged)
+        while i != -1:
+            r.union_ip(merged.pop(i))
+            i = r.collidelist(merged)
+        merged.append(r)
+    return merged
+
+
+class DirtyRenderer:
+    """begin() enne joonistamist, end(rects) pärast – rects on selle kaadri joonistatud alad."""
+
+    def __init__(self, screen, background, max_fraction=DEFAULT_MAX_FRACTION, max_rects=DEFAULT_MAX_RECTS):
+        self.screen = screen
+        self.background = background
+        self.max_area = int(screen.get_width() * screen.get_height() * max_fraction)
+        self.max_rects = max_rects
+        self._prev = []           # eelmise kaadri joonistatud alad
+        self._full = True         # järgmine kaader joonistab kogu tausta
+        self.frames_dirty = 0
+        self.frames_full = 0
+        self.last_area = 0        # viimati ekraanile saadetud pindala (px)
+
+    def invalidate(self):
+        """Järgmisel kaadril joonista kogu taust ja tee flip() (nt pärast ülekatte sulgemist)."""
+        self._full = True
+
+    def begin(self):
+        """Taasta taust eelmise kaadri joonistatud alade all (või kogu ekraanil)."""
+        if self._full or len(self._prev) > self.max_rects:
+            self.screen.blit(self.background, (0, 0))
+            return
+        bg, blit = self.background, self.screen.blit
+        for r in self._prev:
+            blit(bg, r, r)
+
+    def end(self, rects):
+        """Saada muutunud alad ekraanile; tagastab "full" või "dirty"."""
+        prev, self._prev = self._prev, rects
+        if self._full or len(prev) + len(rects) > self.max_rects:
+            return self._flip()
+        dirty = merge_rects(prev + rects)
+        area = sum(r.w * r.h for r in dirty)
+        if area > self.max_area:
+            return self._flip()
+        pygame.display.update(dirty)
+        self.last_area = area
+        self.frames_dirty += 1
+        return "dirty"
+
+    def _flip(self):
+        pygame.display.flip()
+        self._full = False
+        self.last_area = self.screen.get_width() * self.screen.get_height()
+        self.frames_full += 1
+        return "full"
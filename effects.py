@@ -0,0 +1,137 @@
+"""Osakeste efektid: tabamused, surmad ja mängija pihtasaamine.
+
+Kõik osakesed on eelnevalt eraldatud fikseeritud suurusega massiivides
+(asukoht, kiirus, eluiga, värv) ja uuendatakse ühe vektoriseeritud sammuga.
+Joonistamiseks on iga värvi jaoks kaks eelrenderdatud täppi (circle_sprite),
+nii et kaader on üks blits-järjekord, mitte iga osakese jaoks oma draw-kutse.
+
+Eelarve (PARTICLE_BUDGET) on kõva piir: kui massiivid on üle poole täis,
+tehakse iga efekti jaoks vähem osakesi ja täis puhvri korral jäetakse uued
+lihtsalt tegemata – efektid lahjenevad, mäng ei aeglustu. density (0..1)
+vähendab osakeste arvu efekti kohta veel (kvaliteedi regulaator, quality.py).
+Ilma numpy'ta efekte ei ole (emit ei tee midagi).
+"""
+import math
+
+from render_queue import circle_sprite
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+PARTICLE_BUDGET = 2000        # rohkem osakesi korraga ei ole (≈3 ms blits täis puhvriga)
+DRAG = 4.0                    # kiiruse sumbumine (1/s)
+SMALL_AFTER = 0.15            # viimased sekundid joonistatakse väiksema täpiga
+DOT_RADII = (1, 2)            # väike ja suur täpp (px)
+
+# efekt: (värv, osakesi, kiirus px/s, eluiga s)
+HIT = ((255, 210, 80), 6, 140.0, 0.25)
+DEATH = ((220, 60, 60), 16, 220.0, 0.5)
+PLAYER_HIT = ((255, 255, 255), 24, 260.0, 0.6)
+PALETTE = (HIT[0], DEATH[0], PLAYER_HIT[0])
+
+
+class Effects:
+    """
+    Osakeste puhver. Emitterid: enemy_hit(x, y, killed), player_hit(x, y);
+    update(dt) kord kaadris, pairs(scale) annab (Surface, (x, y)) paarid RenderQueue jaoks.
+    stats: emitted (tehtud), dropped (eelarve tõttu tegemata).
+    """
+
+    def __init__(self, capacity=PARTICLE_BUDGET, seed=None):
+        self.capacity = capacity
+        self.n = 0
+        self.density = 1.0     # osakeste osa efekti kohta (0 = efekte ei tehta)
+        self.stats = {"emitted": 0, "dropped": 0}
+        self._dots = None
+        if np is None:
+            return
+        self._rng = np.random.default_rng(seed)
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros(capacity, dtype=np.int16)     # PALETTE indeks
+
+    def __len__(self):
+        return self.n
+
+    def clear(self):
+        self.n = 0
+
+    # ---- EMITTERID ----
+    def enemy_hit(self, x, y, killed=False):
+        self._emit(x, y, *(DEATH if killed else HIT))
+
+    def player_hit(self, x, y):
+        self._emit(x, y, *PLAYER_HIT)
+
+    def _emit(self, x, y, color, count, speed, life):
+        if np is None or self.density <= 0:
+            return
+        if self.density < 1:
+            count = max(1, int(count * self.density))
+        n, cap = self.n, self.capacity
+        free = cap - n
+        half = cap // 2
+        if n > half:   # üle poole täis → vähem osakesi efekti kohta (vähemalt 1)
+            count = max(1, count * free // (cap - half))
+        k = min(count, free)
+        self.stats["dropped"] += count - k
+        if k <= 0:
+            return
+        rng = self._rng
+        angle = rng.random(k, dtype=np.float32) * np.float32(2 * math.pi)
+        v = rng.uniform(0.3, 1.0, k).astype(np.float32) * np.float32(speed)
+        s = slice(n, n + k)
+        self.pos[s] = (x, y)
+        self.vel[s, 0] = np.cos(angle) * v
+        self.vel[s, 1] = np.sin(angle) * v
+        self.life[s] = rng.uniform(0.6, 1.0, k).astype(np.float32) * np.float32(life)
+        self.color[s] = PALETTE.index(color)
+        self.n = n + k
+        self.stats["emitted"] += k
+
+    # ---- UUENDAMINE JA JOONISTAMINE ----
+    def update(self, dt):
+        """Liiguta kõiki osakesi korraga ja eemalda aegunud (elusad jäävad [0, n))."""
+        n = self.n
+        if not n:
+            return
+        dt = np.float32(dt)
+        vel = self.vel[:n]
+        self.pos[:n] += vel * dt
+        vel *= np.float32(max(0.0, 1.0 - DRAG * dt))
+        life = self.life[:n]
+        life -= dt
+        keep = life > 0
+        k = int(np.count_nonzero(keep))
+        if k == n:
+            return
+        for arr in (self.pos, self.vel, self.life, self.color):
+            arr[:k] = arr[:n][keep]
+        self.n = k
+
+    def _sprites(self):
+        """[värv × 2 + suur] -> eelrenderdatud täpp; luuakse esimesel joonistamisel."""
+        if self._dots is None:
+            self._dots = [circle_sprite(c, r) for c in PALETTE for r in DOT_RADII]
+        return self._dots
+
+    def pairs(self, scale=1.0):
+        """(Surface, (x, y)) paarid kõigi osakeste jaoks (scale – renderdamise skaala)."""
+        n = self.n
+        if not n:
+            return []
+        dots = self._sprites()
+        key = self.color[:n] * 2 + (self.life[:n] > SMALL_AFTER)
+        off = np.where(key % 2 == 1, DOT_RADII[1], DOT_RADII[0])
+        xy = (self.pos[:n] * np.float32(scale)).astype(np.int32) - off[:, None]
+        return [(dots[k], (x, y)) for k, (x, y) in zip(key.tolist(), xy.tolist())]
+
+    def draw(self, surface, scale=1.0, doreturn=False):
+        """Joonista osakesed ühe blits'iga (kui olemeid ei joonistata järjekorra kaudu)."""
+        pairs = self.pairs(scale)
+        if not pairs:
+            return [] if doreturn else None
+        return surface.blits(pairs, doreturn=doreturn)
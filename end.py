@@ -1,7 +1,11 @@
-import os
 import pygame
 
+import assets
+import text_cache
+from scenes import IDLE_TIMEOUT_MS, REDRAW_EVENTS, Scene, present, run_scene
+
 WHITE = (255, 255, 255)
+END_BG = "päike.png"
 
 TEKST = (
     "Palju õnne! Sa jäid ellu ja saad minna edasi Shooters'isse!\n"
@@ -15,7 +19,7 @@ def _render_multiline_center(surface, font, text, color, center_x, center_y, lin
     Tagastab joonistatud ploki alumise serva y-koordinaadi.
     """
     lines = text.split("\n")
-    rendered = [font.render(line, True, color) for line in lines]
+    rendered = [text_cache.render(font, line, color) for line in lines]
     heights = [surf.get_height() for surf in rendered]
     total_h = sum(heights) + line_gap * (len(rendered) - 1)
     start_y = int(center_y - total_h // 2)
@@ -27,43 +31,71 @@ def _render_multiline_center(surface, font, text, color, center_x, center_y, lin
         y += surf.get_height() + line_gap
     return y
 
-def run_end(screen):
-    clock = pygame.time.Clock()
-    W, H = screen.get_size()
-
-    # Taustapilt
-    bg_path = os.path.join(os.path.dirname(__file__), "assets", "päike.png")
-    bg = pygame.image.load(bg_path).convert()
-    bg = pygame.transform.scale(bg, (W, H))
+def asset_keys(w, h):
+    """Lõpuekraani pildid (atlas.py küpsetab need ette)."""
+    return [assets.key_scaled(END_BG, (w, h))]
 
-    # Fondid
-    font_big = pygame.font.SysFont("Courier", 40, bold=True)
-    font = pygame.font.SysFont("Courier", 22, bold=True)
+class EndScene(Scene):
+    """
+    Võiduekraan: taust ja fondid laetakse esimesel korral ja jäävad alles. Pilt ei muutu,
+    seega joonistatakse see üks kord valmis pinnale ja ekraanile ainult sisenemisel
+    või akna sündmuse järel; vahepeal ootab stseen sündmusi (idle_timeout).
+    """
 
     title_text = "VÕIT!"
+    idle_timeout = IDLE_TIMEOUT_MS
+
+    def prepare(self):
+        W, H = self.screen.get_size()
 
-    while True:
-        for event in pygame.event.get():
+        # Taustapilt
+        self.bg = assets.scaled(END_BG, (W, H))
+
+        # Fondid
+        self.font_big = text_cache.sys_font("Courier", 40, bold=True)
+        self.font = text_cache.sys_font("Courier", 22, bold=True)
+
+        self.frame = pygame.Surface((W, H)).convert()
+        self._compose(self.frame)
+
+    def enter(self):
+        self.dirty = True
+
+    def update(self, dt, events):
+        for event in events:
             if event.type == pygame.QUIT:
                 return "QUIT"
             if event.type == pygame.KEYDOWN:
                 return "BACK_TO_MENU"
+            if event.type in REDRAW_EVENTS:
+                self.dirty = True
+        return None
+
+    def draw(self):
+        if not self.dirty:
+            return
+        self.screen.blit(self.frame, (0, 0))
+        present()
+        self.dirty = False
 
-        screen.blit(bg, (0, 0))
+    def _compose(self, surface):
+        """Joonista kogu võiduekraan pinnale surface."""
+        W, H = surface.get_size()
+        surface.blit(self.bg, (0, 0))
 
         # Pealkiri (keskele, veidi kõrgemale)
-        title_surf = font_big.render(title_text, True, WHITE)
+        title_surf = text_cache.render(self.font_big, self.title_text, WHITE)
         title_x = W // 2 - title_surf.get_width() // 2
         title_y = H // 2 - 100
-        screen.blit(title_surf, (title_x, title_y))
+        surface.blit(title_surf, (title_x, title_y))
 
         # Mitmerealne teade (keskele)
         _render_multiline_center(
-            screen, font, TEKST, WHITE,
+            surface, self.font, TEKST, WHITE,
             center_x=W // 2,
             center_y=H // 2 + 20,
             line_gap=6
         )
 
-        pygame.display.flip()
-        clock.tick(60)
+def run_end(screen):
+    return run_scene(EndScene(screen))
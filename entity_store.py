@@ -0,0 +1,238 @@
+"""NumPy-põhine (struct-of-arrays) hoidla kuulide ja vaenlaste jaoks.
+
+Objektipõhises versioonis on iga kuul/vaenlane eraldi Pythoni objekt oma
+pygame.Vector2'ga ja neid uuendatakse ükshaaval. Siin on kõik väljad (asukoht,
+kiirus, eluiga, hp, elus-mask …) järjestikustes float32 massiivides ning
+liikumine, eluea lõpp, ekraanilt väljumine ja ringide kokkupõrked tehakse
+vektoriseeritult korraga kõigi olemite peale.
+
+NumPy on valikuline – kui see puudub, on HAVE_NUMPY väärtus False ja
+game.run_game kasutab tavalisi objekte.
+"""
+try:
+    import numpy as np
+except ImportError:  # numpy pole paigaldatud → ainult objektipõhine variant
+    np = None
+
+HAVE_NUMPY = np is not None
+
+BULLET_SPEED = 600.0   # px/s, sama mis Bullet klassis
+BULLET_LIFE = 2.0      # s
+CULL_MARGIN = 50       # kui kaugele ekraanist kuul võib minna, enne kui kustutatakse
+
+COLLIDE_CHUNK = 1 << 18  # mitu (vaenlane, kuul) paari korraga maatriksisse arvutada
+
+
+class EntityStore:
+    """Ühine alus: massiivid kasvavad vajadusel kahekordseks, elus olemid on alati [0, n)."""
+
+    def __init__(self, capacity=256, release=None):
+        if not HAVE_NUMPY:
+            raise RuntimeError("EntityStore vajab numpy't")
+        self.n = 0
+        self.release = release  # append() annab üle võetud objekti sellele tagasi (nt Pool.release)
+        self._alloc(capacity)
+
+    def _alloc(self, capacity):
+        self.capacity = capacity
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)    # asukoht (x, y)
+        self.prev = np.zeros((capacity, 2), dtype=np.float32)   # asukoht eelmise sammu alguses
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)    # kiirusvektor (px/s)
+        self.speed = np.zeros(capacity, dtype=np.float32)       # kiiruse suurus (vaenlastel)
+        self.hp = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)        # järelejäänud eluiga (kuulidel)
+        self.r = np.zeros(capacity, dtype=np.float32)           # ringi raadius
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.sprite = np.full(capacity, -1, dtype=np.int16)     # game.enemy_sprites() indeks või -1
+        self.uid = np.full(capacity, -1, dtype=np.int64)        # vaenlase püsiv id (kasvab lisamise järjekorras)
+
+    _FIELDS = ("pos", "prev", "vel", "speed", "hp", "life", "r", "alive", "sprite", "uid")
+
+    def _grow(self):
+        old = {name: getattr(self, name) for name in self._FIELDS}
+        self._alloc(self.capacity * 2)
+        for name, arr in old.items():
+            getattr(self, name)[:self.n] = arr[:self.n]
+
+    def _slot(self):
+        """Tagasta järgmise vaba rea indeks (vajadusel kasvata massiive)."""
+        if self.n >= self.capacity:
+            self._grow()
+        i = self.n
+        self.n += 1
+        self.alive[i] = True
+        return i
+
+    def __len__(self):
+        # Nagu list enne prügikoristust: surnud olemid loetakse kuni compact()-ini
+        return self.n
+
+    def compact(self):
+        """Eemalda surnud olemid ja nihuta elusad massiivide algusesse (list comprehensioni asendus)."""
+        n = self.n
+        keep = self.alive[:n].copy()  # koopia – "alive" ise kompakteeritakse samas tsüklis
+        k = int(np.count_nonzero(keep))
+        if k == n:
+            return
+        for name in self._FIELDS:
+            arr = getattr(self, name)
+            arr[:k] = arr[:n][keep]
+        self.alive[k:n] = False
+        self.n = k
+
+    def clear(self):
+        """Eemalda kõik olemid (massiivid jäävad alles)."""
+        self.alive[:self.n] = False
+        self.n = 0
+
+    def positions(self, alpha=None):
+        """
+        Elusate (ja veel kompakteerimata) olemite asukohad Pythoni listina [(x, y), ...].
+        alpha – joonistamiseks interpoleeri eelmise ja praeguse sammu vahel (0 = prev, 1 = pos).
+        """
+        pos = self.pos[:self.n]
+        if alpha is None or alpha >= 1.0:
+            return pos.tolist()
+        prev = self.prev[:self.n]
+        return (prev + (pos - prev) * np.float32(alpha)).tolist()
+
+
+class BulletStore(EntityStore):
+    """Kuulid massiividena."""
+
+    def add(self, x, y, dx, dy, r=4):
+        i = self._slot()
+        self.pos[i] = self.prev[i] = (x, y)
+        self.vel[i] = (dx * BULLET_SPEED, dy * BULLET_SPEED)
+        self.life[i] = BULLET_LIFE
+        self.r[i] = r
+
+    def append(self, bullet):
+        """Võta üle Bullet objekti andmed (Player.shoot tagastab Bullet'i)."""
+        i = self._slot()
+        self.pos[i] = self.prev[i] = (bullet.pos.x, bullet.pos.y)
+        self.vel[i] = (bullet.vel.x, bullet.vel.y)
+        self.life[i] = bullet.life
+        self.r[i] = bullet.r
+        if self.release:
+            self.release(bullet)
+
+    def update(self, dt, w, h):
+        """Liiguta kõiki kuule, vähenda eluiga ja märgi ekraanilt lahkunud surnuks."""
+        n = self.n
+        if not n:
+            return
+        pos = self.pos[:n]
+        self.prev[:n] = pos
+        pos += self.vel[:n] * np.float32(dt)
+        life = self.life[:n]
+        life -= np.float32(dt)
+        x, y = pos[:, 0], pos[:, 1]
+        gone = (life <= 0) | (x < -CULL_MARGIN) | (x > w + CULL_MARGIN) | (y < -CULL_MARGIN) | (y > h + CULL_MARGIN)
+        self.alive[:n] &= ~gone
+
+
+class EnemyStore(EntityStore):
+    """Vaenlased massiividena."""
+
+    def add(self, x, y, speed, hp, r, sprite_idx=None, uid=-1):
+        i = self._slot()
+        self.pos[i] = self.prev[i] = (x, y)
+        self.vel[i] = (0.0, 0.0)
+        self.speed[i] = speed
+        self.hp[i] = hp
+        self.r[i] = r
+        self.sprite[i] = -1 if sprite_idx is None else sprite_idx
+        self.uid[i] = uid
+
+    def append(self, enemy):
+        """Võta üle Enemy objekti andmed (Waves.update lisab Enemy objekte)."""
+        self.add(enemy.pos.x, enemy.pos.y, enemy.speed, enemy.hp, enemy.r, enemy.sprite_idx, enemy.uid)
+        if self.release:
+            self.release(enemy)
+
+    def update(self, dt, tx, ty):
+        """
+        Liiguta kõiki vaenlasi punkti (tx, ty) suunas (sama mis _unit_vec * speed * dt).
+        tx, ty võivad olla ka n-pikkused massiivid – iga vaenlane oma sihi poole (voováli).
+        """
+        n = self.n
+        if not n:
+            return
+        pos = self.pos[:n]
+        self.prev[:n] = pos
+        d = np.empty((n, 2), dtype=np.float32)
+        d[:, 0] = tx - pos[:, 0]
+        d[:, 1] = ty - pos[:, 1]
+        dist = np.hypot(d[:, 0], d[:, 1])
+        dist[dist == 0] = 1.0  # d on siis niikuinii (0, 0) → ühikvektor (0, 0)
+        vel = self.vel[:n]
+        np.multiply(d, (self.speed[:n] / dist)[:, None], out=vel)
+        pos += vel * np.float32(dt)
+
+    def facing_angles(self, tx, ty):
+        """Pöördenurgad kraadides (nagu Enemy.draw), et sprite vaataks punkti (tx, ty) poole."""
+        pos = self.pos[:self.n]
+        return (-np.degrees(np.arctan2(ty - pos[:, 1], tx - pos[:, 0]))).tolist()
+
+
+def collide_bullets(enemies, bullets, on_hit=None):
+    """
+    Kuulide ja vaenlaste ringide kokkupõrge viimase sammu jooksul (swept – prev → pos),
+    nii et kiire kuul ei hüppa madala sammusageduse korral vaenlasest üle.
+    Tagastab (tabamusi, tapmisi). on_hit(x, y, tapetud) kutsutakse iga tabamuse järel.
+
+    Kaugused arvutatakse vektoriseeritult plokkide kaupa; tabamuste lahendamine
+    käib samas järjekorras nagu objektipõhises tsüklis (vaenlane, siis kuul
+    listi järjekorras), et tulemus oleks sama.
+    """
+    ne, nb = enemies.n, bullets.n
+    if not ne or not nb:
+        return 0, 0
+    bx, by = bullets.pos[:nb, 0], bullets.pos[:nb, 1]
+    bpx, bpy = bullets.prev[:nb, 0], bullets.prev[:nb, 1]
+    br = bullets.r[:nb]
+    b_alive = bullets.alive
+    e_alive, e_hp = enemies.alive, enemies.hp
+    rows = max(1, COLLIDE_CHUNK // nb)
+    hits = kills = 0
+    for start in range(0, ne, rows):
+        stop = min(ne, start + rows)
+        # suhteline asukoht sammu alguses (ax, ay) ja lõpus; lähim punkt lõigul t ∈ [0, 1]
+        ax = enemies.prev[start:stop, 0, None] - bpx[None, :]
+        ay = enemies.prev[start:stop, 1, None] - bpy[None, :]
+        mx = enemies.pos[start:stop, 0, None] - bx[None, :] - ax
+        my = enemies.pos[start:stop, 1, None] - by[None, :] - ay
+        mm = mx * mx + my * my
+        t = np.clip(-(ax * mx + ay * my) / np.where(mm > 0, mm, 1), 0, 1)
+        dx = ax + mx * t
+        dy = ay + my * t
+        rr = enemies.r[start:stop, None] + br[None, :]
+        cand = (dx * dx + dy * dy <= rr * rr) & b_alive[None, :nb] & e_alive[start:stop, None]
+        ei, bi = np.nonzero(cand)  # ridade kaupa → vaenlase, siis kuuli järjekorras
+        for e, b in zip((ei + start).tolist(), bi.tolist()):
+            if not b_alive[b]:
+                continue  # eelmine vaenlane juba kasutas selle kuuli ära
+            b_alive[b] = False
+            e_hp[e] -= 1
+            hits += 1
+            if e_hp[e] <= 0:
+                e_alive[e] = False
+                kills += 1
+            if on_hit:
+                on_hit(float(enemies.pos[e, 0]), float(enemies.pos[e, 1]), not e_alive[e])
+    return hits, kills
+
+
+def collide_player(enemies, px, py, pr):
+    """Vaenlased, kes puudutavad mängijat, surevad; tagastab nende arvu (= kaotatud HP)."""
+    n = enemies.n
+    if not n:
+        return 0
+    pos = enemies.pos[:n]
+    dx = pos[:, 0] - px
+    dy = pos[:, 1] - py
+    rr = enemies.r[:n] + pr
+    touch = (dx * dx + dy * dy <= rr * rr) & enemies.alive[:n]
+    enemies.alive[:n] &= ~touch
+    return int(np.count_nonzero(touch))
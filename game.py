@@ -4,8 +4,30 @@ Eeskujuna kastuatud allikad on Tartu linna poolt tehtud pildid Pirogovi pargist
 import os
 import math
 import random
+import time
+import tempfile
 import pygame
-import glob  # (ENEMY_PATTERN tugi)
+from collections import namedtuple
+from itertools import count
+
+import assets
+import audio
+import effects
+import navigation
+import quality
+import towers
+import replay
+import sim_thread
+import text_cache
+from broadphase import SpatialHash
+from debug_overlay import DebugOverlay
+from dirty_rects import DirtyRenderer
+from entity_store import HAVE_NUMPY, BulletStore, EnemyStore, collide_bullets, collide_player
+from pool import Pool, compact_alive
+from profiling import count_alloc
+from render_queue import RenderQueue, circle_sprite
+from rotation_cache import RotationCache
+from scenes import Scene, present, run_scene
 
 # ---- VÄRVID / KONSTANDID ----
 WHITE  = (255, 255, 255)
@@ -14,6 +36,7 @@ GREEN  = (40, 160, 60)
 YELLOW = (250, 220, 70)
 BLACK  = (10,  10,  10)
 DARK_GREEN = (20, 60, 20)
+BLUE   = (90, 160, 255)
 
 # Taustapildi failinimi (asub kaustas assets/) – jätame samaks stiiliks nagu sul oli
 BG_FILENAME = os.path.join(os.path.dirname(__file__), "assets", "pirogov_droon.png")
@@ -28,6 +51,66 @@ SPAWN_REL = (0.535, 0.305)
 # Suurused (ringide/“hitboxi” raadiused px)
 PLAYER_R = 18
 ENEMY_R  = 18
+BULLET_R = 4
+BULLET_SPEED = 600   # px/s
+
+# Raskusastme konstandid (vt balance.py – neid saab korraga paljude mängudega läbi proovida)
+PLAYER_COOLDOWN = 0.15       # tulistamise vahe (s)
+WAVE_BASE_COUNT = 5          # vaenlasi 1. laines
+WAVE_COUNT_STEP = 3          # iga järgmine laine lisab nii palju vaenlasi
+SPAWN_INTERVAL = 0.6         # spawnimise vahe (s)
+ENEMY_BASE_SPEED = 70        # vaenlase baaskiirus (px/s) …
+ENEMY_SPEED_PER_WAVE = 4 * 0.9   # … pluss nii palju iga laine kohta
+ENEMY_TOUGH_WAVE = 6         # alates sellest lainest on vaenlasel 2 HP
+
+# Olemite hoidla: "objects" (Bullet/Enemy objektid listis) või "numpy" (massiivid, vt entity_store.py)
+ENTITY_BACKEND = "objects"
+
+# Vaenlaste liikumine: "flow" (voováli ümber majade, vt navigation.py) või "straight" (otse mängija poole)
+ENEMY_NAV = "flow"
+
+# Tornid (vt towers.py): parem hiireklõps paigutab torni, kui raha jätkub
+TOWER_COST = 40              # torni hind
+MONEY_PER_KILL = 5           # raha iga tapetud vaenlase eest
+
+# Joonistamise režiim: "flip" (kogu ekraan igas kaadris) või "dirty" (ainult muutunud alad, vt dirty_rects.py)
+RENDER_MODE = "flip"
+
+# Loogika sammusagedus (Hz) eraldi ekraani kaadrisagedusest; tabamused on swept, nii et
+# sagedust võib CPU säästmiseks langetada ilma kuule vaenlastest läbi laskmata
+SIM_HZ = 60
+MAX_STEPS_PER_FRAME = 5   # rohkem samme ühes kaadris ei tehta (aeglane masin ei jää spiraali)
+# True – loogika jookseb oma lõimes (sim_thread.py), põhilõim joonistab viimast hetktõmmist
+SIM_THREAD = False
+
+# Sisemine renderdamise skaala: maailm joonistatakse (RENDER_SCALE × akna suurus) pinnale ja
+# venitatakse kord kaadris akna suuruseks (nõrgematel masinatel nt 0.5 või 0.75)
+RENDER_SCALE = 1.0
+
+# Olemid joonistatakse ühe Surface.blits() kutsega (vt render_queue.py); False = igaüks eraldi
+BATCH_DRAW = True
+LAYER_TOWERS = -1   # joonistamise kihid: väiksem enne
+LAYER_BULLETS = 0
+LAYER_ENEMIES = 1
+LAYER_EFFECTS = 2
+
+# Mängu sisendite salvestamine (vt replay.py): failitee või None (ei salvestata)
+RECORD_PATH = None
+
+# Profiilimise ülekate (F3) kirjutab sessiooni lõpus kaadrite ajad siia faili (ainult kui F3 oli sees);
+# PIRO_PROFILE_CSV keskkonnamuutujaga saab teed muuta, vaikimisi ajutiste failide kaustas
+PROFILE_CSV = os.environ.get("PIRO_PROFILE_CSV") or os.path.join(tempfile.gettempdir(), "piro_profile_last.csv")
+
+# Kokkupõrgete ruudustiku lahtri suurus – suurima ringi läbimõõt (vt broadphase.py)
+BROADPHASE_CELL = 2 * max(ENEMY_R, PLAYER_R)
+
+# Vaenlaste pööramise vahemälu seaded (vt rotation_cache.py)
+ENEMY_ROT_STEP_DEG  = 5                  # nurga samm kraadides
+ENEMY_ROT_MAX_BYTES = 8 * 1024 * 1024    # mälulimiit pööratud spritedele
+ENEMY_ROT_NEAREST_STEP_DEG = 15          # nurga samm madalamal kvaliteedil ("nearest", vt quality.py)
+
+# Kaadri tööaja eelarve (ms) kvaliteedi regulaatorile (quality.py); 0 = regulaator väljas
+QUALITY_BUDGET_MS = quality.FRAME_BUDGET_MS
 
 
 # ---- ABIFUNKTSIOONID ----
@@ -40,66 +123,105 @@ def _unit_vec(ax, ay, bx, by):
     return dx / d, dy / d
 
 
-def _load_enemy_sprites(pattern, diameter):
-    """(ENEMY_PATTERN) Lae kõik vastase sprited mustriga pattern, skaleeri hitboxi mõõtu ja joonda keskmesse."""
-    sprites = []
-    for path in sorted(glob.glob(pattern)):
-        try:
-            img = pygame.image.load(path).convert_alpha()
-        except Exception:
-            continue
-        w, h = img.get_width(), img.get_height()
-        scale = diameter / max(w, h)
-        img = pygame.transform.smoothscale(img, (max(1, int(w*scale)), max(1, int(h*scale))))
-        surf = pygame.Surface((diameter, diameter), pygame.SRCALPHA)
-        surf.blit(img, img.get_rect(center=(diameter//2, diameter//2)))
-        sprites.append(surf)
-    return sprites
+def _lerp_xy(prev, pos, alpha):
+    """Joonistamise asukoht eelmise ja praeguse sammu vahel (täisarvudena)."""
+    if alpha is None:
+        return int(pos.x), int(pos.y)
+    return int(prev.x + (pos.x - prev.x) * alpha), int(prev.y + (pos.y - prev.y) * alpha)
+
+
+def _swept_hit(a, b, rr):
+    """
+    Kas ringid a ja b (mõlemal prev → pos) olid viimase sammu jooksul mingil hetkel
+    lähemal kui rr? Suhteline liikumine on lõik, otsime sellel nullpunktile lähima punkti.
+    """
+    ax, ay = a.prev.x - b.prev.x, a.prev.y - b.prev.y
+    mx, my = a.pos.x - b.pos.x - ax, a.pos.y - b.pos.y - ay
+    mm = mx * mx + my * my
+    if mm > 0:
+        t = min(1.0, max(0.0, -(ax * mx + ay * my) / mm))
+        ax += mx * t
+        ay += my * t
+    return ax * ax + ay * ay <= rr * rr
+
 
-# Lae 1x kõik variandid mällu (globaalne list) – (ENEMY_PATTERN)
-ENEMY_SPRITES = _load_enemy_sprites(ENEMY_PATTERN, diameter=ENEMY_R*2)
+# (ENEMY_PATTERN) Vaenlase spritede failid – loetakse ainult failinimed, pilte ei avata.
+# Simulation vajab ainult nende arvu (juhusliku skin'i valimiseks), pildid laetakse alles joonistamisel.
+ENEMY_SPRITE_PATHS = assets.paths(ENEMY_PATTERN)
 
+# Helid sündmuste kaupa (Simulation.step tagastab sündmuste nimed)
+EVENT_SOUNDS = {"shoot": "attack.wav", "hit": "hitbod1.wav", "perish": "perish.wav"}
+SOUND_VOLUME = 0.1
+SOUND_VOICES = {"shoot": 2, "hit": 3, "perish": 3}    # mitu häält igal helil korraga
+SOUND_PRIORITY = {"perish": 2, "shoot": 1, "hit": 0}  # üle eelarve visatakse madalam ära
+SOUND_BUDGET = 6     # hääli kõigi helide peale korraga (vähem kui SOUND_VOICES summa, vt audio.py)
 
-def _asset_path(name):
-    """Koosta täistee assets-kausta alla (nagu sinu varasem stiil)."""
-    return os.path.join(os.path.dirname(__file__), "assets", name)
+_enemy_sprites = {}     # läbimõõt -> spritede list
+_enemy_rotations = {}   # (läbimõõt, pööramise kvaliteet) -> RotationCache
 
-SHOOT_SOUND   = pygame.mixer.Sound(_asset_path("attack.wav"))
-HIT_SOUND     = pygame.mixer.Sound(_asset_path("hitbod1.wav"))
-PERISH_SOUND  = pygame.mixer.Sound(_asset_path("perish.wav"))
 
-SHOOT_SOUND.set_volume(0.1)
-HIT_SOUND.set_volume(0.1)
-PERISH_SOUND.set_volume(0.1)
+def _scaled_px(value, scale):
+    """Mõõt px renderdamise skaalas (vähemalt 1)."""
+    return max(1, int(round(value * scale)))
+
+
+def enemy_sprites(scale=1.0):
+    """
+    (ENEMY_PATTERN) Kõik vaenlase sprited hitboxi mõõdus (korda renderdamise skaala);
+    laetakse esimesel kutsel (None, kui fail on vigane).
+    """
+    diameter = _scaled_px(ENEMY_R * 2, scale)
+    sprites = _enemy_sprites.get(diameter)
+    if sprites is None:
+        sprites = _enemy_sprites[diameter] = [assets.sprite(p, diameter) for p in ENEMY_SPRITE_PATHS]
+    return sprites
+
+
+def enemy_rotations(scale=1.0, rotation="smooth"):
+    """
+    Vaenlaste pööratud variantide vahemälu (iga skaala ja kvaliteedi jaoks oma); stats() näitab
+    tabamusi/möödalaske. rotation – "smooth" (rotozoom) või "nearest" (rotate, suurem samm).
+    """
+    diameter = _scaled_px(ENEMY_R * 2, scale)
+    cache = _enemy_rotations.get((diameter, rotation))
+    if cache is None:
+        smooth = rotation != "nearest"
+        cache = _enemy_rotations[diameter, rotation] = RotationCache(
+            enemy_sprites(scale), step_deg=ENEMY_ROT_STEP_DEG if smooth else ENEMY_ROT_NEAREST_STEP_DEG,
+            max_bytes=ENEMY_ROT_MAX_BYTES, smooth=smooth)
+    return cache
+
 
 def _load_background(w, h):
-    """Laeb taustapildi assets-kaustast ja skaleerib akna (w,h) mõõtu."""
-    img = pygame.image.load(_asset_path(BG_FILENAME)).convert()
-    return pygame.transform.scale(img, (w, h))
+    """
+    Taustapilt suuruses (w,h) – mip-tasemetest, nii et uus akna suurus või renderdamise
+    skaala ei dekodeeri PNG-d uuesti (assets registrist, skaleeritakse ainult esimesel korral).
+    """
+    return assets.mip_scaled(BG_FILENAME, (w, h))
 
 
 def _load_sprite_or_none_from_path(path, diameter):
     """
-    Laeb PNG antud TÄISTEELT ja skaleerib proportsionaalselt nii, et max(mõõdud) = diameter.
-    Tagastab Surface, mis on läbipaistva taustaga ruut (diameter x diameter),
-    kuhu pilt on keskele paigutatud. Kui faili pole või tekib viga, tagastab None.
+    PNG antud TÄISTEELT läbipaistva ruuduna (diameter x diameter), pilt proportsionaalselt keskel.
+    Kui faili pole või tekib viga, tagastab None.
     """
-    if not os.path.exists(path):
-        return None
-    try:
-        img = pygame.image.load(path).convert_alpha()
-    except Exception:
-        return None
+    return assets.sprite(path, diameter)
+
 
-    w, h = img.get_width(), img.get_height()
-    scale = diameter / max(w, h)
-    new_w, new_h = max(1, int(w * scale)), max(1, int(h * scale))
-    img = pygame.transform.smoothscale(img, (new_w, new_h))
+def asset_keys(w, h, scale=None):
+    """Mängu pildid aknale w × h renderdamise skaalaga scale (preload ja atlas.py)."""
+    scale = scale or RENDER_SCALE
+    keys = [assets.key_mip(BG_FILENAME, (_scaled_px(w, scale), _scaled_px(h, scale))),
+            assets.key_sprite(PLAYER_LOOK, _scaled_px(PLAYER_R * 2, scale))]
+    keys += [assets.key_sprite(p, _scaled_px(ENEMY_R * 2, scale)) for p in ENEMY_SPRITE_PATHS]
+    if scale != 1.0:
+        keys.append(assets.key_mip(BG_FILENAME, (w, h)))   # lõpuekraan on alati akna mõõdus
+    return keys
 
-    surf = pygame.Surface((diameter, diameter), pygame.SRCALPHA)
-    rect = img.get_rect(center=(diameter // 2, diameter // 2))
-    surf.blit(img, rect)
-    return surf
+
+def preload_assets(w, h):
+    """Alusta mängu piltide laadimist taustalõimes (main kutsub seda menüü ajal)."""
+    return assets.preload(asset_keys(w, h))
 
 
 # ---- KLASSID ----
@@ -109,10 +231,14 @@ class Player:
     def __init__(self, x, y, sprite=None):
         self.pos = pygame.Vector2(x, y)  # asukoht ekraanil
         self.r = PLAYER_R                # ringi raadius joonistamiseks / tabamuseks
+        self.cooldown = PLAYER_COOLDOWN  # tulistamise vahe (sekundites)
+        self.sprite = sprite             # eel-skaleeritud Surface või None
+        self.reset()
+
+    def reset(self):
+        """Uue mängu algseis (elud ja cooldown)."""
         self.hp = 3                      # elud
-        self.cooldown = 0.15             # tulistamise vahe (sekundites)
         self._cd = 0.0                   # sisemine taimer cooldowni jaoks
-        self.sprite = sprite             # eel-skaleeritud Surface või None
 
     def update(self, dt):
         """Uuenda cooldowni taimerit."""
@@ -123,40 +249,63 @@ class Player:
         """Kas võib tulistada (cooldown läbi)?"""
         return self._cd <= 0
 
-    def shoot(self, tx, ty):
-        """Loo uus kuul, mis liigub mängija asukohast hiirekoha suunas."""
+    def shoot(self, tx, ty, make=None):
+        """
+        Loo uus kuul, mis liigub mängija asukohast hiirekoha suunas.
+        make(x, y, dx, dy) – kuulide tegija (nt Pool.acquire); vaikimisi uus Bullet.
+        """
         self._cd = self.cooldown
         dx, dy = _unit_vec(self.pos.x, self.pos.y, tx, ty)
-        return Bullet(self.pos.x, self.pos.y, dx, dy)
-
-    def draw(self, s):
-        """Joonista mängija (sprite või ring) ja väike sihikujoon hiire suunas."""
+        return (make or Bullet)(self.pos.x, self.pos.y, dx, dy)
+
+    def draw(self, s, aim, scale=1.0):
+        """
+        Joonista mängija (sprite või ring) ja väike sihikujoon punkti aim (hiire) suunas.
+        scale – renderdamise skaala (sprite peab siis juba olema selles mõõdus).
+        Tagastab joonistatud ala Rect'ina (dirty rect režiimi jaoks).
+        """
+        px, py = self.pos.x * scale, self.pos.y * scale
+        r = self.r * scale
         if self.sprite:
-            rect = self.sprite.get_rect(center=(int(self.pos.x), int(self.pos.y)))
-            s.blit(self.sprite, rect)
+            rect = self.sprite.get_rect(center=(int(px), int(py)))
+            rect = s.blit(self.sprite, rect)
         else:
-            pygame.draw.circle(s, GREEN, (int(self.pos.x), int(self.pos.y)), self.r)
+            rect = pygame.draw.circle(s, GREEN, (int(px), int(py)), _scaled_px(self.r, scale))
 
         # sihikujoon
-        mx, my = pygame.mouse.get_pos()
+        mx, my = aim
         dx, dy = _unit_vec(self.pos.x, self.pos.y, mx, my)
-        tip = (int(self.pos.x + dx * self.r), int(self.pos.y + dy * self.r))
-        pygame.draw.line(s, WHITE, self.pos, tip, 2)
+        tip = (int(px + dx * r), int(py + dy * r))
+        return rect.union(pygame.draw.line(s, WHITE, (px, py), tip, _scaled_px(2, scale)))
 
 
 class Bullet:
     """Kuul – liigub sirgjooneliselt antud suunas ja kaob pärast teatud aega või ekraanilt lahkudes."""
 
+    __slots__ = ("pos", "prev", "vel", "r", "alive", "life")
+
     def __init__(self, x, y, dx, dy):
-        self.pos = pygame.Vector2(x, y)         # asukoht
-        self.vel = pygame.Vector2(dx, dy) * 600 # kiirus (px/s)
-        self.r = 4
+        self.pos = pygame.Vector2()             # asukoht
+        self.prev = pygame.Vector2()            # asukoht eelmise sammu alguses (swept tabamus, interpoleerimine)
+        self.vel = pygame.Vector2()             # kiirus (px/s)
+        count_alloc("vector2", 3)
+        self.r = BULLET_R
+        self.reset(x, y, dx, dy)
+
+    def reset(self, x, y, dx, dy):
+        """Lähtesta kuul kohapeal (Pool taaskasutab surnud kuule, uusi Vector2'sid ei looda)."""
+        self.pos.update(x, y)
+        self.prev.update(x, y)
+        self.vel.update(dx * BULLET_SPEED, dy * BULLET_SPEED)
         self.alive = True
         self.life = 2.0                         # eluiga sekundites
 
     def update(self, dt, w, h):
         """Liiguta kuuli ja kontrolli eluiga/raame."""
-        self.pos += self.vel * dt
+        pos, vel = self.pos, self.vel
+        self.prev.update(pos)
+        pos.x += vel.x * dt                     # komponenthaaval – vel * dt teeks ajutise Vector2
+        pos.y += vel.y * dt
         self.life -= dt
         if self.life <= 0:
             self.alive = False
@@ -164,77 +313,107 @@ class Bullet:
         if self.pos.x < -50 or self.pos.x > w + 50 or self.pos.y < -50 or self.pos.y > h + 50:
             self.alive = False
 
-    def draw(self, s):
-        """Joonista kuul."""
-        pygame.draw.circle(s, YELLOW, (int(self.pos.x), int(self.pos.y)), self.r)
+    def draw(self, s, alpha=None):
+        """Joonista kuul (alpha – interpoleeri eelmise sammu asukohast); tagastab joonistatud ala."""
+        return pygame.draw.circle(s, YELLOW, _lerp_xy(self.prev, self.pos, alpha), self.r)
+
+
+_enemy_uids = count()   # Enemy.uid allikas
 
 
 class Enemy:
-    """Vaenlane – sünnib ekraani servast ja liigub otse mängija poole."""
+    """
+    Vaenlane – sünnib ekraani servast ja lendab voovälja järgi majadest mööda mängija poole
+    (ENEMY_NAV = "flow", vt navigation.py); voovälja puudumisel (ENEMY_NAV = "straight") otse.
+    """
+
+    __slots__ = ("pos", "prev", "speed", "r", "hp", "alive", "sprite_idx", "uid")
 
-    def __init__(self, wave, w, h, sprite=None):
-        # Vali juhuslik serv, kuhu spawnida
-        side = random.choice(("t", "b", "l", "r"))
+    def __init__(self, wave, w, h, sprite=None, rng=random):
+        self.pos = pygame.Vector2()
+        self.prev = pygame.Vector2()    # asukoht eelmise sammu alguses
+        count_alloc("vector2", 2)
+        self.r = ENEMY_R
+        self.reset(wave, w, h, sprite, rng)
+
+    def reset(self, wave, w, h, sprite=None, rng=random):
+        """Lähtesta vaenlane kohapeal uueks (Pool taaskasutab surnud vaenlasi)."""
+        # Vali juhuslik serv, kuhu spawnida (rng – Simulation'i oma generaator, et mäng oleks korratav)
+        side = rng.choice(("t", "b", "l", "r"))
         if side == "t":
-            self.pos = pygame.Vector2(random.randint(0, w), -20)
+            self.pos.update(rng.randint(0, w), -20)
         if side == "b":
-            self.pos = pygame.Vector2(random.randint(0, w), h + 20)
+            self.pos.update(rng.randint(0, w), h + 20)
         if side == "l":
-            self.pos = pygame.Vector2(-20, random.randint(0, h))
+            self.pos.update(-20, rng.randint(0, h))
         if side == "r":
-            self.pos = pygame.Vector2(w + 20, random.randint(0, h))
+            self.pos.update(w + 20, rng.randint(0, h))
+        self.prev.update(self.pos)
 
         # Kiirus kasvab laine numbriga veidi
-        base = 70 + wave * 4 * 0.9
-        self.speed = random.uniform(base * 0.9, base * 1.2)
+        base = ENEMY_BASE_SPEED + wave * ENEMY_SPEED_PER_WAVE
+        self.speed = rng.uniform(base * 0.9, base * 1.2)
 
-        self.r = ENEMY_R
-        self.hp = 1 + (1 if wave >= 6 else 0)  # alates 6. lainest veidi sitkem
+        self.hp = 1 + (1 if wave >= ENEMY_TOUGH_WAVE else 0)  # alates 6. lainest veidi sitkem
         self.alive = True
+        self.uid = next(_enemy_uids)   # püsiv id tornide sihtimiseks (kasvab loomise järjekorras)
 
         # (ENEMY_PATTERN) vali juhuslik baassprite varamust (võib olla tühi list → None)
-        self.sprite_base = random.choice(ENEMY_SPRITES) if ENEMY_SPRITES else None
+        self.sprite_idx = rng.randrange(len(ENEMY_SPRITE_PATHS)) if ENEMY_SPRITE_PATHS else None
 
-    def update(self, dt, target_pos):
-        """Liigu sihtmärgi (mängija) suunas."""
-        dx, dy = _unit_vec(self.pos.x, self.pos.y, target_pos.x, target_pos.y)
+    def update(self, dt, target_pos, flow=None):
+        """Liigu sihtmärgi (mängija) suunas; voováljaga mööda selle teed (majadest mööda)."""
+        if flow is None:
+            tx, ty = target_pos.x, target_pos.y
+        else:
+            tx, ty = flow.next_point(self.pos.x, self.pos.y)
+        dx, dy = _unit_vec(self.pos.x, self.pos.y, tx, ty)
+        self.prev.update(self.pos)
         self.pos.x += dx * self.speed * dt
         self.pos.y += dy * self.speed * dt
 
-    def hit(self, dmg=1):
-        """Võta pihta – kui HP ≤ 0, sure."""
+    def hit(self, dmg=1, fx=None):
+        """Võta pihta – kui HP ≤ 0, sure. fx – efektid (effects.Effects) või None."""
         self.hp -= dmg
         if self.hp <= 0:
             self.alive = False
+        if fx is not None:
+            fx.enemy_hit(self.pos.x, self.pos.y, not self.alive)
+
+    @property
+    def sprite_base(self):
+        """(ENEMY_PATTERN) Valitud baassprite (laetakse esimesel vajadusel) või None."""
+        return enemy_sprites()[self.sprite_idx] if self.sprite_idx is not None else None
 
-    def draw(self, s, target_pos):
-        """(ENEMY_PATTERN) Joonista vaenlane – sprite pööratud mängija suunas või ring."""
+    def draw(self, s, target_pos, alpha=None):
+        """(ENEMY_PATTERN) Joonista vaenlane – sprite pööratud mängija suunas või ring; tagastab joonistatud ala."""
+        center = _lerp_xy(self.prev, self.pos, alpha)
         if self.sprite_base:
             dx = target_pos.x - self.pos.x
             dy = target_pos.y - self.pos.y
             angle_deg = -math.degrees(math.atan2(dy, dx))  # ekraani Y kasvab alla
-            img = pygame.transform.rotozoom(self.sprite_base, angle_deg, 1.0)
-            rect = img.get_rect(center=(int(self.pos.x), int(self.pos.y)))
-            s.blit(img, rect)
-        else:
-            pygame.draw.circle(s, RED, (int(self.pos.x), int(self.pos.y)), self.r)
+            img = enemy_rotations().get(self.sprite_idx, angle_deg)  # vahemälust, mitte iga kaader rotozoom
+            return s.blit(img, img.get_rect(center=center))
+        return pygame.draw.circle(s, RED, center, self.r)
 
 
 class Waves:
     """Lainehaldur – hoiab mitut lainet, spawni tempot ja liikumist järgmisele lainele."""
 
-    def __init__(self):
+    def __init__(self, rng=random, make_enemy=None):
+        self.rng = rng                          # juhuarvude generaator vaenlaste jaoks
+        self.make_enemy = make_enemy or Enemy   # vaenlaste tegija (nt Pool.acquire)
         self.wave = 1
         self.max_wave = 10
         self.spawned = 0
         self.to_spawn = self._count(self.wave)  # mitu vaenlast selles laines kokku
-        self.interval = 0.6                     # spawnimise vahe (s)
+        self.interval = SPAWN_INTERVAL          # spawnimise vahe (s)
         self.acc = 0.0
         self.done_spawning = False              # kas kõik vaenlased on selles laines välja lastud
 
     def _count(self, w):
         """Tagasta antud laine vaenlaste kogus."""
-        return 5 + (w - 1) * 3
+        return WAVE_BASE_COUNT + (w - 1) * WAVE_COUNT_STEP
 
     def update(self, dt, enemies, W, H, enemy_sprite):
         """Lisa vaenlasi ajapõhiselt, kuni kogus täis."""
@@ -243,12 +422,20 @@ class Waves:
         self.acc += dt
         while self.acc >= self.interval and self.spawned < self.to_spawn:
             self.acc -= self.interval
-            # Enemy valib ise juhusliku skin'i ENEMY_SPRITES listist; 'enemy_sprite' arg jäetakse alles, kuid ei kasutata
-            enemies.append(Enemy(self.wave, W, H, sprite=enemy_sprite))
+            # Enemy valib ise juhusliku skin'i ENEMY_SPRITE_PATHS hulgast; 'enemy_sprite' arg jäetakse alles, kuid ei kasutata
+            enemies.append(self.make_enemy(self.wave, W, H, sprite=enemy_sprite, rng=self.rng))
             self.spawned += 1
         if self.spawned >= self.to_spawn:
             self.done_spawning = True
 
+    def set_wave(self, w):
+        """Alusta kohe lainest w (testimiseks ja mõõtmiseks)."""
+        self.wave = w
+        self.spawned = 0
+        self.to_spawn = self._count(w)
+        self.acc = 0.0
+        self.done_spawning = False
+
     def try_next(self, enemies):
         """Kui selles laines enam vaenlasi pole, liigu järgmisele; 10. järel võit."""
         if self.done_spawning and not enemies:
@@ -261,137 +448,858 @@ class Waves:
         return None
 
 
-# ---- PÕHIFUNKTSIOON, MIDA main.py KUTSUB ----
-def run_game(screen):
-    """Käivita mängusilmus. Tagasta 'QUIT' või 'BACK_TO_MENU'."""
-    clock = pygame.time.Clock()
-    W, H = screen.get_size()
+# ---- SIMULATSIOON (ilma ekraani, kella ja hiireta) ----
+# Ühe sammu sisend: sihtpunkt (hiir) ja kas selles sammus vajutati tulistamist
+# (place – kas paigutada torn sihtpunkti)
+Inputs = namedtuple("Inputs", "aim_x aim_y fire place", defaults=(False,))
+
+
+class Simulation:
+    """
+    Mänguloogika ilma joonistamiseta: step(dt, inputs) viib maailma dt sekundi võrra edasi.
+    Juhuarvud tulevad oma generaatorist (seed), nii et sama seed + samad sisendid → sama mäng.
+    Heli ja pilti siin pole – step tagastab sündmused ("shoot", "hit", "perish"), mille
+    run_game häälteks teeb.
+    """
+
+    TICK_DT = 1 / 60   # fikseeritud samm ilma ekraanita jooksutamiseks (run_headless)
+
+    def __init__(self, W, H, seed=None, backend=None, timer=None):
+        backend = backend or ENTITY_BACKEND
+        if backend not in ("objects", "numpy"):
+            raise ValueError(f"tundmatu backend: {backend!r}")
+        self.use_arrays = backend == "numpy" and HAVE_NUMPY
+
+        self.W, self.H = W, H
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+        # Surnud kuulid/vaenlased lähevad pool'i tagasi ja uued tehakse neist reset() abil;
+        # massiivide puhul antakse objekt kohe pärast andmete kopeerimist tagasi
+        self._bullet_pool = Pool(Bullet)
+        self._enemy_pool = Pool(Enemy)
+
+        self.player = Player(int(SPAWN_REL[0] * W), int(SPAWN_REL[1] * H))
+        # Voováli mängija asukoha poole – arvutatakse üks kord (ja jääb kettale), mängija ei liigu
+        self.flow = None
+        if ENEMY_NAV == "flow":
+            self.flow = navigation.flow_field(BG_FILENAME, W, H, (self.player.pos.x, self.player.pos.y))
+        if self.use_arrays:
+            self.bullets = BulletStore(release=self._bullet_pool.release)
+            self.enemies = EnemyStore(release=self._enemy_pool.release)
+        else:
+            self.bullets, self.enemies = [], []
+        self.waves = Waves(rng=self.rng, make_enemy=self._enemy_pool.acquire)
+        self.towers = towers.Towers()
+        self.score = 0
+        self.money = 0
+        self.state = "play"                 # "play" | "win" | "lose"
+        self.ticks = 0
+        self.time = 0.0
+        self.events = []                    # viimase sammu sündmused
+        self.timer = timer                  # profiling.PhaseTimer faaside mõõtmiseks või None
+        self.fx = None                      # effects.Effects – tabamuste/surmade osakesed (ainult pilt)
+
+        # Kokkupõrgete eelsõelumine: kuulid ja vaenlased pannakse igas sammus ruudustikku
+        self._bullet_grid = SpatialHash(BROADPHASE_CELL)
+        self._enemy_grid = SpatialHash(BROADPHASE_CELL)
+
+    def reset(self, seed=None):
+        """
+        Alusta uut mängu samade objektidega: pool'id, ruudustikud ja massiivid jäävad alles,
+        elus kuulid/vaenlased antakse pool'i tagasi. Tulemus on sama mis Simulation(W, H, seed).
+        """
+        self.seed = seed
+        self.rng.seed(seed)
+        self.player.reset()
+        if self.use_arrays:
+            self.bullets.clear()
+            self.enemies.clear()
+        else:
+            for b in self.bullets:
+                b.alive = False
+            for e in self.enemies:
+                e.alive = False
+            compact_alive(self.bullets, self._bullet_pool)
+            compact_alive(self.enemies, self._enemy_pool)
+        self.waves.set_wave(1)
+        self.towers.clear()
+        self.score = 0
+        self.money = 0
+        self.state = "play"
+        self.ticks = 0
+        self.time = 0.0
+        self.events.clear()
+
+    def step(self, dt, inputs):
+        """Üks loogikasamm. Tagastab selle sammu sündmuste listi (kehtib järgmise sammuni)."""
+        events = self.events
+        events.clear()
+        if self.state != "play":
+            return events
+        self.ticks += 1
+        self.time += dt
+        timer = self.timer
+        if timer:
+            timer.mark()
+
+        player = self.player
+        # Tulistamine sihtpunkti suunas (kui cooldown lubab)
+        if inputs.fire and player.can_shoot():
+            self.bullets.append(player.shoot(inputs.aim_x, inputs.aim_y, make=self._bullet_pool.acquire))
+            events.append("shoot")
+        if inputs.place:
+            self.place_tower(inputs.aim_x, inputs.aim_y)
+
+        player.update(dt)
+        self.waves.update(dt, self.enemies, self.W, self.H, None)
+        if timer:
+            timer.lap("spawn")
+
+        if self.towers.towers:
+            self._update_towers(dt)
+            if timer:
+                timer.lap("towers")
+
+        if self.use_arrays:
+            self._move_arrays(dt)
+            if timer:
+                timer.lap("move")
+            self._collide_arrays()
+        else:
+            self._move_objects(dt)
+            if timer:
+                timer.lap("move")
+            self._collide_objects(dt)
+        if timer:
+            timer.lap("collide")
+
+        # Kaotus kui HP otsas
+        if player.hp <= 0:
+            self.state = "lose"
+
+        # Kui laine läbi (kõik vaenlased hävitatud), liigu järgmisele; pärast 10. võit
+        if self.waves.try_next(self.enemies) == "win":
+            self.state = "win"
+        return events
+
+    def _move_arrays(self, dt):
+        """Massiivipõhine variant: liikumine ja prügikoristus korraga kõigile."""
+        self.bullets.update(dt, self.W, self.H)
+        self.bullets.compact()
+        enemies = self.enemies
+        if self.flow is not None and enemies.n:
+            tx, ty = self.flow.next_points(enemies.pos[:enemies.n])
+        else:
+            tx, ty = self.player.pos.x, self.player.pos.y
+        enemies.update(dt, tx, ty)
+
+    def _collide_arrays(self):
+        """Massiivipõhine variant: tabamused vektoriseeritult."""
+        player, bullets, enemies, events = self.player, self.bullets, self.enemies, self.events
+        fx = self.fx
+        hits, kills = collide_bullets(enemies, bullets, None if fx is None else fx.enemy_hit)
+        events.extend(["hit"] * hits)
+        events.extend(["perish"] * kills)
+        self.score += 10 * kills
+        self.money += MONEY_PER_KILL * kills
+        enemies.compact()
+        lost = collide_player(enemies, player.pos.x, player.pos.y, player.r)
+        if lost and fx is not None:
+            n = enemies.n
+            for x, y in enemies.pos[:n][~enemies.alive[:n]].tolist():
+                fx.player_hit(x, y)
+        player.hp -= lost
+        enemies.compact()
+
+    def _move_objects(self, dt):
+        """Objektipõhine variant (Bullet/Enemy listid): liikumine."""
+        # Kuulid edasi ja prügikoristus
+        for b in self.bullets:
+            b.update(dt, self.W, self.H)
+        compact_alive(self.bullets, self._bullet_pool)
+
+        # Vaenlased liiguvad mängija suunas (voováljaga majadest mööda)
+        target, flow = self.player.pos, self.flow
+        for e in self.enemies:
+            e.update(dt, target, flow)
+
+    def _collide_objects(self, dt):
+        """Objektipõhine variant: tabamused."""
+        player, bullets, enemies, events = self.player, self.bullets, self.enemies, self.events
+
+        # Kuulide ja vaenlaste tabamused – ruudustikust ainult lähedal olevad kuulid,
+        # kuulide järjekord on sama, mis listis, seega tulemus on sama mis kõik-kõigiga tsüklil.
+        # Tabamus on swept (kogu sammu liikumine), seepärast päringu raadiusele lisandub
+        # mõlema selle sammu teekond.
+        self._bullet_grid.rebuild([b.pos for b in bullets])
+        for e in enemies:
+            if not e.alive:
+                continue
+            reach = e.r + BULLET_R + (BULLET_SPEED + e.speed) * dt
+            for i in self._bullet_grid.query(e.pos.x, e.pos.y, reach):
+                b = bullets[i]
+                if not b.alive:
+                    continue
+                if _swept_hit(e, b, e.r + b.r):
+                    e.hit(1, self.fx)
+                    b.alive = False
+                    events.append("hit")
+                    if not e.alive:
+                        self.score += 10
+                        self.money += MONEY_PER_KILL
+                        events.append("perish")
+        compact_alive(enemies, self._enemy_pool)
+
+        # Vaenlane jõuab mängijani → mängija kaotab 1 HP, vaenlane hävineb
+        self._enemy_grid.rebuild([e.pos for e in enemies])
+        px, py = player.pos.x, player.pos.y
+        for i in self._enemy_grid.query(px, py, ENEMY_R + player.r):
+            e = enemies[i]
+            dx, dy = e.pos.x - px, e.pos.y - py
+            rr = e.r + player.r
+            if dx * dx + dy * dy <= rr * rr:
+                player.hp -= 1
+                e.alive = False
+                if self.fx is not None:
+                    self.fx.player_hit(e.pos.x, e.pos.y)
+        compact_alive(enemies, self._enemy_pool)
+
+    def place_tower(self, x, y):
+        """Paiguta torn punkti (x, y), kui raha jätkub ja koht sobib; tagastab True/False."""
+        if self.money < TOWER_COST:
+            return False
+        if not self.towers.can_place(x, y, self.W, self.H, blocked=[(self.player.pos.x, self.player.pos.y)]):
+            return False
+        self.money -= TOWER_COST
+        self.towers.place(x, y)
+        return True
+
+    def _update_towers(self, dt):
+        """Tornide sihtimine ja laskmine (vaenlaste vaade sõltub hoidlast, loogika on towers.py-s)."""
+        enemies = self.enemies
+        if self.use_arrays:
+            # listideks korraga (C-s) – üksikute numpy elementide lugemine oleks aeglasem
+            n = enemies.n
+            uids, pos, prev = enemies.uid[:n].tolist(), enemies.pos[:n].tolist(), enemies.prev[:n].tolist()
+        else:
+            uids = [e.uid for e in enemies]
+            pos = [e.pos for e in enemies]
+            prev = [e.prev for e in enemies]
+        self.towers.update(dt, uids, pos, prev, self._tower_fire, BULLET_SPEED)
+
+    def _tower_fire(self, tower, tx, ty):
+        dx, dy = _unit_vec(tower.x, tower.y, tx, ty)
+        self.bullets.append(self._bullet_pool.acquire(tower.x, tower.y, dx, dy))
+        self.events.append("shoot")
+
+    def pool_stats(self):
+        """Kuulide ja vaenlaste pool'ide statistika (mitu loodud / taaskasutatud)."""
+        return {"bullets": self._bullet_pool.stats(), "enemies": self._enemy_pool.stats()}
+
+    def enemy_positions(self):
+        """Vaenlaste asukohad [(x, y), ...] – mõlema hoidla jaoks ühtmoodi."""
+        if self.use_arrays:
+            return self.enemies.positions()
+        return [(e.pos.x, e.pos.y) for e in self.enemies]
+
+    # ---- JOONISTAMISE VAADE ---- (sama liides on sim_thread.SnapshotView'l)
+    def bullet_points(self, alpha=None):
+        """Kuulide (x, y) joonistamiseks (alpha – vt _draw_world)."""
+        if self.use_arrays:
+            return self.bullets.positions(alpha)
+        return [_lerp_xy(b.prev, b.pos, alpha) for b in self.bullets]
+
+    def enemy_items(self, alpha=None):
+        """((x, y), nurk kraadides vastupäeva, sprite indeks või -1) iga vaenlase kohta."""
+        target = self.player.pos
+        if self.use_arrays:
+            store = self.enemies
+            return zip(store.positions(alpha), store.facing_angles(target.x, target.y),
+                       store.sprite[:store.n].tolist())
+        return ((_lerp_xy(e.prev, e.pos, alpha),
+                 -math.degrees(math.atan2(target.y - e.pos.y, target.x - e.pos.x)),
+                 -1 if e.sprite_idx is None else e.sprite_idx) for e in self.enemies)
+
+    def tower_points(self):
+        return [(t.x, t.y) for t in self.towers.towers]
+
+    def hud_values(self):
+        """(laine, HP, skoor, vaenlasi, raha, torne) HUD-i jaoks."""
+        return self.waves.wave, self.player.hp, self.score, len(self.enemies), self.money, len(self.towers)
+
+
+def aim_nearest(sim):
+    """Skriptitud sihtimine: tulista alati lähima vaenlase suunas (testimiseks ja mõõtmiseks)."""
+    px, py = sim.player.pos.x, sim.player.pos.y
+    best, best_d = None, None
+    for x, y in sim.enemy_positions():
+        d = (x - px) * (x - px) + (y - py) * (y - py)
+        if best_d is None or d < best_d:
+            best, best_d = (x, y), d
+    if best is None:
+        return Inputs(px, py, False)
+    return Inputs(best[0], best[1], True)
+
+
+def run_headless(sim, ticks, policy=aim_nearest, dt=Simulation.TICK_DT):
+    """Jooksuta simulatsiooni fikseeritud sammuga kuni ticks sammu või mängu lõpuni."""
+    for _ in range(ticks):
+        if sim.state != "play":
+            break
+        sim.step(dt, policy(sim))
+    return sim
+
+
+# ---- JOONISTAMINE ----
+_queue = RenderQueue()   # olemite joonistamise järjekord, taaskasutatakse igas kaadris
+
+
+def _draw_bullet_store(s, store, rects, alpha=None):
+    """Joonista massiivipõhised kuulid (sama välimus mis Bullet.draw); alad lisatakse rects'i."""
+    add = rects.append
+    for x, y in store.positions(alpha):
+        add(pygame.draw.circle(s, YELLOW, (int(x), int(y)), BULLET_R))
+
+
+def _draw_enemy_store(s, store, target_pos, rects, alpha=None):
+    """Joonista massiivipõhised vaenlased (sama välimus mis Enemy.draw); alad lisatakse rects'i."""
+    angles = store.facing_angles(target_pos.x, target_pos.y)
+    sprites = store.sprite[:store.n].tolist()
+    base, rotations = enemy_sprites(), enemy_rotations()
+    add = rects.append
+    for (x, y), angle_deg, idx in zip(store.positions(alpha), angles, sprites):
+        center = (int(x), int(y))
+        if idx >= 0 and base[idx]:
+            img = rotations.get(idx, angle_deg)
+            add(s.blit(img, img.get_rect(center=center)))
+        else:
+            add(pygame.draw.circle(s, RED, center, ENEMY_R))
+
+
+def _queue_towers(queue, sim, scale=1.0):
+    """Pane tornid (eelrenderdatud ring) järjekorda; scale – renderdamise skaala."""
+    off = _scaled_px(towers.TOWER_R, scale)
+    img = circle_sprite(BLUE, off)
+    queue.extend(LAYER_TOWERS, [(img, (int(x * scale) - off, int(y * scale) - off)) for x, y in sim.tower_points()])
+
+
+def _queue_bullets(queue, sim, alpha=None, scale=1.0):
+    """Pane kuulid (eelrenderdatud ring) järjekorda; scale – renderdamise skaala."""
+    off = _scaled_px(BULLET_R, scale)
+    img = circle_sprite(YELLOW, off)
+    points = sim.bullet_points(alpha)
+    if scale == 1.0:
+        queue.extend(LAYER_BULLETS, [(img, (int(x) - off, int(y) - off)) for x, y in points])
+    else:
+        queue.extend(LAYER_BULLETS, [(img, (int(x * scale) - off, int(y * scale) - off)) for x, y in points])
+
+
+def _queue_enemies(queue, sim, alpha=None, scale=1.0, rotation="smooth"):
+    """
+    Pane vaenlased (pööratud sprite vahemälust või ring) järjekorda; scale – renderdamise skaala,
+    rotation – "smooth", "nearest" või "none" (sprite pööramata).
+    """
+    base = enemy_sprites(scale)
+    get = None if rotation == "none" else enemy_rotations(scale, rotation).get
+    circle = circle_sprite(RED, _scaled_px(ENEMY_R, scale))
+    pairs = []
+    add = pairs.append
+    for (x, y), angle_deg, idx in sim.enemy_items(alpha):
+        if idx < 0 or not base[idx]:
+            img = circle
+        else:
+            img = get(idx, angle_deg) if get else base[idx]
+        w, h = img.get_size()
+        add((img, (int(x * scale) - w // 2, int(y * scale) - h // 2)))   # sama mis get_rect(center=...)
+    queue.extend(LAYER_ENEMIES, pairs)
+
+
+def _draw_world(s, sim, aim, alpha=None, batched=None, want_rects=True, scale=1.0, rotation="smooth"):
+    """
+    Joonista kuulid, vaenlased ja mängija; tagastab joonistatud alad. sim – Simulation või
+    sim_thread.SnapshotView (joonistamise vaade: bullet_points, enemy_items, tower_points, player, fx).
+    alpha – mitu osa järgmisest sammust on möödas (0..1): olemid joonistatakse eelmise ja
+    praeguse sammu vahele. None = täpselt praeguses seisus. Osakesed (sim.fx) joonistatakse
+    olemite peale.
+    batched – kõik olemid ühe blits() kutsega (vaikimisi BATCH_DRAW); want_rects=False korral
+    ei küsita blits'ilt alasid (flip režiimis pole neid vaja).
+    scale – renderdamise skaala (maailma koordinaadid korrutatakse sellega); skaalaga
+    joonistab alati järjekord. rotation – vaenlaste pööramise kvaliteet (vt _queue_enemies;
+    ainult järjekorraga joonistamisel).
+    """
+    player = sim.player
+    if scale != 1.0 or (batched if batched is not None else BATCH_DRAW):
+        if len(sim.towers):
+            _queue_towers(_queue, sim, scale)
+        _queue_bullets(_queue, sim, alpha, scale)
+        _queue_enemies(_queue, sim, alpha, scale, rotation)
+        if sim.fx is not None:
+            _queue.extend(LAYER_EFFECTS, sim.fx.pairs(scale))
+        rects = _queue.flush(s, doreturn=want_rects) or []
+        rects.append(player.draw(s, aim, scale))
+        return rects
+
+    rects = [pygame.draw.circle(s, BLUE, (int(x), int(y)), towers.TOWER_R) for x, y in sim.tower_points()]
+    if sim.use_arrays:
+        _draw_bullet_store(s, sim.bullets, rects, alpha)
+        _draw_enemy_store(s, sim.enemies, player.pos, rects, alpha)
+    else:
+        for b in sim.bullets:
+            rects.append(b.draw(s, alpha))
+        for e in sim.enemies:
+            rects.append(e.draw(s, player.pos, alpha))   # (ENEMY_PATTERN) pööramine mängija suunas
+    if sim.fx is not None:
+        rects.extend(sim.fx.draw(s, doreturn=True))
+    rects.append(player.draw(s, aim))
+    return rects
+
+
+def _hud_lines(sim):
+    wave, hp, score, enemies, money, tower_count = sim.hud_values()
+    return [
+        f"Laine: {wave}/10",
+        f"HP: {hp}",
+        f"Skoor: {score}",
+        f"Vaenlasi: {enemies}",
+        f"Raha: {money} (torn {TOWER_COST}, parem klõps)  Torne: {tower_count}",
+    ]
+
+
+def _draw_hud(s, font, sim, lines=None):
+    """
+    HUD (ülakõrvale): laine, HP, skoor, vaenlaste arv ja raha/tornid; tagastab joonistatud alad.
+    lines – varem koostatud read (_hud_lines), kui neid ei uuendata igas kaadris.
+    """
+    rects = []
+    for i, line in enumerate(lines or _hud_lines(sim)):
+        t = text_cache.render(font, line, WHITE)  # muutub harva – tavaliselt ainult blit
+        rects.append(s.blit(t, (10, 10 + i * 24)))
+    return rects
 
-    # Lae ja skaleeri taust; arvuta mängija algpositsioon ekraani mõõtudes
-    bg_image = _load_background(W, H)
 
-    # Lae ja skaleeri sprited (kui puuduvad, tagastab None → joonistame ringid)
-    player_sprite = _load_sprite_or_none_from_path(PLAYER_LOOK, diameter=PLAYER_R * 2)
-    enemy_sprite  = _load_sprite_or_none_from_path(ENEMY_PATTERN,  diameter=ENEMY_R  * 2)  # (jääb alles; Enemy ei kasuta)
+# ---- JOONISTAMINE SDL2 RENDERER'IGA (sdl2_video.VideoOutput) ----
+def _draw_centered(tex, x, y, angle=0.0):
+    w, h = tex.width, tex.height
+    tex.draw(dstrect=(int(x) - w // 2, int(y) - h // 2, w, h), angle=angle)
 
-    spawn_x = int(SPAWN_REL[0] * W)
-    spawn_y = int(SPAWN_REL[1] * H)
 
-    # Mängu olek
-    player = Player(spawn_x, spawn_y, sprite=player_sprite)
-    bullets, enemies = [], []
-    waves = Waves()
-    score = 0
+def _draw_world_video(out, sim, aim, alpha=None, rotation="smooth"):
+    """
+    Sama pilt mis _draw_world, aga Renderer'iga: iga Surface (täpid, spritid) on tekstuur,
+    mis laetakse üks kord, ja vaenlasi pöörab Renderer ise (RotationCache'i pole vaja).
+    Joonistatakse maailma koordinaatides (renderdamise skaalat siin pole); rotation="none" –
+    vaenlased pööramata.
+    """
+    tex = out.texture
+    if len(sim.towers):
+        img = tex(circle_sprite(BLUE, towers.TOWER_R))
+        for x, y in sim.tower_points():
+            _draw_centered(img, x, y)
+    img = tex(circle_sprite(YELLOW, BULLET_R))
+    for x, y in sim.bullet_points(alpha):
+        _draw_centered(img, x, y)
+
+    circle = tex(circle_sprite(RED, ENEMY_R))
+    sprites = [tex(img) if img else None for img in enemy_sprites()]
+    for (x, y), angle_deg, idx in sim.enemy_items(alpha):
+        img = sprites[idx] if idx >= 0 else None
+        if img is None:
+            _draw_centered(circle, x, y)
+        else:
+            _draw_centered(img, x, y, 0.0 if rotation == "none" else -angle_deg)   # SDL pöörab päripäeva
 
-    state = "play"                       # "play" | "win" | "lose"
-    font = pygame.font.SysFont("consolas", 22)
-    font_big = pygame.font.SysFont("consolas", 28, bold=True)
+    if sim.fx is not None:
+        for surf, (x, y) in sim.fx.pairs():
+            img = tex(surf)
+            img.draw(dstrect=(x, y, img.width, img.height))
 
-    while True:
-        dt = clock.tick(60) / 1000.0     # kaadri aeg sekundites
+    player = sim.player
+    px, py = player.pos.x, player.pos.y
+    _draw_centered(tex(player.sprite or circle_sprite(GREEN, player.r)), px, py)
+    dx, dy = _unit_vec(px, py, aim[0], aim[1])
+    tip = (px + dx * player.r, py + dy * player.r)
+    renderer = out.renderer
+    renderer.draw_color = WHITE + (255,)
+    renderer.draw_line((px, py), tip)            # 2 px sihikujoon nagu Player.draw
+    renderer.draw_line((px + 1, py), (tip[0] + 1, tip[1]))
+
+
+def _draw_hud_video(out, font, sim, lines=None):
+    for i, line in enumerate(lines or _hud_lines(sim)):
+        img = out.texture(text_cache.render(font, line, WHITE))   # uus tekstuur ainult muutunud real
+        img.draw(dstrect=(10, 10 + i * 24, img.width, img.height))
+
+
+# ---- MÄNGU STSEEN JA PÕHIFUNKTSIOON, MIDA main.py KUTSUB ----
+class GameScene(Scene):
+    """
+    Mängu ekraan. Taust, helid, fondid, ülekate ja Simulation luuakse esimesel külastusel;
+    iga uus mäng teeb ainult sim.reset(). Loogika on Simulation klassis; siin loetakse
+    sisendid, mängitakse helid ja joonistatakse.
+    backend – "objects" või "numpy" (vaikimisi ENTITY_BACKEND); seed – juhuarvude seeme (None = juhuslik);
+    render_mode – "flip" või "dirty" (vaikimisi RENDER_MODE); sim_hz – loogika sammusagedus (vaikimisi SIM_HZ);
+    record – kuhu sisendid salvestada (vaikimisi RECORD_PATH, None = ei salvestata);
+    render_scale – sisemine renderdamise skaala (vaikimisi RENDER_SCALE);
+    video – sdl2_video.VideoOutput: mäng joonistatakse Renderer'iga (screen on siis video.screen,
+    render_mode on "flip" ja skaala 1);
+    quality_budget – kaadri tööaja eelarve ms (vaikimisi QUALITY_BUDGET_MS, 0 = kvaliteet ei muutu);
+    threaded – loogika töölõimes (vaikimisi SIM_THREAD); joonistatakse sim_thread.SnapshotView'st.
+    """
+
+    def __init__(self, screen, backend=None, seed=None, render_mode=None, sim_hz=None, record=None,
+                 render_scale=None, video=None, quality_budget=None, threaded=None):
+        super().__init__(screen)
+        self.threaded = SIM_THREAD if threaded is None else threaded
+        self.video = video
+        if video:
+            render_mode, render_scale = "flip", 1.0
+        self.render_mode = render_mode or RENDER_MODE
+        if self.render_mode not in ("flip", "dirty"):
+            raise ValueError(f"tundmatu render_mode: {self.render_mode!r}")
+        self.base_render_mode = self.render_mode   # kvaliteedi regulaator võib ajutiselt "dirty" peale minna
+        self.quality_budget = QUALITY_BUDGET_MS if quality_budget is None else quality_budget
+        self.backend = backend
+        self.seed = seed
+        # loogika samm sekundites: kaadri aeg kogutakse akumulaatorisse ja sim.step
+        # kutsutakse alati sama sammuga (0…MAX_STEPS_PER_FRAME korda kaadris)
+        self.tick = 1.0 / (sim_hz or SIM_HZ)
+        self.record = record or RECORD_PATH
+        self.recorder = None
+        self.scale = render_scale or RENDER_SCALE
+
+    def prepare(self):
+        # maailma (Simulation'i) mõõdud on akna mõõdud esimesel külastusel ega muutu enam
+        W, H = self.world = self.screen.get_size()
+
+        # Mängu olek; mängija sprite (kui puudub, tagastab None → joonistame ringi)
+        self.sim = Simulation(W, H, seed=self.seed, backend=self.backend)
+        self.sim.player.sprite = _load_sprite_or_none_from_path(PLAYER_LOOK, diameter=_scaled_px(PLAYER_R * 2, self.scale))
+        # helid on MAX_GAIN korda valjemad, VoiceManager vähendab kanali helitugevusega tagasi
+        sounds = {name: assets.sound(f, SOUND_VOLUME * audio.MAX_GAIN) for name, f in EVENT_SOUNDS.items()}
+        self.mixer = audio.VoiceManager(sounds, SOUND_VOICES, SOUND_PRIORITY, SOUND_BUDGET)
+
+        self.font = text_cache.sys_font("consolas", 22)
+        self.font_big = text_cache.sys_font("consolas", 28, bold=True)
+
+        # tabamuste ja surmade osakesed (Simulation kutsub emittereid, liigutamine ja pilt on siin)
+        self.effects = self.sim.fx = effects.Effects()
+
+        # töölõime režiimis loeb joonistamine Simulation'i asemel viimast hetktõmmist (shown)
+        self.worker = self.view = None
+        if self.threaded:
+            self.worker = sim_thread.SimThread(self.sim, self.tick)
+            self.view = sim_thread.SnapshotView(self.sim.player, self.effects)
+        self.shown = self.sim
+
+        # F3 – profiilimise ülekate; kui see oli sees, kirjutatakse andmed mängust väljudes PROFILE_CSV faili
+        self.overlay = DebugOverlay()
+        # kvaliteeditase kaadri tööaja järgi (vt quality.py); tase jääb mängude vahel alles
+        self.governor = quality.QualityGovernor(self.quality_budget)
+        self._setup_view()
+        self._apply_quality()
+
+    def _setup_view(self):
+        """
+        Taust, sisemine lõuend ja renderer praeguse akna suuruse järgi. Kui skaala on 1 ja aken
+        on maailma mõõdus, joonistatakse otse ekraanile; muidu (RENDER_SCALE × maailm) lõuendile,
+        mis venitatakse kord kaadris akna suuruseks. Taust tuleb mip-tasemetest (PNG-d ei loeta uuesti).
+        """
+        window = self.screen.get_size()
+        size = (_scaled_px(self.world[0], self.scale), _scaled_px(self.world[1], self.scale))
+        if size == window:
+            self.canvas = None
+        else:
+            self.canvas = pygame.Surface(size).convert()
+        self.bg_image = _load_background(*size)
+        # renderer – DirtyRenderer või None (siis kogu taust + flip igas kaadris);
+        # lõuendiga venitatakse niikuinii kogu ekraan, nii et seal dirty rect'e ei kasutata
+        if self.render_mode == "dirty" and self.canvas is None:
+            self.renderer = DirtyRenderer(self.screen, self.bg_image)
+        else:
+            self.renderer = None
+
+    def _to_world(self, pos):
+        """Akna koordinaadid (hiir) maailma koordinaatideks Player.shoot'i jaoks."""
+        (ww, wh), (w, h) = self.screen.get_size(), self.world
+        if (ww, wh) == (w, h):
+            return pos
+        return (pos[0] * w / ww, pos[1] * h / wh)
+
+    def enter(self):
+        seed = self.seed
+        if self.record and seed is None:
+            seed = random.randrange(2 ** 31)   # taasesitus vajab teadaolevat seemet
+        self.sim.reset(seed)
+        self.effects.clear()
+        if self.record:
+            self.recorder = replay.Recorder(self.record, self.sim, 1.0 / self.tick)
+        if self.worker:
+            self.worker.on_step = self.recorder.tick if self.recorder else None
+            self.worker.start()
+            self.view.load(self.worker.latest)
+            self.shown = self.view
+        self.acc = 0.0        # veel simuleerimata aeg
+        self.fire = False     # klõps jääb ootele, kuni mõni samm selle ära kasutab
+        self.place = False    # parem klõps – torn (samuti ootel järgmise sammuni)
+        self.aim = (0, 0)
+        self.dt = 0.0
+        self.tower_queries = 0
+        self._queries = 0
+        self.frames = 0       # joonistatud kaadreid (HUD ja helide sagedus kvaliteeditasemel)
+        self.hud = None       # HUD read, uuendatakse iga hud_every kaadri järel
+        self._t0 = time.perf_counter()
+        if self.renderer:
+            self.renderer.invalidate()
+
+    def exit(self):
+        if self.worker:
+            self.worker.stop()   # enne salvestaja sulgemist – on_step kirjutab sinna
+        if self.recorder:
+            self.recorder.close()
+            self.recorder = None
+        self.mixer.stop()
+        self.overlay.export_csv(PROFILE_CSV)
+
+    def update(self, dt, events):
+        """Sisendid ja loogika; tagastab 'QUIT', 'BACK_TO_MENU', 'END_SCREEN' või None."""
+        self._t0 = time.perf_counter()   # kaadri töö algus (Clock.tick'i ootamine on juba möödas)
+        sim, overlay, renderer, shown = self.sim, self.overlay, self.renderer, self.shown
+        self.dt = dt                     # kaadri aeg sekundites
+        timer = overlay.active_timer()   # None, kui ülekate on väljas
+        if self.worker:
+            shown.load(self.worker.latest)   # töölõimes ei mõõdeta (taimer pole lõimeülene)
+        else:
+            sim.timer = timer
+        if timer:
+            timer.new_frame()
 
         # SISENDID
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT:
                 return "QUIT"
+            if overlay.handle_event(event):
+                if renderer:
+                    renderer.invalidate()  # ülekatte paneel peab ekraanilt kaduma
+                continue
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED) and renderer:
+                renderer.invalidate()
+            if event.type in (pygame.VIDEORESIZE, pygame.WINDOWSIZECHANGED) and not self.video:
+                self.screen = pygame.display.get_surface()
+                self._setup_view()
+                renderer = self.renderer
             if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                 return "BACK_TO_MENU"
-            if state == "play":
-                # Vasak hiireklõps – tulistamine hiire suunas (kui cooldown lubab)
-                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and player.can_shoot():
-                    mx, my = pygame.mouse.get_pos()
-                    bullets.append(player.shoot(mx, my))
-                    SHOOT_SOUND.play()
+            if shown.state == "play":
+                # Vasak hiireklõps – tulistamine hiire suunas (Simulation kontrollib cooldowni)
+                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    self.fire = True
+                # Parem klõps – torn hiire kohale (kui raha jätkub)
+                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 3:
+                    self.place = True
             else:
                 # Võidu/kaotuse ekraanilt ükskõik milline klahv → menüüsse
                 if event.type == pygame.KEYDOWN:
                     return "BACK_TO_MENU"
 
-        # Kui pole mänguseisund "play", joonista lõpp-ekraan ja oota klahvi
-        if state != "play":
-            # Kasutame sama mängu taustapilti ka lõppseisus (eraldiseisvat lõputausta ei kasutata)
-            screen.blit(bg_image, (0, 0))
-
-            if state == "win":
-                # ülemine lint + sõnum
-                banner_h = 60
-                pygame.draw.rect(screen, DARK_GREEN, (0, 0, W, banner_h))
-                msg = "Palju õnne! Sa jäid ellu ja saad minna edasi Shooters'isse!"
-                text = font_big.render(msg, True, WHITE)
-                screen.blit(text, (W // 2 - text.get_width() // 2, (banner_h - text.get_height()) // 2))
-            else:
-                # kaotuse lühitekst keskel
-                t1 = font_big.render("KAOTUS! HP sai otsa.", True, WHITE)
-                screen.blit(t1, (W // 2 - t1.get_width() // 2, H // 2 - 20))
+        # Kui pole mänguseisund "play", joonistab draw() lõpp-ekraani ja ootame klahvi
+        if shown.state != "play":
+            return None
+
+        if timer:
+            timer.lap("events")
+
+        # ---- LOOGIKA ---- (spawn/move/collide faasid mõõdab Simulation ise)
+        # täisarvudeks üks kord: sama sihik läheb sim.step'ile ja salvestajale (replay hoiab int'e)
+        ax, ay = self._to_world(pygame.mouse.get_pos())
+        aim = self.aim = (int(ax), int(ay))
+        if self.worker:
+            return self._update_threaded(dt, timer)
+        tick, mixer = self.tick, self.mixer
+        queries = sim.towers.queries
+        self.acc += dt
+        steps = 0
+        while self.acc >= tick and sim.state == "play":
+            if steps == MAX_STEPS_PER_FRAME:
+                self.acc = 0.0           # masin ei jõua järele – ülejäänud aeg visatakse ära
+                break
+            inputs = Inputs(aim[0], aim[1], self.fire, self.place)
+            for name in sim.step(tick, inputs):
+                mixer.request(name)
+            if self.recorder:
+                self.recorder.tick(inputs)
+            self.fire = self.place = False
+            self.acc -= tick
+            steps += 1
+        if self.frames % self.governor.current.sound_every == 0:
+            mixer.flush()                # madalamal tasemel ühendatakse mitme kaadri helid
+        self.tower_queries = sim.towers.queries - queries   # sihtmärgi otsinguid selles kaadris
+        self.effects.update(dt)          # osakesed liiguvad kaadri, mitte loogikasammu ajaga
+        if timer:
+            timer.lap("effects")
+        if sim.state == "win":
+            return "END_SCREEN"
+        return None
 
-            # all rida juhiseks
-            t2 = font.render("Vajuta suvalist klahvi – tagasi menüüsse", True, WHITE)
-            screen.blit(t2, (W // 2 - t2.get_width() // 2, H - 40))
-            pygame.display.flip()
-            continue
+    def _update_threaded(self, dt, timer):
+        """Loogika töölõimes: saada sisend, võta vastu helid ja efektid viimastest sammudest."""
+        worker, view, mixer = self.worker, self.view, self.mixer
+        worker.send(Inputs(self.aim[0], self.aim[1], self.fire, self.place))
+        self.fire = self.place = False
+        sounds = worker.sounds
+        while sounds:
+            mixer.request(sounds.popleft())
+        if self.frames % self.governor.current.sound_every == 0:
+            mixer.flush()
+        worker.fx.drain(self.effects)
+        self.effects.update(dt)
+        if timer:
+            timer.lap("effects")
+        self.tower_queries = view.snap.queries - self._queries   # otsinguid alates eelmisest kaadrist
+        self._queries = view.snap.queries
+        if view.state == "win":
+            return "END_SCREEN"
+        return None
 
-        # ---- LOOGIKA ----
-        player.update(dt)
-        waves.update(dt, enemies, W, H, enemy_sprite)
+    def _alpha(self):
+        """Mitu osa järgmisest sammust on möödas – olemid joonistatakse kahe sammu vahele."""
+        if self.worker:
+            return self.view.alpha(time.perf_counter(), self.tick)
+        return self.acc / self.tick
 
-        # Kuulid edasi ja prügikoristus
-        for b in bullets:
-            b.update(dt, W, H)
-        bullets = [b for b in bullets if b.alive]
+    def draw(self):
+        if self.shown.state != "play":
+            self._draw_game_over()
+            return
+        if self.video:
+            self._draw_video()
+            return
 
-        # Vaenlased liiguvad mängija suunas
-        for e in enemies:
-            e.update(dt, player.pos)
+        screen, sim, overlay, renderer = self.screen, self.shown, self.overlay, self.renderer
+        canvas = self.canvas
+        target = canvas or screen        # maailm joonistatakse lõuendile, kui see on
+        timer = overlay.active_timer()
 
-        # Kuulide ja vaenlaste tabamused
-        for e in enemies:
-            if not e.alive:
-                continue
-            for b in bullets:
-                if not b.alive:
-                    continue
-                if (e.pos - b.pos).length() <= e.r + b.r:
-                    e.hit(1)
-                    b.alive = False
-                    HIT_SOUND.play()
-                    if not e.alive:
-                        score += 10
-                        PERISH_SOUND.play()
-        enemies = [e for e in enemies if e.alive]
-
-        # Vaenlane jõuab mängijani → mängija kaotab 1 HP, vaenlane hävineb
-        for e in enemies:
-            if (e.pos - player.pos).length() <= e.r + player.r:
-                player.hp -= 1
-                e.alive = False
-        enemies = [e for e in enemies if e.alive]
+        # ---- JOONISTAMINE ----
+        if timer:
+            timer.mark()
+        if renderer:
+            renderer.begin()             # taust ainult eelmise kaadri joonistatud alade alla
+        else:
+            target.blit(self.bg_image, (0, 0))    # taustakaart
+        if timer:
+            timer.lap("background")
+        # eelmise ja praeguse sammu vahel; alasid on vaja ainult dirty rect režiimis
+        rects = _draw_world(target, sim, self.aim, self._alpha(), batched=True if self.worker else None,
+                            want_rects=bool(renderer), scale=self.scale, rotation=self.governor.current.rotation)
+        if canvas:
+            pygame.transform.scale(canvas, screen.get_size(), screen)   # üks venitus kaadris
+        if timer:
+            timer.lap("entities")
+        rects += _draw_hud(screen, self.font, sim, self._hud_lines())
+        if timer:
+            timer.lap("hud")
+        panel = overlay.draw(screen)
+        if panel:
+            rects.append(panel)
+
+        if timer:
+            timer.mark()
+        if renderer:
+            renderer.end(rects)          # display.update(rects) või suure muutuse korral flip()
+        else:
+            present()
+        if timer:
+            timer.lap("flip")
+        self._end_frame()
+
+    def _draw_video(self):
+        """Kaader Renderer'iga (vt _draw_world_video); faasid samad mis draw()'s."""
+        out, sim, overlay = self.video, self.shown, self.overlay
+        timer = overlay.active_timer()
+        if timer:
+            timer.mark()
+        out.texture(self.bg_image).draw()
+        if timer:
+            timer.lap("background")
+        _draw_world_video(out, sim, self.aim, self._alpha(), self.governor.current.rotation)
+        if timer:
+            timer.lap("entities")
+        _draw_hud_video(out, self.font, sim, self._hud_lines())
+        if timer:
+            timer.lap("hud")
+        panel = overlay.render()
+        if panel:
+            out.draw_dynamic(panel, (out.size[0] - panel.get_width() - 10, 10))
+        if timer:
+            timer.mark()
+        out.present()
+        if timer:
+            timer.lap("flip")
+        self._end_frame()
+
+    def _hud_lines(self):
+        """HUD read; madalamal kvaliteeditasemel uuendatakse neid ainult iga hud_every kaadri järel."""
+        gov = self.governor
+        if self.hud is None or self.frames % gov.current.hud_every == 0:
+            self.hud = _hud_lines(self.shown)
+            if gov.level:
+                self.hud.append(f"Kvaliteet: {gov.current.name} (muutusi {gov.changes})")
+        return self.hud
+
+    def _end_frame(self):
+        """Kaadri tööaeg regulaatorile (tase võib muutuda) ja ülekatte rida."""
+        gov = self.governor
+        if gov.sample((time.perf_counter() - self._t0) * 1000.0):
+            self._apply_quality()
+        self.frames += 1
+        self.overlay.end_frame(self.dt, {"towers": len(self.shown.towers), "tower_queries": self.tower_queries,
+                                         "particles": len(self.effects), "quality": gov.level,
+                                         "quality_changes": gov.changes})
+
+    def _apply_quality(self):
+        """Rakenda regulaatori praegune tase: osakeste tihedus ja tausta joonistamise viis."""
+        level = self.governor.current
+        self.effects.density = level.effects
+        self.hud = None
+        mode = level.background or self.base_render_mode
+        if mode != self.render_mode and not self.video:
+            self.render_mode = mode
+            self._setup_view()
+
+    def _draw_game_over(self):
+        """Võidu/kaotuse ekraan; ootab klahvi."""
+        screen, font, font_big = self.screen, self.font, self.font_big
+        W, H = screen.get_size()
+        # Kasutame sama mängu taustapilti ka lõppseisus (eraldiseisvat lõputausta ei kasutata)
+        screen.blit(_load_background(W, H), (0, 0))
+
+        if self.shown.state == "win":
+            # ülemine lint + sõnum
+            banner_h = 60
+            pygame.draw.rect(screen, DARK_GREEN, (0, 0, W, banner_h))
+            msg = "Palju õnne! Sa jäid ellu ja saad minna edasi Shooters'isse!"
+            text = text_cache.render(font_big, msg, WHITE)
+            screen.blit(text, (W // 2 - text.get_width() // 2, (banner_h - text.get_height()) // 2))
+        else:
+            # kaotuse lühitekst keskel
+            t1 = text_cache.render(font_big, "KAOTUS! HP sai otsa.", WHITE)
+            screen.blit(t1, (W // 2 - t1.get_width() // 2, H // 2 - 20))
 
-        # Kaotus kui HP otsas
-        if player.hp <= 0:
-            state = "lose"
+        # all rida juhiseks
+        t2 = text_cache.render(font, "Vajuta suvalist klahvi – tagasi menüüsse", WHITE)
+        screen.blit(t2, (W // 2 - t2.get_width() // 2, H - 40))
+        present()
+        if self.renderer:
+            self.renderer.invalidate()
 
-        # Kui laine läbi (kõik vaenlased hävitatud), liigu järgmisele; pärast 10. võit
-        res = waves.try_next(enemies)
-        if res == "win":
-            return "END_SCREEN"
 
-        # ---- JOONISTAMINE ----
-        screen.blit(bg_image, (0, 0))    # taustakaart
-        for b in bullets:
-            b.draw(screen)
-        for e in enemies:
-            e.draw(screen, player.pos)   # (ENEMY_PATTERN) pööramine mängija suunas
-        player.draw(screen)
-
-        # HUD (ülakõrvale)
-        hud = [
-            f"Laine: {waves.wave}/10",
-            f"HP: {player.hp}",
-            f"Skoor: {score}",
-            f"Vaenlasi: {len(enemies)}",
-        ]
-        for i, line in enumerate(hud):
-            t = font.render(line, True, WHITE)
-            screen.blit(t, (10, 10 + i * 24))
-
-        pygame.display.flip()
+def run_game(screen, backend=None, seed=None, render_mode=None, sim_hz=None, record=None, render_scale=None,
+             video=None, quality_budget=None, threaded=None):
+    """
+    Käivita mäng üksiku stseenina. Tagasta 'QUIT', 'BACK_TO_MENU' või 'END_SCREEN'.
+    Parameetrid nagu GameScene'il.
+    """
+    return run_scene(GameScene(screen, backend=backend, seed=seed, render_mode=render_mode,
+                               sim_hz=sim_hz, record=record, render_scale=render_scale, video=video,
+                               quality_budget=quality_budget, threaded=threaded))
@@ -0,0 +1,59 @@
+"""Mängu simulatsiooni jooksutamine ilma aknata (SDL dummy draiver).
+
+Simulation ise ekraani ei vaja; init() käivitab dummy draiveritega ekraani
+ja mikseri nende jaoks, kes tahavad ka joonistada (nt bench.py).
+Käsurealt: python headless.py --ticks 20000 --seed 1 [--backend numpy]
+"""
+import os
+
+
+def dummy_drivers():
+    """SDL dummy draiverid (kui pole juba muud valitud); peab olema enne pygame'i import'i."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+
+dummy_drivers()
+
+import argparse
+import importlib
+import time
+
+import pygame
+
+from main import WIDTH, HEIGHT
+
+
+def init(size=(WIDTH, HEIGHT)):
+    """Käivita pygame dummy draiveritega ja tagasta (nähtamatu) ekraanipind."""
+    pygame.init()
+    if not pygame.display.get_surface():
+        pygame.display.set_mode(size)
+    return pygame.display.get_surface()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Jooksuta mängu loogikat ilma aknata.")
+    parser.add_argument("--ticks", type=int, default=20000, help="maksimaalne sammude arv")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--backend", choices=("objects", "numpy"), default=None)
+    args = parser.parse_args()
+
+    init()
+    game = importlib.import_module("game")
+
+    sim = game.Simulation(WIDTH, HEIGHT, seed=args.seed, backend=args.backend)
+    t0 = time.perf_counter()
+    game.run_headless(sim, args.ticks)
+    elapsed = time.perf_counter() - t0
+
+    print(f"{sim.ticks} sammu {elapsed:.2f} s jooksul ({sim.ticks / elapsed:.0f} sammu/s)")
+    print(f"seis: {sim.state}, laine {sim.waves.wave}, skoor {sim.score}, HP {sim.player.hp}")
+    for kind, st in sim.pool_stats().items():
+        print(f"pool {kind}: loodud {st['created']}, taaskasutatud {st['reused']}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
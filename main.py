@@ -3,88 +3,119 @@ Kasutatud allikana on Tartu linna pilt Pirogovi pargist. Et mängida, pane käim
 import os
 os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
 
-import pygame
+import argparse
 import importlib
 
+import pygame
+
+import scenes
+from scenes import Scene, SceneManager, present
+
 WIDTH, HEIGHT = 1260, 720
 FPS = 60
+RENDERER = "surface"   # "surface" – Surface'id + display.flip; "sdl2" – pygame._sdl2 Renderer (sdl2_video.py)
+
+_game_options = {}     # GameScene lisaparameetrid käsurealt (video, quality_budget, threaded)
 
 def ensure_display():
     if not pygame.display.get_surface():
         pygame.display.set_mode((WIDTH, HEIGHT))
     return pygame.display.get_surface()
 
-def run_menu(screen): #jooksutab menu.py, et kuvada menüü
-    menu = importlib.import_module("menu")
-    if hasattr(menu, "run_menu"):
-        return menu.run_menu(screen)
-    return "QUIT"
+# Olekute üleminekud: (olek, stseeni tulemus) -> järgmine olek; "QUIT" lõpetab
+TRANSITIONS = {
+    ("MENU", "START_GAME"): "GAME",
+    ("GAME", "BACK_TO_MENU"): "MENU",
+    ("GAME", "END_SCREEN"): "END",
+    ("END", "BACK_TO_MENU"): "MENU",
+}
 
-def run_game(screen): #jooksutab game.py, et alustada mängu
-    try:
-        game = importlib.import_module("game")
-        if hasattr(game, "run_game"):
-            return game.run_game(screen)
-    except ModuleNotFoundError:
-        pass
+class PlaceholderScene(Scene): #kui game.py puudub
+    def prepare(self):
+        self.font = pygame.font.SysFont("consolas", 28)
 
-    clock = pygame.time.Clock()
-    font = pygame.font.SysFont("consolas", 28)
-    while True:
-        for event in pygame.event.get():
+    def update(self, dt, events):
+        for event in events:
             if event.type == pygame.QUIT:
                 return "QUIT"
             if event.type == pygame.KEYDOWN and event.key in (pygame.K_ESCAPE, pygame.K_q, pygame.K_BACKSPACE):
                 return "BACK_TO_MENU"
+        return None
 
+    def draw(self):
+        screen = self.screen
         screen.fill((20, 20, 20))
-        t1 = font.render("game.py puudub – placeholder.", True, (240, 240, 240))
-        t2 = font.render("ESC / Q / Backspace = tagasi menüüsse", True, (200, 200, 200)) #oli esialgne placeholder
+        t1 = self.font.render("game.py puudub – placeholder.", True, (240, 240, 240))
+        t2 = self.font.render("ESC / Q / Backspace = tagasi menüüsse", True, (200, 200, 200)) #oli esialgne placeholder
         screen.blit(t1, (WIDTH//2 - t1.get_width()//2, HEIGHT//2 - 20))
         screen.blit(t2, (WIDTH//2 - t2.get_width()//2, HEIGHT//2 + 20))
-        pygame.display.flip()
-        clock.tick(FPS)
+        present()
 
-def run_end(screen):
-    end = importlib.import_module("end")
-    if hasattr(end, "run_end"):
-        return end.run_end(screen)
-    return "QUIT"
+def menu_scene(screen): #menüü stseen (moodul imporditakse ainult üks kord)
+    menu = importlib.import_module("menu")
+    try:
+        # mängu pildid dekodeeritakse/skaleeritakse taustalõimes, kuni menüü on ees
+        importlib.import_module("game").preload_assets(*screen.get_size())
+    except ModuleNotFoundError:
+        pass
+    return menu.MenuScene(screen)
 
-def main(): #funktsioon, et kuvada ekraani ja teha vastavaid menüü vahetusi.
+def game_scene(screen): #mängu stseen, kui game.py olemas
+    try:
+        game = importlib.import_module("game")
+        if hasattr(game, "GameScene"):
+            return game.GameScene(screen, **_game_options)
+    except ModuleNotFoundError:
+        pass
+    return PlaceholderScene(screen)
+
+def end_scene(screen):
+    return importlib.import_module("end").EndScene(screen)
+
+def open_video(software=False):
+    """
+    SDL2 Renderer'i aken (sdl2_video.VideoOutput); None, kui pygame._sdl2 puudub.
+    pygame.display'le tehakse peidetud aken – convert() vajab selle pikslivormingut.
+    """
+    video = importlib.import_module("sdl2_video")
+    if not video.HAVE_SDL2:
+        print("[main] pygame._sdl2.video puudub – joonistan Surface'itega")
+        return None
+    pygame.display.set_mode((WIDTH, HEIGHT), pygame.HIDDEN)
+    output = _game_options["video"] = video.VideoOutput((WIDTH, HEIGHT), "Piro survival", software=software)
+    scenes.set_output(output.present_screen, close_quits=True)   # peidetud aken jääb alles → SDL QUIT'i ei saada
+    return output
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Piro survival")
+    parser.add_argument("--renderer", choices=("surface", "sdl2"), default=RENDERER,
+                        help="surface – Surface'id ja display.flip; sdl2 – Renderer ja tekstuurid")
+    parser.add_argument("--software", action="store_true", help="sdl2: SDL-i tarkvaraline Renderer (võrdlemiseks)")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="kaadri tööaja eelarve kvaliteedi regulaatorile (vaikimisi 16.7, 0 = väljas)")
+    parser.add_argument("--threaded", action="store_true", help="mänguloogika eraldi lõimes (sim_thread.py)")
+    return parser.parse_args(argv)
+
+def main(argv=None): #funktsioon, et kuvada ekraani ja teha vastavaid menüü vahetusi.
+    args = parse_args(argv)
+    if args.budget_ms is not None:
+        _game_options["quality_budget"] = args.budget_ms
+    if args.threaded:
+        _game_options["threaded"] = True
     pygame.init()
     pygame.display.set_caption("Piro survival")
-    screen = ensure_display()
-    clock = pygame.time.Clock()
-
-    state = "MENU"
-    running = True
-
-    while running:
-        clock.tick(FPS)
-
-        if state == "MENU":
-            result = run_menu(screen)
-            if result == "START_GAME":
-                state = "GAME"
-            elif result == "QUIT":
-                running = False
-
-        elif state == "GAME":
-            result = run_game(screen)
-            if result == "BACK_TO_MENU":
-                state = "MENU"
-            elif result == "END_SCREEN":
-                state = "END"
-            elif result == "QUIT":
-                running = False
-        
-        elif state == "END":
-            result = run_end(screen)
-            if result == "BACK_TO_MENU":
-                state = "MENU"
-            elif result == "QUIT":
-                running = False
+    video = open_video(args.software) if args.renderer == "sdl2" else None
+    screen = video.screen if video else ensure_display()
+    importlib.import_module("atlas").install() # eelküpsetatud pildid (python atlas.py); aegunud/puuduvad → PNG
+
+    # stseenid luuakse esimesel külastusel ja jäävad alles; üks tsükkel ja üks kell
+    manager = SceneManager(
+        screen,
+        {"MENU": menu_scene, "GAME": game_scene, "END": end_scene},
+        TRANSITIONS,
+        fps=FPS,
+    )
+    manager.run("MENU")
 
     pygame.quit()
 
@@ -1,9 +1,12 @@
 """Tegemist on Pythoni keskkonnas tehtud mänguga, mis on Pirogovi pargi 'Tower defense'. Autoriteks on Arthur Klettenberg ja Rene Miller."""
-import os
 import pygame
 import pygame.freetype
 from pygame.sprite import Sprite
 
+import assets
+import text_cache
+from scenes import IDLE_TIMEOUT_MS, REDRAW_EVENTS, Scene, present, run_scene
+
 WHITE = (255, 255, 255)
 DARK_GREEN = (20, 60, 20)
 DESCRIPTION_TEXT = (255, 255, 255)
@@ -16,17 +19,18 @@ GAME_DESCRIPTION = (
 )
 
 def create_surface_with_text(text, font_size, text_rgb, bg_rgb=None, bold=True):
-    font = pygame.freetype.SysFont("Courier", int(font_size), bold=bold)
+    font = text_cache.freetype_font("Courier", int(font_size), bold=bold)
     surface, _ = font.render(text=text, fgcolor=text_rgb, bgcolor=bg_rgb)
     return surface.convert_alpha()
 
-def load_sound(name):
-    return pygame.mixer.Sound(
-        os.path.join(os.path.dirname(__file__), "assets", name)
-    )
+def load_sound(name, volume=None):
+    return assets.sound(name, volume) # laetakse esimesel kasutamisel, mitte importimisel
+
+BUTTON_CLICK_SOUND = "buttonclickrelease.wav"
+MENU_BG = "piro.png"
 
-BUTTON_CLICK_SOUND = load_sound("buttonclickrelease.wav")
-BUTTON_CLICK_SOUND.set_volume(0.1)
+def asset_keys(w, h): # menüü pildid (atlas.py küpsetab need ette)
+    return [assets.key_scaled(MENU_BG, (w, h))]
 
 class UIElement(Sprite):
     def __init__(self, center_position, text, font_size, text_rgb, action=None):
@@ -60,7 +64,7 @@ class UIElement(Sprite):
             self.mouse_over = True
             if mouse_up:
                 if self.action == "START_GAME":
-                    BUTTON_CLICK_SOUND.play()
+                    load_sound(BUTTON_CLICK_SOUND, 0.1).play()
                 return self.action
 
         else:
@@ -75,7 +79,7 @@ class TextBox: #tekstikast üleval osas mängul, et kuvada tutvustatava teksti.
         self.topleft = topleft
         self.width = width
         self.text = text
-        self.font = pygame.freetype.SysFont("Courier", int(font_size), bold=False)
+        self.font = text_cache.freetype_font("Courier", int(font_size), bold=False)
         self.text_color = text_color
         self.box_color = box_color
         self.padding = padding
@@ -89,6 +93,10 @@ class TextBox: #tekstikast üleval osas mängul, et kuvada tutvustatava teksti.
         self.rect = pygame.Rect(topleft[0], topleft[1], width, self.height)
 
     def _wrap_line(self, line, max_width):
+        # sama fondi, rea ja laiuse murdmine arvutatakse ainult üks kord
+        return list(text_cache.layout(self.font, line, max_width, lambda: self._compute_wrap(line, max_width)))
+
+    def _compute_wrap(self, line, max_width):
         words = line.split(" ")
         wrapped = []
         current = ""
@@ -107,62 +115,92 @@ class TextBox: #tekstikast üleval osas mängul, et kuvada tutvustatava teksti.
         x = self.rect.x + self.padding
         y = self.rect.y + self.padding
         for line in self.lines:
-            text_surface, _ = self.font.render(line, fgcolor=self.text_color)
+            text_surface = text_cache.render_freetype(self.font, line, self.text_color)
             surface.blit(text_surface, (x, y))
             y += self.line_height
 
-def run_menu(screen): #menüü ekraani kood, et kuvada pilti
-    clock = pygame.time.Clock()
-    WIDTH, HEIGHT = screen.get_size()
-
-    bg_path = os.path.join(os.path.dirname(__file__), "assets", "piro.png")
-    taust = pygame.image.load(bg_path).convert()
-    taust = pygame.transform.scale(taust, (WIDTH, HEIGHT))
-
-    desc_width = 900
-    desc_x = (WIDTH - desc_width) // 2
-    description_box = TextBox(
-        topleft=(desc_x, 30),
-        width=desc_width,
-        text=GAME_DESCRIPTION,
-        font_size=20,
-        text_color=DESCRIPTION_TEXT,
-        box_color=DARK_GREEN,
-        padding=16,
-    )
-
-    start_btn = UIElement(
-        center_position=(200, HEIGHT - 60),
-        font_size=30,
-        text_rgb=WHITE,
-        text="Alusta",
-        action="START_GAME",
-    )
-    quit_btn = UIElement(
-        center_position=(WIDTH - 200, HEIGHT - 60),
-        font_size=30,
-        text_rgb=WHITE,
-        text="Välju",
-        action="QUIT",
-    )
-
-    while True:
+class MenuScene(Scene):
+    """
+    Peamenüü: taust, tutvustuse kast ja nupud luuakse üks kord ning jäävad alles.
+    Menüü ootab sündmusi (idle_timeout) ja joonistab ainult siis, kui nupu esiletõst
+    muutus või aken vajab uuesti joonistamist; taust koos tekstikastiga on valmis pinnal.
+    """
+
+    idle_timeout = IDLE_TIMEOUT_MS
+
+    def prepare(self):
+        WIDTH, HEIGHT = self.screen.get_size()
+
+        self.taust = assets.scaled(MENU_BG, (WIDTH, HEIGHT)) # registrist – teisel korral ei dekodeerita uuesti
+
+        desc_width = 900
+        desc_x = (WIDTH - desc_width) // 2
+        self.description_box = TextBox(
+            topleft=(desc_x, 30),
+            width=desc_width,
+            text=GAME_DESCRIPTION,
+            font_size=20,
+            text_color=DESCRIPTION_TEXT,
+            box_color=DARK_GREEN,
+            padding=16,
+        )
+
+        self.buttons = (
+            UIElement(
+                center_position=(200, HEIGHT - 60),
+                font_size=30,
+                text_rgb=WHITE,
+                text="Alusta",
+                action="START_GAME",
+            ),
+            UIElement(
+                center_position=(WIDTH - 200, HEIGHT - 60),
+                font_size=30,
+                text_rgb=WHITE,
+                text="Välju",
+                action="QUIT",
+            ),
+        )
+
+        # muutumatu osa (taust + tutvustus) ühel pinnal – joonistamisel üks blit
+        self.static = pygame.Surface((WIDTH, HEIGHT)).convert()
+        self.static.blit(self.taust, (0, 0))
+        self.description_box.draw(self.static)
+        self._drawn = None   # nuppude esiletõst viimasel joonistamisel (None = joonista kindlasti)
+
+    def enter(self):
+        for btn in self.buttons:
+            btn.mouse_over = False  # eelmisest külastusest jäänud esiletõst maha
+        self._drawn = None
+
+    def update(self, dt, events):
         mouse_up = False
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT:
                 return "QUIT"
             if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
                 mouse_up = True
+            if event.type in REDRAW_EVENTS:
+                self._drawn = None
 
         mouse_pos = pygame.mouse.get_pos()
-        ui_action = start_btn.update(mouse_pos, mouse_up) or quit_btn.update(mouse_pos, mouse_up)
-        if ui_action in ("START_GAME", "QUIT"):
-            return ui_action
+        for btn in self.buttons:
+            ui_action = btn.update(mouse_pos, mouse_up)
+            if ui_action in ("START_GAME", "QUIT"):
+                return ui_action
+        return None
+
+    def draw(self):
+        hover = tuple(btn.mouse_over for btn in self.buttons)
+        if hover == self._drawn:
+            return  # ekraanil on juba õige pilt
+        screen = self.screen
+        screen.blit(self.static, (0, 0))
+        for btn in self.buttons:
+            btn.draw(screen)
+        present()
+        self._drawn = hover
 
-        screen.blit(taust, (0, 0))
-        description_box.draw(screen)
-        start_btn.draw(screen)
-        quit_btn.draw(screen)
 
-        pygame.display.flip()
-        clock.tick(60)
+def run_menu(screen): #menüü ekraani kood, et kuvada pilti
+    return run_scene(MenuScene(screen))
@@ -0,0 +1,200 @@
+"""Voovälja (flow field) navigatsioon pargi kaardil.
+
+Vaenlased lendasid otse mängija poole, majadest läbi. Siin tehakse taustapildist
+käidavuse ruudustik (katused – punakad pikslid – on takistused) ja arvutatakse
+sellele üks Dijkstra otsing mängija lahtrist väljapoole. Iga lahtri kohta jääb
+meelde järgmise lahtri keskpunkt teel mängijani; vaenlane vaatab igas sammus
+ainult oma lahtri järgmise punkti (O(1)), nii et tuhanded vaenlased saavad
+majadest mööda lennata sama hinnaga.
+
+Takistuse lahtrid pole keelatud, vaid kallid (BLOCKED_COST): kaardi servast või
+katuse pealt alustanud vaenlane leiab nii lühima tee välja. Tulemus salvestatakse
+NAV_CACHE_DIR kausta; uus arvutus tehakse ainult siis, kui pilt, ruudustik või
+sihtmärgi lahter muutub (sama lahtri sees liikuv sihtmärk kasutab sama välja).
+"""
+import hashlib
+import heapq
+import math
+import os
+from array import array
+
+import pygame
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NAV_VERSION = 2
+NAV_CELL = 20                 # ruudustiku lahtri külg (px maailma koordinaatides)
+BLOCKED_COST = 12.0           # mitu korda kallim on takistuse lahtrisse minek
+ROOF_MIN_RED = 140            # katus: punane vähemalt nii palju …
+ROOF_RED_OVER_GREEN = 30      # … ja nii palju üle rohelise …
+ROOF_RED_OVER_BLUE = 20       # … ja sinise (lahtri keskmine värv)
+NAV_CACHE_DIR = os.path.join(os.path.dirname(__file__), ".nav_cache")
+
+_fields = {}    # võti -> FlowField (ühe protsessi sees jagatud, ainult loetakse)
+
+_NEIGHBOURS = [(dx, dy, math.hypot(dx, dy)) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+
+
+class FlowField:
+    """
+    Ruudustik cols × rows lahtriga; next_x/next_y[i] – lahtri i järgmine sihtpunkt teel
+    sihtmärgi lahtrini (seal ja selle naabrites lahtri keskpunkt). Ruudustikust
+    väljas olev punkt kasutab lähimat servalahtrit.
+    """
+
+    def __init__(self, cols, rows, cell, next_x, next_y, blocked):
+        self.cols, self.rows, self.cell = cols, rows, cell
+        self.next_x, self.next_y = next_x, next_y
+        self.blocked = blocked          # bytes: 1 = takistus (vaatamiseks/silumiseks)
+        self._inv = 1.0 / cell
+        if np is not None:
+            self.next_x_np = np.frombuffer(next_x, dtype=np.float32)
+            self.next_y_np = np.frombuffer(next_y, dtype=np.float32)
+
+    def next_point(self, x, y):
+        """Kuhu punktist (x, y) edasi lennata – O(1)."""
+        cx = min(self.cols - 1, max(0, int(x * self._inv)))
+        cy = min(self.rows - 1, max(0, int(y * self._inv)))
+        i = cy * self.cols + cx
+        return self.next_x[i], self.next_y[i]
+
+    def next_points(self, pos):
+        """Sama mis next_point, aga numpy (n, 2) massiivi kõigi ridade jaoks korraga."""
+        cx = np.clip((pos[:, 0] * self._inv).astype(np.int32), 0, self.cols - 1)
+        cy = np.clip((pos[:, 1] * self._inv).astype(np.int32), 0, self.rows - 1)
+        i = cy * self.cols + cx
+        return self.next_x_np[i], self.next_y_np[i]
+
+
+def _blocked_mask(image_path, cols, rows):
+    """Taustapilt lahtrite mõõtu (keskmine värv lahtri kohta) → 1 = katus, 0 = vaba."""
+    img = pygame.image.load(image_path)
+    if img.get_bitsize() < 24:
+        full = pygame.Surface(img.get_size(), pygame.SRCALPHA)
+        full.blit(img, (0, 0))
+        img = full
+    small = pygame.transform.smoothscale(img, (cols, rows))
+    mask = bytearray(cols * rows)
+    for cy in range(rows):
+        for cx in range(cols):
+            r, g, b = small.get_at((cx, cy))[:3]
+            if r >= ROOF_MIN_RED and r - g >= ROOF_RED_OVER_GREEN and r - b >= ROOF_RED_OVER_BLUE:
+                mask[cy * cols + cx] = 1
+    return bytes(mask)
+
+
+def _target_cell(cols, rows, cell, target):
+    """Sihtpunkti (x, y) lahter (cx, cy), ruudustiku piiridesse surutud."""
+    return (min(cols - 1, max(0, int(target[0] // cell))),
+            min(rows - 1, max(0, int(target[1] // cell))))
+
+
+def _dijkstra(blocked, cols, rows, cell, target_cell):
+    """Kaugused sihtmärgi lahtrist (cx, cy); tagastab next_x, next_y (array('f'))."""
+    tcx, tcy = target_cell
+    start = tcy * cols + tcx
+    dist = [math.inf] * (cols * rows)
+    dist[start] = 0.0
+    heap = [(0.0, start)]
+    while heap:
+        d, i = heapq.heappop(heap)
+        if d > dist[i]:
+            continue
+        cx, cy = i % cols, i // cols
+        for dx, dy, step in _NEIGHBOURS:
+            nx, ny = cx + dx, cy + dy
+            if not (0 <= nx < cols and 0 <= ny < rows):
+                continue
+            j = ny * cols + nx
+            # diagonaal ainult siis, kui kumbki nurga kõrval olev lahter pole takistus
+            if dx and dy and (blocked[cy * cols + nx] or blocked[ny * cols + cx]) and not blocked[j]:
+                continue
+            nd = d + step * (BLOCKED_COST if blocked[i] else 1.0)
+            if nd < dist[j]:
+                dist[j] = nd
+                heapq.heappush(heap, (nd, j))
+
+    # iga lahter liigub naabri poole, kust on sihini kõige lühem (Dijkstra otsis sihist väljapoole,
+    # seega naabri kaugus + samm sinna = selle lahtri kaugus)
+    next_x = array("f", bytes(4 * cols * rows))
+    next_y = array("f", bytes(4 * cols * rows))
+    half = cell / 2.0
+    tx, ty = tcx * cell + half, tcy * cell + half
+    for i in range(cols * rows):
+        if i == start:
+            next_x[i], next_y[i] = tx, ty
+            continue
+        cx, cy = i % cols, i // cols
+        best, best_d = i, dist[i]
+        for dx, dy, step in _NEIGHBOURS:
+            nx, ny = cx + dx, cy + dy
+            if 0 <= nx < cols and 0 <= ny < rows:
+                j = ny * cols + nx
+                if dist[j] < best_d:
+                    best, best_d = j, dist[j]
+        if best == start:
+            next_x[i], next_y[i] = tx, ty
+        else:
+            next_x[i] = (best % cols) * cell + half
+            next_y[i] = (best // cols) * cell + half
+    return next_x, next_y
+
+
+def _cache_path(image_path, cols, rows, cell, target_cell):
+    st = os.stat(image_path)
+    key = repr((NAV_VERSION, os.path.basename(image_path), st.st_size, st.st_mtime_ns, cols, rows, cell,
+                target_cell, BLOCKED_COST,
+                ROOF_MIN_RED, ROOF_RED_OVER_GREEN, ROOF_RED_OVER_BLUE))
+    return os.path.join(NAV_CACHE_DIR, "flow_" + hashlib.sha1(key.encode()).hexdigest()[:16] + ".bin")
+
+
+def _load(path, n):
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if len(data) != 9 * n:
+        return None  # vigane/poolik fail – arvuta uuesti
+    next_x, next_y = array("f"), array("f")
+    next_x.frombytes(data[:4 * n])
+    next_y.frombytes(data[4 * n:8 * n])
+    return next_x, next_y, data[8 * n:]
+
+
+def _save(path, next_x, next_y, blocked):
+    try:
+        os.makedirs(NAV_CACHE_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"   # oma nimi igas protsessis (balance.py töölised kirjutavad korraga)
+        with open(tmp, "wb") as f:
+            f.write(next_x.tobytes())
+            f.write(next_y.tobytes())
+            f.write(blocked)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # kirjutamisõigust pole – järgmisel korral arvutatakse uuesti
+
+
+def flow_field(image_path, w, h, target, cell=NAV_CELL):
+    """
+    Voováli maailmale w × h (taust image_path) sihtpunkti target (x, y) lahtri poole.
+    Sama protsessi sees antakse sama objekt; kettalt loetakse, kui sama väli on juba arvutatud.
+    """
+    cols, rows = math.ceil(w / cell), math.ceil(h / cell)
+    tcell = _target_cell(cols, rows, cell, target)
+    path = _cache_path(image_path, cols, rows, cell, tcell)
+    field = _fields.get(path)
+    if field is not None:
+        return field
+    loaded = _load(path, cols * rows)
+    if loaded is None:
+        blocked = _blocked_mask(image_path, cols, rows)
+        next_x, next_y = _dijkstra(blocked, cols, rows, cell, tcell)
+        _save(path, next_x, next_y, blocked)
+    else:
+        next_x, next_y, blocked = loaded
+    field = _fields[path] = FlowField(cols, rows, cell, next_x, next_y, blocked)
+    return field
@@ -0,0 +1,58 @@
+"""Objektide kogum (pool) kuulide ja vaenlaste taaskasutamiseks.
+
+Iga lask ja iga uus vaenlane lõi varem uue Pythoni objekti koos Vector2'dega
+ning surnud visati minema. Pool hoiab surnud objektid alles ja acquire()
+lähtestab need reset() abil kohapeal, nii et püsiolekus uusi objekte ei teki.
+"""
+
+
+class Pool:
+    """Vabade objektide virn; factory(*args) loob uue, obj.reset(*args) lähtestab vana."""
+
+    def __init__(self, factory):
+        self.factory = factory
+        self._free = []
+        self.created = 0    # mitu objekti on kokku loodud
+        self.reused = 0     # mitu korda anti välja taaskasutatud objekt
+        self.peak_free = 0
+
+    def acquire(self, *args, **kwargs):
+        """Anna objekt: vaba objekt lähtestatuna või (kui vabu pole) uus."""
+        if self._free:
+            obj = self._free.pop()
+            obj.reset(*args, **kwargs)
+            self.reused += 1
+            return obj
+        self.created += 1
+        return self.factory(*args, **kwargs)
+
+    def release(self, obj):
+        """Võta objekt tagasi taaskasutuseks."""
+        self._free.append(obj)
+        if len(self._free) > self.peak_free:
+            self.peak_free = len(self._free)
+
+    def stats(self):
+        free = len(self._free)
+        return {
+            "created": self.created,
+            "reused": self.reused,
+            "free": free,
+            "in_use": self.created - free,
+            "peak_free": self.peak_free,
+        }
+
+
+def compact_alive(items, pool=None):
+    """
+    Eemalda listist surnud objektid (obj.alive == False) kohapeal, uut listi loomata.
+    Elusate järjekord säilib; surnud antakse pool'i tagasi, kui see on antud.
+    """
+    w = 0
+    for obj in items:
+        if obj.alive:
+            items[w] = obj
+            w += 1
+        elif pool is not None:
+            pool.release(obj)
+    del items[w:]
@@ -0,0 +1,115 @@
+"""Kaadri faaside ajamõõtmine.
+
+PhaseTimer mõõdab "ringiaegu": mark() paneb alguspunkti ja iga lap(nimi)
+lisab eelmisest punktist möödunud aja selle faasi arvele. Kui mõõtmist pole
+vaja, antakse koodile timer=None ja faaside vahel on ainult üks if-kontroll.
+
+ALLOCS loendab mängu enda koodis loodud Surface'e ja Vector2'sid (kood kutsub
+count_alloc() seal, kus neid tehakse) ja FrameHistory hoiab viimaste kaadrite
+mõõtmisi fikseeritud suurusega ringpuhvris.
+"""
+import csv
+import time
+from array import array
+
+# Loodud objektide loendurid; kasvavad kogu aeg, kaadri kohta arvutatakse vahe
+ALLOCS = {"surface": 0, "vector2": 0}
+
+
+def count_alloc(kind, n=1):
+    """Märgi, et loodi n objekti liigist kind ("surface" või "vector2")."""
+    ALLOCS[kind] += n
+
+
+def percentile(sorted_values, p):
+    """p-protsentiil (0..100) juba sorteeritud listist, lineaarse interpoleerimisega."""
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * p / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def summarize_ms(values_s):
+    """Sekundite listist kokkuvõte millisekundites: keskmine, p50, p95, p99, max."""
+    if not values_s:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    ms = sorted(v * 1000.0 for v in values_s)
+    return {
+        "mean": sum(ms) / len(ms),
+        "p50": percentile(ms, 50),
+        "p95": percentile(ms, 95),
+        "p99": percentile(ms, 99),
+        "max": ms[-1],
+    }
+
+
+class PhaseTimer:
+    """Ühe kaadri faasiajad: {faasi nimi: sekundid}. new_frame() alustab uut kaadrit."""
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.phases = {}
+        self._last = clock()
+
+    def new_frame(self):
+        """Tühjenda eelmise kaadri ajad ja pane alguspunkt."""
+        self.phases.clear()
+        self._last = self.clock()
+
+    def mark(self):
+        """Pane alguspunkt ilma aegu kustutamata (nt kui vahepeal oli mõõtmata kood)."""
+        self._last = self.clock()
+
+    def lap(self, name):
+        """Lisa eelmisest punktist möödunud aeg faasile name ja liigu edasi."""
+        now = self.clock()
+        self.phases[name] = self.phases.get(name, 0.0) + (now - self._last)
+        self._last = now
+
+
+class FrameHistory:
+    """Viimase capacity kaadri mõõtmised veergudena; vanimad kirjutatakse üle."""
+
+    def __init__(self, columns, capacity=300):
+        self.columns = tuple(columns)
+        self.capacity = capacity
+        self._data = {c: array("d", bytes(8 * capacity)) for c in self.columns}
+        self._next = 0     # järgmise kirje indeks puhvris
+        self.count = 0     # mitu kaadrit kokku on salvestatud (ka üle kirjutatud)
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def push(self, values):
+        """Lisa üks kaader; values on {veerg: arv}, puuduvad veerud saavad 0."""
+        i = self._next
+        for c in self.columns:
+            self._data[c][i] = values.get(c, 0.0)
+        self._next = (i + 1) % self.capacity
+        self.count += 1
+
+    def column(self, name):
+        """Veeru väärtused ajalises järjekorras (vanimast uusimani)."""
+        data = self._data[name]
+        if self.count < self.capacity:
+            return data[:self.count].tolist()
+        return data[self._next:].tolist() + data[:self._next].tolist()
+
+    def mean(self, name, last=None):
+        """Veeru keskmine viimase last kaadri peale (vaikimisi kogu puhver)."""
+        values = self.column(name)
+        if last:
+            values = values[-last:]
+        return sum(values) / len(values) if values else 0.0
+
+    def export_csv(self, path):
+        """Kirjuta puhvri sisu CSV faili (päis + üks rida kaadri kohta)."""
+        cols = [self.column(c) for c in self.columns]
+        first = self.count - len(self)
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(("frame",) + self.columns)
+            for k, row in enumerate(zip(*cols)):
+                writer.writerow((first + k,) + row)
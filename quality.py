@@ -0,0 +1,114 @@
+"""Kvaliteedi regulaator: hoiab kaadri tööaega eelarve piires.
+
+Koormuse all läks kaader varem lihtsalt pikemaks (dt kasvas, mäng hakkas
+hakkima). QualityGovernor vaatab iga kaadri mõõdetud tööaega (loogika +
+joonistamine + flip, ilma Clock.tick'i ootamiseta) ja liigub kvaliteeditasemete
+vahel: kui AVG_FRAMES kaadri keskmine on DOWN_WINDOWS akent järjest üle
+eelarve, läheb tase alla; tagasi üles alles siis, kui keskmine on UP_WINDOWS
+akent järjest alla UP_RATIO × eelarve. Eri lävendid ja aknad (hüsterees)
+hoiavad ära edasi-tagasi hüplemise.
+
+Kui QUALITY_LOG on seatud (PIRO_QUALITY_LOG keskkonnamuutuja), kirjutatakse iga
+taseme muutus sinna faili (aeg, tase, keskmine), nii et kioskite logist on näha,
+kui tihti ja kui kaugele kvaliteet langes. Vaikimisi logi ei kirjutata – taset
+näeb HUD-ist ja F3 ülekattest.
+"""
+import os
+import time
+from collections import namedtuple
+
+FRAME_BUDGET_MS = 1000.0 / 60    # vaikimisi eelarve (60 FPS)
+AVG_FRAMES = 30                  # mitme kaadri keskmise järgi otsustatakse (üks aken)
+DOWN_RATIO = 1.0                 # aken üle eelarve × selle → halvem tase …
+DOWN_WINDOWS = 2                 # … kui nii mitu akent järjest
+UP_RATIO = 0.6                   # aken alla eelarve × selle → parem tase …
+UP_WINDOWS = 10                  # … kui nii mitu akent järjest (≈5 s 60 FPS juures)
+QUALITY_LOG = os.environ.get("PIRO_QUALITY_LOG")   # taseme muutuste logifail või None (ei logita)
+
+# rotation – vaenlaste pööramine: "smooth" (rotozoom, 5°), "nearest" (transform.rotate, 15°), "none";
+# hud_every – HUD tekstid uuesti iga N kaadri järel; sound_every – helid mängitakse iga N kaadri
+# järel (vahepealsed päringud ühendatakse); effects – osakeste tihedus (0 = efekte pole);
+# background – None: seadistatud render_mode, "dirty": tausta taastatakse ainult muutunud aladel
+QualityLevel = namedtuple("QualityLevel", "name rotation hud_every sound_every effects background")
+
+LEVELS = (
+    QualityLevel("täis", "smooth", 1, 1, 1.0, None),
+    QualityLevel("kõrge", "smooth", 2, 1, 0.75, None),
+    QualityLevel("keskmine", "nearest", 4, 2, 0.5, "dirty"),
+    QualityLevel("madal", "nearest", 8, 3, 0.25, "dirty"),
+    QualityLevel("minimaalne", "none", 15, 4, 0.0, "dirty"),
+)
+
+
+class QualityGovernor:
+    """
+    sample(töö_ms) kord kaadris; tagastab True, kui tase muutus (siis current on uus tase).
+    level – 0 on parim; changes/downs/ups – muutuste arv; frames – kaadreid igal tasemel.
+    budget_ms=0 lülitab regulaatori välja (tase jääb 0); log_path=None – muutusi ei logita.
+    """
+
+    def __init__(self, budget_ms=FRAME_BUDGET_MS, levels=LEVELS, log_path=QUALITY_LOG):
+        self.budget_ms = budget_ms
+        self.levels = levels
+        self.log_path = log_path
+        self.level = 0
+        self.changes = self.downs = self.ups = 0
+        self.frames = [0] * len(levels)
+        self._sum = 0.0
+        self._count = 0
+        self._over = 0       # mitu akent järjest üle eelarve
+        self._under = 0      # mitu akent järjest selgelt alla eelarve
+
+    @property
+    def current(self):
+        return self.levels[self.level]
+
+    def sample(self, work_ms):
+        self.frames[self.level] += 1
+        if not self.budget_ms:
+            return False
+        self._sum += work_ms
+        self._count += 1
+        if self._count < AVG_FRAMES:
+            return False
+        mean = self._sum / self._count
+        self._sum, self._count = 0.0, 0
+
+        if mean > self.budget_ms * DOWN_RATIO:
+            self._over, self._under = self._over + 1, 0
+            if self._over >= DOWN_WINDOWS and self.level < len(self.levels) - 1:
+                return self._set(self.level + 1, mean)
+        elif mean < self.budget_ms * UP_RATIO:
+            self._over, self._under = 0, self._under + 1
+            if self._under >= UP_WINDOWS and self.level > 0:
+                return self._set(self.level - 1, mean)
+        else:
+            self._over = self._under = 0
+        return False
+
+    def _set(self, level, mean):
+        old, self.level = self.level, level
+        self._over = self._under = 0
+        self.changes += 1
+        if level > old:
+            self.downs += 1
+        else:
+            self.ups += 1
+        self._log(old, level, mean)
+        return True
+
+    def _log(self, old, new, mean):
+        if not self.log_path:
+            return
+        line = (f"{time.strftime('%Y-%m-%dT%H:%M:%S')} {self.levels[old].name} -> {self.levels[new].name} "
+                f"(keskmine {mean:.1f} ms, eelarve {self.budget_ms:.1f} ms, muutusi {self.changes})")
+        try:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError:
+            pass   # logi pole kirjutatav (nt kirjutuskaitstud kiosk) – mäng jätkab
+
+    def stats(self):
+        return {"level": self.level, "name": self.current.name, "changes": self.changes,
+                "downs": self.downs, "ups": self.ups,
+                "frames": {lv.name: n for lv, n in zip(self.levels, self.frames)}}
@@ -0,0 +1,68 @@
+"""Joonistamise järjekord: kõik olemid ühe Surface.blits() kutsega.
+
+Igal kuulil oli oma pygame.draw.circle ja igal vaenlasel oma blit – iga kord
+eraldi Python→C kutse ja uus Rect. RenderQueue kogub kaadri jooksul
+(Surface, asukoht) paarid kihtide kaupa ning flush() saadab need kihtide
+järjekorras ühe screen.blits() kutsega. Ringid (kuulid, spriteta vaenlased)
+joonistatakse üks kord valmis Surface'iks (circle_sprite).
+"""
+import pygame
+
+from profiling import count_alloc
+
+_circles = {}   # (värv, raadius) -> Surface
+
+
+def circle_sprite(color, r):
+    """Eelrenderdatud ring läbimõõduga 2r+1 (keskpunkt (r, r)) – sama mis draw.circle."""
+    key = (color, r)
+    surf = _circles.get(key)
+    if surf is None:
+        # colorkey + RLE on blit'imisel kiirem kui pikslipõhine alfa (ringil on ainult täis/tühi piksel)
+        surf = pygame.Surface((2 * r + 1, 2 * r + 1))
+        ckey = (255, 0, 255) if color != (255, 0, 255) else (0, 0, 0)
+        surf.fill(ckey)
+        pygame.draw.circle(surf, color, (r, r), r)
+        if pygame.display.get_surface():
+            surf = surf.convert()
+        surf.set_colorkey(ckey, pygame.RLEACCEL)
+        count_alloc("surface")
+        _circles[key] = surf
+    return surf
+
+
+class RenderQueue:
+    """add()/extend() kaadri jooksul, flush(screen) lõpus; listid jäävad kaadrite vahel alles."""
+
+    def __init__(self):
+        self._layers = {}     # kiht -> [(Surface, (x, y)), ...]
+        self._seq = []
+        self.last_count = 0   # mitu paari eelmises flush'is
+
+    def add(self, layer, surf, dest):
+        items = self._layers.get(layer)
+        if items is None:
+            items = self._layers[layer] = []
+        items.append((surf, dest))
+
+    def extend(self, layer, pairs):
+        items = self._layers.get(layer)
+        if items is None:
+            items = self._layers[layer] = []
+        items.extend(pairs)
+
+    def flush(self, screen, doreturn=False):
+        """
+        Joonista kõik järjekorras olevad paarid kihtide kasvavas järjekorras ühe blits'iga.
+        doreturn=True tagastab joonistatud alad (dirty rect režiimi jaoks), muidu None.
+        """
+        seq = self._seq
+        seq.clear()
+        for layer in sorted(self._layers):
+            items = self._layers[layer]
+            seq.extend(items)
+            items.clear()
+        self.last_count = len(seq)
+        if not seq:
+            return [] if doreturn else None
+        return screen.blits(seq, doreturn=doreturn)
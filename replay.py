@@ -0,0 +1,177 @@
+"""Sisendi salvestus ja deterministlik taasesitus.
+
+Salvestis on väike binaarfail: päises seeme, loogika sammusagedus, ekraani
+mõõdud ja olemite hoidla, edasi iga loogikasammu kohta hiire asukoht ja klõps
+(5 baiti) ning iga CHECKSUM_EVERY sammu järel kontrollpunkt: seisu kontrollsumma,
+skoor, laine ja HP. Taasesitus annab samad sisendid läbi sama Simulation'i
+(Player.shoot, Waves.update, …) ja võrdleb kontrollpunkte – esimene erinev
+samm näitab, kus mäng lahku läks. Ilma joonistamiseta on see ühtlasi korratav
+koormus jõudluse mõõtmiseks.
+
+    python replay.py sessioon.bin              # nii kiiresti kui saab, ilma pildita
+    python replay.py sessioon.bin --realtime   # päris kiirusel koos pildiga
+"""
+import argparse
+import importlib
+import struct
+import sys
+import time
+import zlib
+
+MAGIC = b"PIRO"
+VERSION = 1
+BACKENDS = ("objects", "numpy")
+CHECKSUM_EVERY = 60          # kontrollpunkti vahe sammudes
+
+# päis: magic, versioon, hoidla, sammusagedus (Hz), laius, kõrgus, seeme, samme kokku, kontrollpunkti vahe
+_HEADER = struct.Struct("<4sBBHHHqIH")
+_TICK = struct.Struct("<hhB")     # hiire x, y ja lipud (bit 0 = klõps, bit 1 = järgneb kontrollpunkt, bit 2 = torn)
+_CHECK = struct.Struct("<IIBb")   # kontrollsumma, skoor, laine, HP
+
+FLAG_FIRE = 1
+FLAG_CHECK = 2
+FLAG_PLACE = 4
+
+
+def state_checksum(sim):
+    """CRC32 simulatsiooni seisust: loendurid, mängija ja kõigi vaenlaste/kuulide arv ning asukohad."""
+    crc = zlib.crc32(struct.pack("<IIBbII", sim.ticks, sim.score, sim.waves.wave, sim.player.hp,
+                                 len(sim.enemies), len(sim.bullets)))
+    for x, y in sim.enemy_positions():
+        crc = zlib.crc32(struct.pack("<ff", x, y), crc)
+    return crc
+
+
+def _checkpoint(sim):
+    return (state_checksum(sim), sim.score, sim.waves.wave, max(-128, min(127, sim.player.hp)))
+
+
+class Recorder:
+    """Kirjutab Simulation'i sisendid faili; tick(inputs) pärast iga sim.step'i, close() lõpus."""
+
+    def __init__(self, path, sim, hz, every=CHECKSUM_EVERY):
+        self.sim = sim
+        self.every = every
+        self.ticks = 0
+        self._f = open(path, "wb")
+        self._header = (MAGIC, VERSION, BACKENDS.index("numpy" if sim.use_arrays else "objects"),
+                        int(round(hz)), sim.W, sim.H, sim.seed)
+        self._f.write(_HEADER.pack(*self._header, 0, every))
+
+    def tick(self, inputs):
+        """Salvesta ühe sammu sisend (ja iga every sammu järel kontrollpunkt)."""
+        self.ticks += 1
+        check = self.ticks % self.every == 0
+        flags = (FLAG_FIRE if inputs.fire else 0) | (FLAG_CHECK if check else 0) | (FLAG_PLACE if inputs.place else 0)
+        self._f.write(_TICK.pack(int(inputs.aim_x), int(inputs.aim_y), flags))
+        if check:
+            self._f.write(_CHECK.pack(*_checkpoint(self.sim)))
+
+    def close(self):
+        """Kirjuta sammude arv päisesse ja sulge fail."""
+        if self._f.closed:
+            return
+        self._f.seek(0)
+        self._f.write(_HEADER.pack(*self._header, self.ticks, self.every))
+        self._f.close()
+
+
+def read_log(path):
+    """Loe salvestis: (päise sõnastik, [(x, y, klõps, torn, kontrollpunkt või None), ...])."""
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, backend, hz, w, h, seed, ticks, every = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path}: pole mängu salvestis (või vale versioon)")
+    header = {"backend": BACKENDS[backend], "hz": hz, "width": w, "height": h,
+              "seed": seed, "ticks": ticks, "every": every}
+    entries = []
+    off = _HEADER.size
+    while off < len(data):
+        x, y, flags = _TICK.unpack_from(data, off)
+        off += _TICK.size
+        check = None
+        if flags & FLAG_CHECK:
+            check = _CHECK.unpack_from(data, off)
+            off += _CHECK.size
+        entries.append((x, y, bool(flags & FLAG_FIRE), bool(flags & FLAG_PLACE), check))
+    return header, entries
+
+
+def play(path, draw=None, realtime=False):
+    """
+    Esita salvestis uuesti. draw(sim, aim) – kutsutakse pärast iga sammu (None = ilma pildita);
+    realtime – oota sammude vahel nii, et tempo oleks sama mis salvestamisel.
+    Tagastab sõnastiku: lõppseis, ajajoon [(samm, skoor, laine, HP), ...] ja esimene
+    lahknemise samm (None, kui kõik kontrollpunktid klappisid).
+    """
+    game = importlib.import_module("game")
+    header, entries = read_log(path)
+    sim = game.Simulation(header["width"], header["height"], seed=header["seed"], backend=header["backend"])
+    dt = 1.0 / header["hz"]
+    timeline, diverged = [], None
+    t_next = time.perf_counter()
+    t0 = t_next
+    for x, y, fire, place, check in entries:
+        sim.step(dt, game.Inputs(x, y, fire, place))
+        if check:
+            got = _checkpoint(sim)
+            timeline.append((sim.ticks, got[1], got[2], got[3]))
+            if got != check and diverged is None:
+                diverged = sim.ticks
+        if draw:
+            draw(sim, (x, y))
+        if realtime:
+            t_next += dt
+            delay = t_next - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+    return {
+        "ticks": sim.ticks,
+        "elapsed": time.perf_counter() - t0,
+        "final": {"state": sim.state, "wave": sim.waves.wave, "score": sim.score, "hp": sim.player.hp},
+        "timeline": timeline,
+        "diverged_at": diverged,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Esita salvestatud mäng uuesti ja kontrolli, et tulemus klapib.")
+    parser.add_argument("log", help="salvestise fail (game.RECORD_PATH)")
+    parser.add_argument("--realtime", action="store_true", help="päris kiirusel koos pildiga")
+    args = parser.parse_args()
+
+    if not args.realtime:
+        import headless  # dummy draiverid – akent pole vaja
+        headless.init()
+        draw = None
+    else:
+        import pygame
+        header, _ = read_log(args.log)
+        pygame.init()
+        screen = pygame.display.set_mode((header["width"], header["height"]))
+        game = importlib.import_module("game")
+        bg = game._load_background(*screen.get_size())
+        font = game.text_cache.sys_font("consolas", 22)
+
+        def draw(sim, aim):
+            pygame.event.pump()
+            screen.blit(bg, (0, 0))
+            game._draw_world(screen, sim, aim)
+            game._draw_hud(screen, font, sim)
+            pygame.display.flip()
+
+    result = play(args.log, draw=draw, realtime=args.realtime)
+    print(f"{result['ticks']} sammu {result['elapsed']:.2f} s jooksul "
+          f"({result['ticks'] / max(result['elapsed'], 1e-9):.0f} sammu/s)")
+    final = result["final"]
+    print(f"seis: {final['state']}, laine {final['wave']}, skoor {final['score']}, HP {final['hp']}")
+    if result["diverged_at"] is None:
+        print(f"kõik {len(result['timeline'])} kontrollpunkti klappisid")
+        return 0
+    print(f"LAHKNES sammul {result['diverged_at']}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
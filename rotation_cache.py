@@ -0,0 +1,107 @@
+"""Vaenlaste spritede pööratud variantide vahemälu (rotation atlas).
+
+Enemy.draw kutsus varem igas kaadris iga vaenlase jaoks pygame.transform.rotozoom'i,
+mis teeb iga kord uue Surface'i. Siin hoitakse pööratud variandid mälus: nurk
+ümardatakse sammu kaupa, variandid tehakse laisalt (või soovi korral kohe laadimisel)
+ja kui mälulimiit saab täis, visatakse välja kõige kauem kasutamata (LRU).
+smooth=False korral pööratakse transform.rotate'iga (lähim piksel, odavam kui rotozoom).
+"""
+from collections import OrderedDict
+
+import pygame
+
+from profiling import count_alloc
+
+DEFAULT_STEP_DEG = 5                   # nurga samm kraadides (360 / samm = variantide arv sprite kohta)
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024    # mälulimiit kõigi pööratud Surface'ide peale kokku
+
+
+def _surface_bytes(surf):
+    """Ligikaudne Surface'i pikslimälu baitides."""
+    return surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+
+class RotationCache:
+    """Pööratud spritede LRU vahemälu – võti on (sprite indeks, ümardatud nurk)."""
+
+    def __init__(self, sprites, step_deg=DEFAULT_STEP_DEG, max_bytes=DEFAULT_MAX_BYTES, prebuild=False,
+                 smooth=True):
+        self.sprites = list(sprites)
+        self.smooth = smooth
+        self.steps = max(1, int(round(360 / step_deg)))  # variantide arv täisringil
+        self.step_deg = 360 / self.steps
+        self.max_bytes = max_bytes
+        self.bytes_used = 0
+
+        # statistika vahemälu suuruse valimiseks
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._cache = OrderedDict()  # (idx, samm) -> Surface, lõpus kõige värskemad
+        if prebuild:
+            self.prebuild()
+
+    def quantize(self, angle_deg):
+        """Ümarda nurk lähima sammuni; tagastab sammu indeksi 0..steps-1."""
+        return int(round(angle_deg / self.step_deg)) % self.steps
+
+    def get(self, idx, angle_deg):
+        """Tagasta sprite idx pööratuna nurga angle_deg võrra (ümardatud sammuni)."""
+        key = (idx, self.quantize(angle_deg))
+        img = self._cache.get(key)
+        if img is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return img
+        self.misses += 1
+        img = self._rotate(idx, key[1])
+        count_alloc("surface")
+        self._store(key, img)
+        return img
+
+    def _rotate(self, idx, step):
+        if self.smooth:
+            return pygame.transform.rotozoom(self.sprites[idx], step * self.step_deg, 1.0)
+        return pygame.transform.rotate(self.sprites[idx], step * self.step_deg)
+
+    def _store(self, key, img):
+        """Lisa variant vahemällu ja viska vanimaid välja, kuni mälulimiit peab."""
+        self._cache[key] = img
+        self.bytes_used += _surface_bytes(img)
+        while self.bytes_used > self.max_bytes and len(self._cache) > 1:
+            _, old = self._cache.popitem(last=False)
+            self.bytes_used -= _surface_bytes(old)
+            self.evictions += 1
+
+    def prebuild(self):
+        """Arvuta kõik variandid ette (nt laadimisel), kuni mälulimiit lubab."""
+        for idx in range(len(self.sprites)):
+            if self.sprites[idx] is None:
+                continue  # seda spritet ei õnnestunud laadida
+            for step in range(self.steps):
+                key = (idx, step)
+                if key in self._cache:
+                    continue
+                img = self._rotate(idx, step)
+                if self.bytes_used + _surface_bytes(img) > self.max_bytes:
+                    return
+                self._store(key, img)
+
+    def clear(self):
+        """Tühjenda vahemälu (statistika jääb alles)."""
+        self._cache.clear()
+        self.bytes_used = 0
+
+    def stats(self):
+        """Tagasta loendurid sõnastikuna (vahemälu suuruse hindamiseks)."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self._cache),
+            "bytes": self.bytes_used,
+            "max_bytes": self.max_bytes,
+        }
@@ -0,0 +1,171 @@
+"""Stseenid ja stseenihaldur: üks põhitsükkel ja üks kell kogu mängu peale.
+
+Varem importis main.py igal olekuvahetusel mooduli uuesti ning run_menu,
+run_game ja run_end ehitasid iga kord tausta, fondid ja nupud nullist ning
+jooksutasid oma while-tsüklit oma Clock'iga. Nüüd on iga ekraan pikaealine
+Scene objekt: prepare() tehakse ainult esimesel külastusel, enter()/exit()
+igal sisenemisel/lahkumisel ja kaadri töö käib update()/draw() kaudu.
+SceneManager hoiab stseene alles, nii et menüü → mäng → lõpp → menüü
+ringil ei laeta ega looda midagi uuesti.
+
+Staatilised ekraanid (menüü, lõpp) seavad idle_timeout'i: siis ei käi tsükkel
+FPS-iga, vaid ootab pygame.event.wait'iga järgmist sündmust (kõige kauem
+idle_timeout ms) ja draw() joonistab ainult siis, kui midagi muutus.
+
+Kaadri saatmine ekraanile käib present()'i kaudu: vaikimisi pygame.display.flip,
+SDL2 Renderer'iga (sdl2_video.py) seab main.py oma funktsiooni set_output'iga.
+"""
+import pygame
+
+IDLE_TIMEOUT_MS = 1000   # kui kaua event.wait kõige kauem ootab (staatilised ekraanid)
+
+# sündmused, mille järel peab staatiline ekraan end uuesti joonistama (aken kaetud, taastatud jms)
+REDRAW_EVENTS = frozenset((
+    pygame.VIDEOEXPOSE, pygame.VIDEORESIZE, pygame.WINDOWEXPOSED, pygame.WINDOWSHOWN,
+    pygame.WINDOWRESTORED, pygame.WINDOWMAXIMIZED, pygame.WINDOWSIZECHANGED,
+))
+
+_present = None          # kaadri saatmine ekraanile (set_output); None → pygame.display.flip
+_close_quits = False     # kas WINDOWCLOSE on QUIT (mitme akna korral SDL ise QUIT'i ei saada)
+
+
+def set_output(present=None, close_quits=False):
+    """Vaheta kaadri saatmise viis (None → tagasi pygame.display.flip'i juurde)."""
+    global _present, _close_quits
+    _present = present
+    _close_quits = close_quits
+
+
+def present():
+    """Saada joonistatud kaader ekraanile (stseenide draw() kutsub seda flip'i asemel)."""
+    if _present is None:
+        pygame.display.flip()
+    else:
+        _present()
+
+
+class Scene:
+    """
+    Üks ekraan. update(dt, events) tagastab None või tulemuse ("START_GAME",
+    "BACK_TO_MENU", "QUIT" …), mille järgi SceneManager järgmise stseeni valib.
+    draw() joonistab kaadri ja saadab selle ekraanile (present/update).
+    idle_timeout – None: kaadrid FPS-iga; arv (ms): oota sündmust (vt wait_events).
+    """
+
+    idle_timeout = None
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.prepared = False
+
+    def prepare(self):
+        """Lae pildid, fondid, nupud jms – kutsutakse ainult esimesel sisenemisel."""
+
+    def enter(self):
+        """Kutsutakse igal sisenemisel (pärast prepare'i)."""
+
+    def exit(self):
+        """Kutsutakse stseenist lahkumisel."""
+
+    def update(self, dt, events):
+        return None
+
+    def draw(self):
+        pass
+
+
+def wait_events(timeout):
+    """Oota kuni timeout ms esimest sündmust (protsessor magab) ja tagasta see koos järgnevatega."""
+    first = pygame.event.wait(timeout)
+    events = [] if first.type == pygame.NOEVENT else [first]
+    events.extend(pygame.event.get())
+    return events
+
+
+def _close_to_quit(events):
+    return [pygame.event.Event(pygame.QUIT) if e.type == pygame.WINDOWCLOSE else e for e in events]
+
+
+def _frame_events(clock, scene, fps):
+    """Ühe kaadri (dt, sündmused): tavaliselt FPS-iga, idle_timeout'iga stseenis sündmust oodates."""
+    if scene.idle_timeout is None:
+        dt = clock.tick(fps) / 1000.0
+        events = pygame.event.get()
+    else:
+        events = wait_events(scene.idle_timeout)
+        dt = clock.tick() / 1000.0
+    if _close_quits:
+        events = _close_to_quit(events)
+    return dt, events
+
+
+def _enter(scene):
+    if not scene.prepared:
+        scene.prepare()
+        scene.prepared = True
+    scene.enter()
+
+
+class SceneManager:
+    """
+    scenes – {olek: Scene või tehas(screen) → Scene}; tehas kutsutakse esimesel vajadusel.
+    transitions – {(olek, tulemus): järgmine olek}; tulemus "QUIT" või tundmatu üleminek
+    ilma sihtkohata lõpetab run()'i.
+    """
+
+    def __init__(self, screen, scenes, transitions, fps=60):
+        self.screen = screen
+        self.scenes = dict(scenes)
+        self.transitions = transitions
+        self.fps = fps
+        self.clock = pygame.time.Clock()
+        self.state = None
+        self.visits = {}        # olek -> mitu korda sisenetud (mõõtmiseks)
+
+    def get(self, state):
+        """Olekule vastav stseen (tehas asendatakse esimesel kutsel valmis objektiga)."""
+        scene = self.scenes[state]
+        if not isinstance(scene, Scene):
+            scene = self.scenes[state] = scene(self.screen)
+        return scene
+
+    def switch(self, state):
+        """Lahku praegusest stseenist ja sisene olekusse state."""
+        if self.state is not None:
+            self.get(self.state).exit()
+        self.state = state
+        _enter(self.get(state))
+        self.visits[state] = self.visits.get(state, 0) + 1
+        self.clock.tick()   # laadimisele kulunud aeg ei lähe järgmise kaadri dt-sse
+
+    def run(self, start):
+        """Põhitsükkel: üks kell, üks pygame.event.get() kaadris; tagastab viimase tulemuse."""
+        self.switch(start)
+        while True:
+            scene = self.get(self.state)
+            dt, events = _frame_events(self.clock, scene, self.fps)
+            result = scene.update(dt, events)
+            if result is None:
+                scene.draw()
+                continue
+            target = self.transitions.get((self.state, result))
+            if result == "QUIT" or target is None:
+                scene.exit()
+                self.state = None
+                return result
+            self.switch(target)
+
+
+def run_scene(scene, fps=60):
+    """Jooksuta üksikut stseeni, kuni see tagastab tulemuse (vanad run_menu/run_game/run_end)."""
+    clock = pygame.time.Clock()
+    _enter(scene)
+    try:
+        while True:
+            dt, events = _frame_events(clock, scene, fps)
+            result = scene.update(dt, events)
+            if result is not None:
+                return result
+            scene.draw()
+    finally:
+        scene.exit()
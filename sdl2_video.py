@@ -0,0 +1,84 @@
+"""Valikuline joonistamine pygame._sdl2.video peal (Window / Renderer / Texture).
+
+Tavaliselt joonistab mäng tarkvaraliselt Surface'itele (blit, rotozoom'i
+vahemälu, draw.circle) ja saadab tulemuse pygame.display.flip'iga. Siin on
+aken Renderer'iga: staatilised pildid (taust, spritid, eelrenderdatud täpid,
+HUD tekstid) laetakse tekstuuriks üks kord ja vaenlaste pööramise teeb
+Renderer draw(angle=...) parameetriga. Renderer võib olla ka SDL-i tarkvaraline
+(software=True) – siis saab mõlemat teed võrrelda ka ilma GPU-ta masinas.
+
+Menüü ja lõpuekraan joonistavad endiselt Surface'ile (VideoOutput.screen);
+present_screen() laeb selle voogtekstuuri ja näitab. pygame.display'l on
+sel juhul ainult peidetud aken, et convert() teaks pikslivormingut.
+"""
+from collections import OrderedDict
+
+import pygame
+
+try:
+    from pygame._sdl2.video import Renderer, Texture, Window
+except ImportError:  # vana pygame / SDL1 → ainult Surface'id
+    Window = None
+
+HAVE_SDL2 = Window is not None
+
+TEXTURE_CACHE = 512    # mitu Surface → Texture vastet hoitakse (HUD tekstid vahetuvad, ülejäänu on püsiv)
+
+
+class VideoOutput:
+    """
+    Mängu aken Renderer'iga. texture(surface) – pildi tekstuur (laetakse üks kord, LRU);
+    draw_dynamic(surface, pos) – igas kaadris muutuv pilt (nt profiilimise paneel);
+    present_screen() – näita Surface-stseenide lõuendit screen; present() – Renderer'i kaader.
+    """
+
+    def __init__(self, size, title="", software=False, vsync=False):
+        if not HAVE_SDL2:
+            raise RuntimeError("pygame._sdl2.video pole saadaval")
+        self.size = tuple(size)
+        self.software = software
+        self.window = Window(title, self.size)
+        self.renderer = Renderer(self.window, accelerated=0 if software else -1, vsync=vsync)
+        self.screen = pygame.Surface(self.size).convert()
+        self._screen_tex = Texture(self.renderer, self.size, streaming=True)
+        self._dynamic = {}                 # suurus -> voogtekstuur
+        self._textures = OrderedDict()     # id(Surface) -> (Surface, Texture)
+        self.uploads = 0                   # mitu tekstuuri on tehtud (mõõtmiseks)
+
+    def texture(self, surf):
+        """Surface'i tekstuur; sama Surface objekt laetakse GPU-le ainult üks kord."""
+        key = id(surf)
+        hit = self._textures.get(key)
+        if hit is not None and hit[0] is surf:
+            self._textures.move_to_end(key)
+            return hit[1]
+        tex = Texture.from_surface(self.renderer, surf)
+        self._textures[key] = (surf, tex)   # Surface jääb alles, et id ei läheks uuele objektile
+        self.uploads += 1
+        if len(self._textures) > TEXTURE_CACHE:
+            self._textures.popitem(last=False)
+        return tex
+
+    def draw_dynamic(self, surf, pos):
+        """Joonista pilt, mis muutub igas kaadris (uuendab sama suurusega voogtekstuuri)."""
+        size = surf.get_size()
+        tex = self._dynamic.get(size)
+        if tex is None:
+            tex = self._dynamic[size] = Texture(self.renderer, size, streaming=True)
+            tex.blend_mode = pygame.BLENDMODE_BLEND if hasattr(pygame, "BLENDMODE_BLEND") else 1
+        tex.update(surf)
+        tex.draw(dstrect=(pos[0], pos[1], size[0], size[1]))
+
+    def present(self):
+        self.renderer.present()
+
+    def present_screen(self):
+        """Näita Surface-põhise stseeni kaadrit (screen) – scenes.present kutsub seda flip'i asemel."""
+        self._screen_tex.update(self.screen)
+        self._screen_tex.draw()
+        self.renderer.present()
+
+    def close(self):
+        self._textures.clear()
+        self._dynamic.clear()
+        self.window.destroy()
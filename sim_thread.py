@@ -0,0 +1,215 @@
+"""Simulatsioon omas lõimes: fikseeritud sammuga töölõim ja hetktõmmised joonistamiseks.
+
+Tavaliselt teeb GameScene igas kaadris järjest loogikasammud, joonistamise ja
+flip'i, nii et iga millisekund blit'ides ja display.flip'is on loogikalt ära
+võetud. SimThread jooksutab Simulation.step'i oma lõimes SIM_HZ sagedusega ja
+avaldab pärast iga sammu muutumatu hetktõmmise (Snapshot). Põhilõim ainult
+loeb sündmusi, saadab sisendid käsujärjekorda (deque – append/popleft on
+lukuvabad) ja joonistab viimase hetktõmmise.
+
+Puhverdamine: töölõim ehitab alati uue Snapshot'i ja vahetab ühe viite
+(latest); lugeja hoiab oma kaadri ajal vana objekti alles. See on
+topeltpuhver ilma lukuta – kumbki pool ei kirjuta kunagi objekti, mida teine
+loeb. Helid ja osakeste efektid (tabamused, surmad) tulevad eraldi
+järjekordadest, et ükski sündmus ei kaoks, kui põhilõim mõne hetktõmmise
+vahele jätab; Effects puhvrit puudutab ainult põhilõim.
+
+Reaalset kattumist annab see ainult mitme tuumaga masinas ja seal, kus pygame
+GIL'i vabastab (blit, flip, transform); puhta Pythoni osad käivad ikka kordamööda.
+"""
+import math
+import threading
+import time
+from collections import deque, namedtuple
+
+MAX_CATCHUP_STEPS = 5   # kui töölõim jääb rohkem maha, visatakse ülejäänud aeg ära (nagu MAX_STEPS_PER_FRAME)
+
+# bullets – [(px, py, x, y), ...] (eelmine ja praegune asukoht); enemies – samamoodi, angles ja
+# sprites – vaenlastega samas järjekorras; towers – [(x, y), ...]; queries – tornide päringud kokku.
+# Listid on avaldamise järel ainult lugemiseks.
+Snapshot = namedtuple("Snapshot", "tick wall state wave hp score money towers queries bullets enemies angles sprites")
+
+
+def take_snapshot(sim, wall):
+    """Muutumatu hetktõmmis Simulation'ist (kutsub töölõim pärast sammu; wall – perf_counter aeg)."""
+    px, py = sim.player.pos.x, sim.player.pos.y
+    if sim.use_arrays:
+        b, e = sim.bullets, sim.enemies
+        bullets = [p + q for p, q in zip(b.prev[:b.n].tolist(), b.pos[:b.n].tolist())]
+        enemies = [p + q for p, q in zip(e.prev[:e.n].tolist(), e.pos[:e.n].tolist())]
+        angles = e.facing_angles(px, py)
+        sprites = e.sprite[:e.n].tolist()
+    else:
+        bullets = [(b.prev.x, b.prev.y, b.pos.x, b.pos.y) for b in sim.bullets]
+        enemies = [(e.prev.x, e.prev.y, e.pos.x, e.pos.y) for e in sim.enemies]
+        angles = [-math.degrees(math.atan2(py - e.pos.y, px - e.pos.x)) for e in sim.enemies]
+        sprites = [-1 if e.sprite_idx is None else e.sprite_idx for e in sim.enemies]
+    return Snapshot(sim.ticks, wall, sim.state, sim.waves.wave, sim.player.hp, sim.score, sim.money,
+                    sim.tower_points(), sim.towers.queries, bullets, enemies, angles, sprites)
+
+
+def _lerp_rows(rows, alpha):
+    if alpha is None or alpha >= 1.0:
+        return [(x, y) for _, _, x, y in rows]
+    return [(px + (x - px) * alpha, py + (y - py) * alpha) for px, py, x, y in rows]
+
+
+class FxRelay:
+    """Simulation.fx asendus töölõimes: efektid lähevad järjekorda, drain() teeb need põhilõimes."""
+
+    def __init__(self):
+        self.queue = deque()
+
+    def enemy_hit(self, x, y, killed=False):
+        self.queue.append((x, y, killed))
+
+    def player_hit(self, x, y):
+        self.queue.append((x, y, None))
+
+    def drain(self, effects):
+        queue = self.queue
+        while queue:
+            x, y, killed = queue.popleft()
+            if killed is None:
+                effects.player_hit(x, y)
+            else:
+                effects.enemy_hit(x, y, killed)
+
+
+class SnapshotView:
+    """
+    Viimane hetktõmmis joonistamise liidesega (sama mis Simulation'il: bullet_points, enemy_items,
+    tower_points, hud_values, towers, player, fx, state), nii et game._draw_world töötab mõlemaga.
+    player – Simulation.player (joonistamine loeb ainult muutumatuid välju pos, r, sprite);
+    fx – põhilõime Effects.
+    """
+
+    use_arrays = False
+
+    def __init__(self, player, fx=None):
+        self.player = player
+        self.fx = fx
+        self.snap = None
+
+    def load(self, snap):
+        self.snap = snap
+
+    @property
+    def state(self):
+        return self.snap.state
+
+    @property
+    def towers(self):
+        return self.snap.towers
+
+    def alpha(self, now, tick):
+        """Mitu osa järgmisest sammust on hetktõmmise avaldamisest möödas (0..1)."""
+        return min(1.0, max(0.0, (now - self.snap.wall) / tick))
+
+    def bullet_points(self, alpha=None):
+        return _lerp_rows(self.snap.bullets, alpha)
+
+    def enemy_items(self, alpha=None):
+        snap = self.snap
+        return zip(_lerp_rows(snap.enemies, alpha), snap.angles, snap.sprites)
+
+    def tower_points(self):
+        return self.snap.towers
+
+    def hud_values(self):
+        snap = self.snap
+        return snap.wave, snap.hp, snap.score, len(snap.enemies), snap.money, len(snap.towers)
+
+
+class SimThread:
+    """
+    Simulation töölõimes. start() / stop(); send(inputs) – sisend järgmisele sammule (fire/place
+    jäävad ootele, kuni mõni samm need ära kasutab); latest – viimane Snapshot; sounds – sündmuste
+    nimed helideks; fx – FxRelay. policy(sim) → Inputs asendab käsud (mõõtmised);
+    on_step(inputs) kutsutakse töölõimes pärast iga sammu (nt replay.Recorder.tick).
+    stats: steps (samme), step_s (loogikale kulunud aeg), dropped (maha jäädes vahele jäetud samme).
+    """
+
+    def __init__(self, sim, tick, policy=None, on_step=None):
+        self.sim = sim
+        self.tick = tick
+        self.policy = policy
+        self.on_step = on_step
+        self.commands = deque()
+        self.sounds = deque()
+        self.fx = FxRelay()
+        self.latest = None
+        self.stats = {"steps": 0, "step_s": 0.0, "dropped": 0}
+        self._last = None          # viimati kasutatud sisend (sihik jääb paika, kui uusi käske pole)
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Alusta (sim peab olema juba reset'itud); sim.fx suunatakse FxRelay'sse."""
+        if self._thread is not None:
+            self.stop()
+        self.sim.fx = self.fx
+        self.commands.clear()
+        self.sounds.clear()
+        self.fx.queue.clear()
+        self._last = None
+        self.latest = take_snapshot(self.sim, time.perf_counter())
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def send(self, inputs):
+        self.commands.append(inputs)
+
+    def _inputs(self):
+        """Kõik ootel käsud üheks sisendiks: viimane sihik, fire/place kui ükskõik milline neid soovis."""
+        if self.policy is not None:
+            return self.policy(self.sim)
+        commands = self.commands
+        if not commands:
+            last = self._last
+            return last._replace(fire=False, place=False) if last else None
+        fire = place = False
+        while commands:
+            last = commands.popleft()
+            fire = fire or last.fire
+            place = place or last.place
+        self._last = last
+        return last._replace(fire=fire, place=place)
+
+    def _run(self):
+        sim, tick, stats = self.sim, self.tick, self.stats
+        clock = time.perf_counter
+        next_t = clock()
+        while not self._stop.is_set() and sim.state == "play":
+            now = clock()
+            if now < next_t:
+                self._stop.wait(next_t - now)   # magab GIL'ita
+                continue
+            behind = int((now - next_t) / tick)
+            if behind > MAX_CATCHUP_STEPS:
+                stats["dropped"] += behind
+                next_t = now
+            inputs = self._inputs()
+            if inputs is None:        # põhilõim pole veel sihikut saatnud
+                next_t += tick
+                continue
+            t0 = clock()
+            self.sounds.extend(sim.step(tick, inputs))
+            if self.on_step:
+                self.on_step(inputs)
+            t1 = clock()
+            self.latest = take_snapshot(sim, t1)   # üks viite vahetus – lugeja näeb vana või uut, mitte poolikut
+            stats["steps"] += 1
+            stats["step_s"] += t1 - t0
+            next_t += tick
@@ -0,0 +1,68 @@
+"""VoiceManager'i üldine hääleeelarve (ilma helikaardita – kanalid on võltsid)."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import audio  # noqa: E402
+
+
+class FakeChannel:
+    def __init__(self):
+        self.busy = False
+        self.played = 0
+        self.stopped = 0
+
+    def get_busy(self):
+        return self.busy
+
+    def play(self, sound):
+        self.busy = True
+        self.played += 1
+
+    def set_volume(self, volume):
+        pass
+
+    def stop(self):
+        self.busy = False
+        self.stopped += 1
+
+
+def _manager(budget):
+    voices = {"shoot": 2, "hit": 3, "perish": 3}
+    vm = audio.VoiceManager({name: name for name in voices}, voices,
+                            {"perish": 2, "shoot": 1, "hit": 0}, budget)
+    vm._groups = {name: [FakeChannel() for _ in range(n)] for name, n in voices.items()}
+    return vm
+
+
+def _fill(vm, name, n):
+    for _ in range(n):
+        vm.request(name)
+        vm.flush()
+
+
+def test_budget_drops_low_priority_voice_with_free_group_channel():
+    vm = _manager(budget=4)
+    _fill(vm, "perish", 3)
+    _fill(vm, "shoot", 1)
+    vm.request("hit")
+    vm.flush()
+    assert vm.stats["dropped"] == 1
+    assert not any(ch.busy for ch in vm._groups["hit"])   # grupis oli ruumi, eelarves mitte
+
+
+def test_budget_steals_lower_priority_voice_for_important_sound():
+    vm = _manager(budget=4)
+    _fill(vm, "hit", 3)
+    _fill(vm, "shoot", 1)
+    vm.request("perish")
+    vm.flush()
+    assert vm.stats["dropped"] == 0
+    assert vm._groups["perish"][0].busy
+    assert [ch.stopped for ch in vm._groups["hit"]] == [1, 0, 0]   # vanim "hit" vaigistati
+    assert sum(ch.busy for group in vm._groups.values() for ch in group) == 4
+
+
+def test_default_budget_is_below_group_voices():
+    assert audio.DEFAULT_BUDGET < 2 + 3 + 3
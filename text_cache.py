@@ -0,0 +1,95 @@
+"""Ühine teksti renderdamise vahemälu (HUD, menüü TextBox, lõpuekraan).
+
+Font.render rasteriseerib teksti iga kord uuesti, kuigi HUD-i, menüü ja
+lõpuekraani tekstid muutuvad harva. Siin jäetakse valmis Surface'id meelde
+võtmega (font, tekst, värv, …) ja visatakse välja kõige kauem kasutamata
+(LRU), kui kirjeid saab liiga palju. Samuti hoitakse meeles SysFont objektid
+ja TextBox'i reamurdmise tulemused.
+"""
+from collections import OrderedDict
+
+import pygame
+import pygame.freetype
+
+from profiling import count_alloc
+
+MAX_ENTRIES = 512   # mitu renderdatud teksti korraga mälus hoida
+
+_surfaces = OrderedDict()  # (font, tekst, värv, antialias, taust) -> Surface
+_layouts = {}              # (font, tekst, laius) -> ridade tuple
+_fonts = {}                # ("font"/"freetype", nimi, suurus, bold, italic) -> font
+
+STATS = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def sys_font(name, size, bold=False, italic=False):
+    """pygame.font.SysFont, aga iga kombinatsioon luuakse ainult üks kord."""
+    key = ("font", name, size, bold, italic)
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = pygame.font.SysFont(name, size, bold=bold, italic=italic)
+    return font
+
+
+def freetype_font(name, size, bold=False, italic=False):
+    """pygame.freetype.SysFont, aga iga kombinatsioon luuakse ainult üks kord."""
+    key = ("freetype", name, size, bold, italic)
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = pygame.freetype.SysFont(name, size, bold=bold, italic=italic)
+    return font
+
+
+def _lookup(key):
+    surf = _surfaces.get(key)
+    if surf is not None:
+        _surfaces.move_to_end(key)
+        STATS["hits"] += 1
+    return surf
+
+
+def _store(key, surf):
+    STATS["misses"] += 1
+    count_alloc("surface")
+    _surfaces[key] = surf
+    if len(_surfaces) > MAX_ENTRIES:
+        _surfaces.popitem(last=False)
+        STATS["evictions"] += 1
+    return surf
+
+
+def render(font, text, color, antialias=True, background=None):
+    """Nagu font.render(text, antialias, color, background), aga korduv tekst tuleb vahemälust."""
+    key = (font, text, color, antialias, background)
+    surf = _lookup(key)
+    if surf is None:
+        surf = _store(key, font.render(text, antialias, color, background))
+    return surf
+
+
+def render_freetype(font, text, fgcolor, bgcolor=None, size=0):
+    """Nagu freetype font.render(...)[0] – ainult Surface, vahemälust kui võimalik."""
+    key = (font, text, fgcolor, bgcolor, size)
+    surf = _lookup(key)
+    if surf is None:
+        surf, _ = font.render(text, fgcolor=fgcolor, bgcolor=bgcolor, size=size)
+        surf = _store(key, surf)
+    return surf
+
+
+def layout(font, text, width, compute):
+    """
+    Reamurdmise tulemus (ridade tuple) võtmega (font, tekst, laius).
+    compute() kutsutakse ainult siis, kui seda kombinatsiooni pole veel arvutatud.
+    """
+    key = (font, text, width)
+    lines = _layouts.get(key)
+    if lines is None:
+        lines = _layouts[key] = tuple(compute())
+    return lines
+
+
+def clear():
+    """Tühjenda renderdatud tekstid ja reamurdmised (fondid jäävad)."""
+    _surfaces.clear()
+    _layouts.clear()
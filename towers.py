@@ -0,0 +1,144 @@
+"""Tornid: mängija paigutatud automaatsed laskurid.
+
+Torn laseb tavalisi kuule (game.Bullet) lähima vaenlase pihta oma ulatuses ja
+hoiab sihtmärki seni, kuni see sureb või ulatusest lahkub. Sihtmärgi otsimine
+on jaotatud sammude vahel: sihtmärgita tornid ootavad järjekorras ja igas sammus
+otsib neist ainult RETARGET_PER_TICK tükki (ruumilise räsi päringuga, vt
+broadphase.py). Sihtmärgiga tornid ei otsi üldse – kontrollivad ainult, kas
+sihtmärk on alles (vaenlase uid järgi binaarotsing, sest hoidlad kompakteerivad
+järjekorda säilitades ja uid'd kasvavad). Nii on sihtimise kulu ühes sammus
+piiratud ka 50 torni ja sadade vaenlaste korral.
+"""
+import bisect
+from collections import deque
+
+from broadphase import SpatialHash
+
+TOWER_R = 12                  # torni raadius (joonistamine, paigutamise vahe)
+TOWER_RANGE = 170             # laskeulatus (px)
+TOWER_COOLDOWN = 0.45         # laskude vahe (s)
+TOWER_LIMIT = 50              # rohkem torne ei saa paigutada
+TOWER_MIN_GAP = 2 * TOWER_R   # kahe torni (või torni ja mängija) keskpunktide vähim vahe
+RETARGET_PER_TICK = 8         # mitu sihtmärgita torni ühes sammus otsingu teeb
+
+
+class Tower:
+    """Üks torn: asukoht, laskmise taimer ja praegune sihtmärk (vaenlase uid ja viimane indeks)."""
+
+    __slots__ = ("x", "y", "cd", "target", "idx")
+
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+        self.cd = 0.0
+        self.target = None    # vaenlase uid või None
+        self.idx = 0          # sihtmärgi indeks eelmises sammus (otsingu ülempiir)
+
+
+class Towers:
+    """
+    Kõik tornid ja nende sihtimine. update() kutsutakse igas sammus vaenlaste vaatega:
+    uids (kasvav jada), pos ja prev – indekseeritavad (x, y) paarid samas järjekorras.
+    Loendurid: queries (räsipäringuid kokku), last_queries (viimases sammus).
+    """
+
+    def __init__(self, cell=TOWER_RANGE):
+        self.towers = []
+        self._pending = deque()    # sihtmärgita tornid otsingu järjekorras
+        self._grid = SpatialHash(cell)
+        self.queries = 0
+        self.last_queries = 0
+
+    def __len__(self):
+        return len(self.towers)
+
+    def clear(self):
+        self.towers.clear()
+        self._pending.clear()
+        self.queries = self.last_queries = 0   # loendurid on mängu kohta (ülekate, profiili CSV)
+
+    def can_place(self, x, y, w, h, blocked=()):
+        """Kas (x, y) sobib torni jaoks: maailmas sees, limiit täitmata ja teistest piisavalt kaugel."""
+        if len(self.towers) >= TOWER_LIMIT or not (0 <= x < w and 0 <= y < h):
+            return False
+        gap2 = TOWER_MIN_GAP * TOWER_MIN_GAP
+        for ox, oy in blocked:
+            if (ox - x) * (ox - x) + (oy - y) * (oy - y) < gap2:
+                return False
+        for t in self.towers:
+            if (t.x - x) * (t.x - x) + (t.y - y) * (t.y - y) < gap2:
+                return False
+        return True
+
+    def place(self, x, y):
+        t = Tower(x, y)
+        self.towers.append(t)
+        self._pending.append(t)
+        return t
+
+    def _find(self, uids, tower):
+        """Sihtmärgi praegune indeks või -1 (kompakteerimine nihutab ainult väiksemaks)."""
+        hi = min(tower.idx + 1, len(uids))
+        i = hi - 1
+        if i >= 0 and uids[i] == tower.target:
+            return i
+        i = bisect.bisect_left(uids, tower.target, 0, hi)
+        if i < hi and uids[i] == tower.target:
+            return i
+        return -1
+
+    def update(self, dt, uids, pos, prev, fire, bullet_speed):
+        """
+        Üks samm: sihtmärkide kontroll, jaotatud otsing ja laskmine.
+        fire(torn, tx, ty) – lase kuul torni juurest punkti (tx, ty) suunas (ette sihitud
+        kuuli kiiruse bullet_speed järgi).
+        """
+        self.last_queries = 0
+        if not self.towers:
+            return
+        r2 = TOWER_RANGE * TOWER_RANGE
+        pending = self._pending
+
+        # sihtmärk alles ja ulatuses? (ei mingit otsingut)
+        for t in self.towers:
+            if t.cd > 0:
+                t.cd -= dt
+            if t.target is None:
+                continue
+            i = self._find(uids, t)
+            if i >= 0:
+                x, y = pos[i][0], pos[i][1]
+                if (x - t.x) * (x - t.x) + (y - t.y) * (y - t.y) <= r2:
+                    t.idx = i
+                    continue
+            t.target = None
+            pending.append(t)
+
+        # uus sihtmärk ainult RETARGET_PER_TICK tornile; ülejäänud ootavad järge
+        if pending and len(uids):
+            grid = self._grid
+            grid.rebuild(pos)
+            for _ in range(min(RETARGET_PER_TICK, len(pending))):
+                t = pending.popleft()
+                best, best_d = -1, r2 + 1e-6
+                for i in grid.query(t.x, t.y, TOWER_RANGE):
+                    x, y = pos[i][0], pos[i][1]
+                    d = (x - t.x) * (x - t.x) + (y - t.y) * (y - t.y)
+                    if d < best_d:
+                        best, best_d = i, d
+                if best >= 0:
+                    t.target, t.idx = uids[best], best
+                else:
+                    pending.append(t)    # kedagi pole lähedal – proovi uuesti järgmisel ringil
+                self.last_queries += 1
+            self.queries += self.last_queries
+
+        # laskmine: sihi sinna, kus vaenlane kuuli kohale jõudes on (kiirus prev → pos)
+        for t in self.towers:
+            if t.target is None or t.cd > 0:
+                continue
+            i = t.idx
+            x, y = pos[i][0], pos[i][1]
+            # lennuaeg sammudes × viimase sammu nihe
+            k = ((x - t.x) ** 2 + (y - t.y) ** 2) ** 0.5 / (bullet_speed * dt) if dt > 0 else 0.0
+            fire(t, x + (x - prev[i][0]) * k, y + (y - prev[i][1]) * k)
+            t.cd = TOWER_COOLDOWN